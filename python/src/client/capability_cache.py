@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class CapabilityCache:
+    """
+    Server capabilities by server base URL, each with a time to live. An expired or
+    invalidated entry is still served (stale) until it has been refreshed, so callers
+    never wait on discovery once a server has been seen.
+
+    If a cache file is given the catalogue is persisted on every change and loaded at
+    start, so a restarted client starts warm. Entries loaded from disk keep the time
+    they were fetched, so they are refreshed once past their time to live.
+
+    The version is incremented whenever the cached capabilities change, so derived data
+    (e.g. prompt text built from the capabilities) can be memoized against it.
+    """
+
+    DEFAULT_TTL_SECONDS: float = 300.0
+    FILE_FORMAT_VERSION: int = 1
+
+    class EnvVars(str, Enum):
+        TTL = "MCP_CAPABILITY_TTL"
+        CACHE_FILE = "MCP_CAPABILITY_CACHE_FILE"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class _Entry:
+        def __init__(self,
+                     capabilities: Dict[str, Any],
+                     fetched_at: float) -> None:
+            self.capabilities: Dict[str, Any] = capabilities
+            self.fetched_at: float = fetched_at
+            self.invalidated: bool = False
+
+    def __init__(self,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 cache_file: Optional[Path] = None,
+                 ttl_by_url: Optional[Dict[str, float]] = None) -> None:
+        self._log: logging.Logger = logging.getLogger(__name__)
+        self._ttl_seconds: float = ttl_seconds
+        self._ttl_by_url: Dict[str, float] = dict(ttl_by_url or {})
+        self._cache_file: Optional[Path] = Path(
+            cache_file) if cache_file else None
+        self._lock: threading.Lock = threading.Lock()
+        self._entries: Dict[str, CapabilityCache._Entry] = {}
+        self._version: int = 0
+        if self._cache_file is not None:
+            self._load()
+
+    @classmethod
+    def from_environment(cls) -> "CapabilityCache":
+        cache_file: Optional[str] = os.environ.get(str(cls.EnvVars.CACHE_FILE))
+        return cls(ttl_seconds=float(os.environ.get(str(cls.EnvVars.TTL), cls.DEFAULT_TTL_SECONDS)),
+                   cache_file=Path(cache_file) if cache_file else None)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def set_ttl(self, url: str, ttl_seconds: float) -> None:
+        with self._lock:
+            self._ttl_by_url[url] = ttl_seconds
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        The cached capabilities for the URL, fresh or stale, or None if never fetched.
+        """
+        entry = self._entries.get(url)
+        return entry.capabilities if entry else None
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            return [(url, entry.capabilities) for url, entry in self._entries.items()]
+
+    def is_fresh(self, url: str) -> bool:
+        entry = self._entries.get(url)
+        if entry is None or entry.invalidated:
+            return False
+        ttl = self._ttl_by_url.get(url, self._ttl_seconds)
+        return time.time() - entry.fetched_at < ttl
+
+    def stale_urls(self, urls: List[str]) -> List[str]:
+        return [url for url in urls if not self.is_fresh(url)]
+
+    def put(self,
+            url: str,
+            capabilities: Dict[str, Any]) -> None:
+        with self._lock:
+            entry = self._entries.get(url)
+            changed: bool = entry is None or entry.capabilities != capabilities
+            self._entries[url] = CapabilityCache._Entry(capabilities=capabilities,
+                                                        fetched_at=time.time())
+            if changed:
+                self._version += 1
+        if changed:
+            self._log.info(
+                f"Capabilities for [{url}] updated, cache version {self._version}")
+        self._save()
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """
+        Mark the capabilities of one or, if no URL is given, all servers as stale.
+        """
+        with self._lock:
+            for entry_url, entry in self._entries.items():
+                if url is None or entry_url == url:
+                    entry.invalidated = True
+
+    def _load(self) -> None:
+        try:
+            if not self._cache_file.is_file():
+                return
+            with open(self._cache_file, "r", encoding="utf-8") as f:
+                data: Dict[str, Any] = json.load(f)
+            if data.get("format_version") != self.FILE_FORMAT_VERSION:
+                self._log.warning(
+                    f"Ignoring capability cache [{self._cache_file}] with unknown format")
+                return
+            for url, entry in data.get("servers", {}).items():
+                self._entries[url] = CapabilityCache._Entry(capabilities=entry["capabilities"],
+                                                            fetched_at=float(entry["fetched_at"]))
+            self._version += 1
+            self._log.info(
+                f"Loaded capabilities of {len(self._entries)} servers from [{self._cache_file}]")
+        except Exception as e:  # pylint: disable=broad-except
+            self._log.warning(
+                f"Unable to load capability cache [{self._cache_file}]: {str(e)}")
+
+    def _save(self) -> None:
+        if self._cache_file is None:
+            return
+        try:
+            with self._lock:
+                data: Dict[str, Any] = {
+                    "format_version": self.FILE_FORMAT_VERSION,
+                    "servers": {url: {"fetched_at": entry.fetched_at,
+                                      "capabilities": entry.capabilities}
+                                for url, entry in self._entries.items()}
+                }
+            self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self._cache_file.with_name(
+                f"{self._cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_file, self._cache_file)
+        except Exception as e:  # pylint: disable=broad-except
+            self._log.warning(
+                f"Unable to save capability cache [{self._cache_file}]: {str(e)}")
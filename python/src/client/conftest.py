@@ -0,0 +1,116 @@
+import asyncio
+import socket
+import threading
+import time
+import pytest
+import uvicorn
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture(scope="session")
+def mcp_server_url():
+    """
+    Base URL of a FastMCP test server with echo, slow, lookup and counting tools (one of
+    them opted in to caching), served over SSE on a free local port.
+    """
+    port = _free_port()
+    mcp = FastMCP(name="TestServer", instructions="Test server", host="127.0.0.1", port=port)
+    calls = {"count": 0}
+
+    @mcp.tool()
+    async def echo(text: str) -> str:
+        return text
+
+    @mcp.tool()
+    async def slow(seconds: float) -> str:
+        await asyncio.sleep(seconds)
+        return "done"
+
+    @mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+    async def lookup(key: str) -> dict:
+        return {"key": key}
+
+    @mcp.tool()
+    async def count() -> int:
+        calls["count"] += 1
+        return calls["count"]
+
+    @mcp.tool(annotations=ToolAnnotations(readOnlyHint=True, idempotentHint=True),
+              meta={"cache_ttl_seconds": 30})
+    async def reference_count() -> dict:
+        calls["count"] += 1
+        return {"count": calls["count"]}
+
+    @mcp.tool(annotations=ToolAnnotations(readOnlyHint=True, idempotentHint=True))
+    async def uncached_count() -> dict:
+        calls["count"] += 1
+        return {"count": calls["count"]}
+
+    server = uvicorn.Server(uvicorn.Config(mcp.sse_app(), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+def silent_server_url():
+    """
+    Base URL of a socket that accepts connections but never responds.
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(8)
+    yield f"http://127.0.0.1:{listener.getsockname()[1]}"
+    listener.close()
+
+
+class RestartableServer:
+    """
+    A FastMCP server with an echo tool on a fixed local port, that can be stopped and
+    started again as a restarted server would be.
+    """
+
+    def __init__(self) -> None:
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._server = None
+        self._thread = None
+
+    def start(self) -> None:
+        mcp = FastMCP(name="RestartableServer", instructions="Test server", host="127.0.0.1", port=self.port)
+
+        @mcp.tool()
+        async def echo(text: str) -> str:
+            return text
+
+        self._server = uvicorn.Server(uvicorn.Config(mcp.sse_app(), host="127.0.0.1", port=self.port,
+                                                     log_level="warning", timeout_graceful_shutdown=1))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+@pytest.fixture
+def restartable_server():
+    server = RestartableServer()
+    server.start()
+    yield server
+    server.stop()
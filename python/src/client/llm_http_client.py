@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import os
+import random
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, AsyncIterator, Optional
+import httpx
+
+try:
+    import h2  # noqa: F401  # pylint: disable=unused-import
+    HTTP2_AVAILABLE: bool = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class LLMHttpClient:
+    """
+    Pooled async HTTP client for the LLM providers.
+
+    Connections are kept alive and reused across turns (over HTTP/2 when the h2 package is
+    installed), so a call does not pay a new TCP and TLS handshake. Connection errors,
+    timeouts and throttled or unavailable responses (429, 5xx) are retried with exponential
+    backoff and jitter, honouring Retry-After.
+
+    The underlying client belongs to the event loop it was created on, it is recreated if
+    used from another loop.
+    """
+
+    DEFAULT_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    DEFAULT_READ_TIMEOUT_SECONDS: float = 120.0
+    DEFAULT_MAX_RETRIES: int = 3
+    DEFAULT_BACKOFF_SECONDS: float = 0.5
+    DEFAULT_MAX_BACKOFF_SECONDS: float = 10.0
+    DEFAULT_MAX_CONNECTIONS: int = 20
+    DEFAULT_KEEP_ALIVE_SECONDS: float = 60.0
+    RETRY_STATUS_CODES: frozenset = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+    class EnvVars(str, Enum):
+        CONNECT_TIMEOUT = "MCP_LLM_CONNECT_TIMEOUT"
+        READ_TIMEOUT = "MCP_LLM_READ_TIMEOUT"
+        MAX_RETRIES = "MCP_LLM_MAX_RETRIES"
+        MAX_CONNECTIONS = "MCP_LLM_MAX_CONNECTIONS"
+
+        def __str__(self) -> str:
+            return self.value
+
+    def __init__(self,
+                 connect_timeout_seconds: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+                 read_timeout_seconds: float = DEFAULT_READ_TIMEOUT_SECONDS,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+                 max_backoff_seconds: float = DEFAULT_MAX_BACKOFF_SECONDS,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 keep_alive_seconds: float = DEFAULT_KEEP_ALIVE_SECONDS,
+                 transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        """
+        :param transport: Transport to use instead of the network, e.g. httpx.MockTransport in tests.
+        """
+        self._log: logging.Logger = logging.getLogger(__name__)
+        self._timeout: httpx.Timeout = httpx.Timeout(read_timeout_seconds,
+                                                     connect=connect_timeout_seconds)
+        self._limits: httpx.Limits = httpx.Limits(max_connections=max_connections,
+                                                  max_keepalive_connections=max_connections,
+                                                  keepalive_expiry=keep_alive_seconds)
+        self._max_retries: int = max_retries
+        self._backoff_seconds: float = backoff_seconds
+        self._max_backoff_seconds: float = max_backoff_seconds
+        self._transport: Optional[httpx.AsyncBaseTransport] = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_environment(cls) -> "LLMHttpClient":
+        return cls(connect_timeout_seconds=float(os.environ.get(str(cls.EnvVars.CONNECT_TIMEOUT), cls.DEFAULT_CONNECT_TIMEOUT_SECONDS)),
+                   read_timeout_seconds=float(os.environ.get(str(cls.EnvVars.READ_TIMEOUT), cls.DEFAULT_READ_TIMEOUT_SECONDS)),
+                   max_retries=int(os.environ.get(str(cls.EnvVars.MAX_RETRIES), cls.DEFAULT_MAX_RETRIES)),
+                   max_connections=int(os.environ.get(str(cls.EnvVars.MAX_CONNECTIONS), cls.DEFAULT_MAX_CONNECTIONS)))
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                self._log.debug("LLM HTTP client used from a new event loop, recreating it")
+            self._client = httpx.AsyncClient(http2=HTTP2_AVAILABLE and self._transport is None,
+                                             timeout=self._timeout,
+                                             limits=self._limits,
+                                             transport=self._transport)
+            self._client_loop = loop
+        return self._client
+
+    def _delay(self,
+               attempt: int,
+               response: Optional[httpx.Response] = None) -> float:
+        if response is not None:
+            retry_after: Optional[str] = response.headers.get("retry-after")
+            if retry_after and retry_after.replace(".", "", 1).isdigit():
+                return min(float(retry_after), self._max_backoff_seconds)
+        backoff: float = min(self._max_backoff_seconds,
+                             self._backoff_seconds * (2 ** attempt))
+        return backoff * random.uniform(0.5, 1.0)
+
+    async def post(self,
+                   url: str,
+                   **kwargs: Any) -> httpx.Response:
+        """
+        POST with retries, the response of the last attempt is returned whatever its status.
+        """
+        async with self.stream("POST", url, **kwargs) as response:
+            await response.aread()
+            return response
+
+    @asynccontextmanager
+    async def stream(self,
+                     method: str,
+                     url: str,
+                     **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """
+        Send a request whose body is read as it arrives. The request is retried until its
+        response headers are received with a status that is not retried, the body of an
+        error response is read so it can be reported.
+        """
+        attempt: int = 0
+        while True:
+            response: Optional[httpx.Response] = None
+            try:
+                client: httpx.AsyncClient = self._get_client()
+                response = await client.send(client.build_request(method, url, **kwargs),
+                                             stream=True)
+            except httpx.TransportError as e:
+                if attempt >= self._max_retries:
+                    raise
+                delay: float = self._delay(attempt)
+                self._log.warning(
+                    f"LLM request to {url} failed ({type(e).__name__}: {str(e)}), retry {attempt + 1} in {delay:.2f}s")
+            else:
+                if response.status_code not in self.RETRY_STATUS_CODES or attempt >= self._max_retries:
+                    break
+                delay = self._delay(attempt, response)
+                await response.aclose()
+                self._log.warning(
+                    f"LLM request to {url} answered {response.status_code}, retry {attempt + 1} in {delay:.2f}s")
+            attempt += 1
+            await asyncio.sleep(delay)
+        try:
+            if response.is_error:
+                await response.aread()
+            yield response
+        finally:
+            await response.aclose()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
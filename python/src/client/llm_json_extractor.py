@@ -0,0 +1,132 @@
+import json
+import logging
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+
+class MCPServerCallModel(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    mcp_server_name: str
+    mcp_capability: str
+    mcp_capability_name: Optional[str] = None
+    mcp_capability_uri: Optional[str] = None
+    parameters: Dict[str, Any] = {}
+    fields: Optional[List[str]] = None
+
+
+class ClarificationModel(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    question: str
+    response: Any = None
+
+
+class AnswerModel(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    body: Any = None
+    confidence: Any = None
+
+
+class LLMResponseModel(BaseModel):
+    """
+    The response structure the prompt asks the LLM for, sections it leaves out are empty.
+    """
+    model_config = ConfigDict(extra="allow")
+
+    mcp_server_calls: List[MCPServerCallModel] = []
+    clarifications: List[ClarificationModel] = []
+    answer: Optional[AnswerModel] = None
+    thinking: Optional[Dict[str, Any]] = None
+
+
+class LLMJSONExtractor:
+    """
+    Finds the JSON response in LLM output, which may be fenced (```json) or surrounded by
+    other text, and validates it against the response structure.
+
+    The text is scanned once for the start of an object and parsed from there, without
+    rewriting it first, so quotes and newlines inside strings are kept. Failures give a
+    structured error (error, details) rather than raising.
+    """
+
+    # Objects tried before giving up, so noisy output cannot make extraction quadratic.
+    MAX_CANDIDATES: int = 32
+
+    class Errors(str, Enum):
+        INVALID_JSON = "Invalid JSON format"
+        INVALID_STRUCTURE = "Invalid response structure"
+
+        def __str__(self) -> str:
+            return self.value
+
+    def __init__(self) -> None:
+        self._log: logging.Logger = logging.getLogger(__name__)
+        # Not strict, so raw newlines and tabs inside strings (common in LLM output) are accepted.
+        self._decoder: json.JSONDecoder = json.JSONDecoder(strict=False)
+
+    def _error(self,
+               error: "LLMJSONExtractor.Errors",
+               details: str) -> Dict[str, Any]:
+        self._log.error(f"{error}: {details}")
+        return {"error": str(error), "details": details}
+
+    def _objects(self, text: str) -> Iterator[Dict[str, Any]]:
+        """
+        The top level JSON objects in the text, in order, parsed as they are reached.
+        """
+        position: int = text.find("{")
+        candidates: int = 0
+        while position >= 0 and candidates < self.MAX_CANDIDATES:
+            candidates += 1
+            try:
+                value, end = self._decoder.raw_decode(text, position)
+            except json.JSONDecodeError:
+                position = text.find("{", position + 1)
+                continue
+            if isinstance(value, dict):
+                yield value
+            position = text.find("{", end)
+
+    @staticmethod
+    def _has_sections(value: Dict[str, Any]) -> bool:
+        return bool(set(value) & set(LLMResponseModel.model_fields))
+
+    def _structure_error(self, value: Dict[str, Any]) -> Optional[str]:
+        try:
+            LLMResponseModel.model_validate(value)
+        except ValidationError as e:
+            return "; ".join(f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                             for error in e.errors())
+        return None
+
+    def extract(self, text: Optional[str]) -> Dict[str, Any]:
+        """
+        The first object in the text with valid response sections, else the first object if
+        none has any, else a structured error.
+        """
+        if not isinstance(text, str) or not text.strip():
+            return self._error(self.Errors.INVALID_JSON, "LLM response is empty")
+        first_object: Optional[Dict[str, Any]] = None
+        first_error: Optional[str] = None
+        for value in self._objects(text):
+            if not self._has_sections(value):
+                first_object = value if first_object is None else first_object
+                continue
+            structure_error: Optional[str] = self._structure_error(value)
+            if structure_error is None:
+                return value
+            first_error = structure_error if first_error is None else first_error
+        if first_error is not None:
+            return self._error(self.Errors.INVALID_STRUCTURE, first_error)
+        if first_object is not None:
+            return first_object
+        try:
+            # Parse from the first brace to report where the JSON is invalid.
+            self._decoder.decode(text[text.find("{"):] if "{" in text else text)
+        except json.JSONDecodeError as je:
+            return self._error(self.Errors.INVALID_JSON,
+                               f"JSON Decode Error: {je.msg} at line {je.lineno}, column {je.colno}")
+        return self._error(self.Errors.INVALID_JSON, "No JSON object found in LLM response")
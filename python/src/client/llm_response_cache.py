@@ -0,0 +1,150 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class LLMResponseCache:
+    """
+    Optional on disk cache of parsed LLM responses, for development, regression tests and
+    benchmarks that send the same prompts again and again.
+
+    Responses are keyed by model, temperature and a hash of the normalised prompt. The
+    normalised prompt has whitespace collapsed and UUIDs (e.g. the session id) replaced, so
+    a replayed conversation in a new session hits the cache. Each response is one JSON file,
+    the least recently used are deleted once the cache is larger than its bound.
+    """
+
+    DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+    FILE_SUFFIX: str = ".llm.json"
+    _UUID_PATTERN: re.Pattern = re.compile(
+        r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b")
+    _WHITESPACE_PATTERN: re.Pattern = re.compile(r"\s+")
+
+    class EnvVars(str, Enum):
+        CACHE_DIR = "MCP_LLM_CACHE_DIR"
+        MAX_BYTES = "MCP_LLM_CACHE_MAX_BYTES"
+
+        def __str__(self) -> str:
+            return self.value
+
+    def __init__(self,
+                 cache_dir: Path,
+                 max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self._log: logging.Logger = logging.getLogger(__name__)
+        self._cache_dir: Path = Path(cache_dir)
+        self._max_bytes: int = max_bytes
+        self._lock: threading.Lock = threading.Lock()
+        # key -> file size, least recently used first.
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        self._bytes: int = 0
+        self._hits: int = 0
+        self._misses: int = 0
+        self._load()
+
+    @classmethod
+    def from_environment(cls) -> Optional["LLMResponseCache"]:
+        cache_dir: Optional[str] = os.environ.get(str(cls.EnvVars.CACHE_DIR))
+        if not cache_dir:
+            return None
+        return cls(cache_dir=Path(cache_dir),
+                   max_bytes=int(os.environ.get(str(cls.EnvVars.MAX_BYTES), cls.DEFAULT_MAX_BYTES)))
+
+    @classmethod
+    def normalise_prompt(cls, prompt: str) -> str:
+        return cls._WHITESPACE_PATTERN.sub(" ", cls._UUID_PATTERN.sub("<uuid>", prompt)).strip()
+
+    @classmethod
+    def key(cls,
+            model: Optional[str],
+            temperature: Optional[float],
+            prompt: str) -> str:
+        prompt_hash: str = hashlib.sha256(
+            cls.normalise_prompt(prompt).encode("utf-8")).hexdigest()
+        return hashlib.sha256(json.dumps([model, temperature, prompt_hash]).encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def _file(self, key: str) -> Path:
+        return self._cache_dir / f"{key}{self.FILE_SUFFIX}"
+
+    def _load(self) -> None:
+        """
+        Index the responses already on disk, least recently used (oldest modified) first.
+        """
+        if not self._cache_dir.is_dir():
+            return
+        entries = []
+        for cache_file in self._cache_dir.glob(f"*{self.FILE_SUFFIX}"):
+            try:
+                stat = cache_file.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, cache_file.name[:-len(self.FILE_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._bytes += size
+        self._log.info(
+            f"LLM response cache at [{self._cache_dir}] holds {len(self._sizes)} responses, {self._bytes} bytes")
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._sizes:
+                self._misses += 1
+                return None
+            cache_file: Path = self._file(key)
+            try:
+                with open(cache_file, "r", encoding="utf-8") as f:
+                    response: Any = json.load(f)
+                os.utime(cache_file)  # Most recently used, also across restarts.
+            except Exception as e:  # pylint: disable=broad-except
+                self._log.warning(
+                    f"Ignoring unreadable cached LLM response [{cache_file}]: {str(e)}")
+                self._remove(key)
+                self._misses += 1
+                return None
+            self._sizes.move_to_end(key)
+            self._hits += 1
+            return response
+
+    def put(self,
+            key: str,
+            response: Any) -> None:
+        data: bytes = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        if len(data) > self._max_bytes:
+            return
+        with self._lock:
+            try:
+                self._cache_dir.mkdir(parents=True, exist_ok=True)
+                cache_file: Path = self._file(key)
+                tmp_file: Path = cache_file.with_suffix(f".tmp{os.getpid()}")
+                tmp_file.write_bytes(data)
+                os.replace(tmp_file, cache_file)
+            except Exception as e:  # pylint: disable=broad-except
+                self._log.warning(
+                    f"Unable to cache LLM response in [{self._cache_dir}]: {str(e)}")
+                return
+            self._bytes -= self._sizes.pop(key, 0)
+            self._sizes[key] = len(data)
+            self._bytes += len(data)
+            while self._bytes > self._max_bytes:
+                self._remove(next(iter(self._sizes)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._sizes),
+                    "bytes": self._bytes,
+                    "max_bytes": self._max_bytes,
+                    "hits": self._hits,
+                    "misses": self._misses}
+
+    def _remove(self, key: str) -> None:
+        self._bytes -= self._sizes.pop(key, 0)
+        self._file(key).unlink(missing_ok=True)
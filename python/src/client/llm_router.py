@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class LLMRouter:
+    """
+    Routes LLM calls over the configured providers (e.g. OpenRouter and Ollama models).
+
+    The rolling latency and outcome of recent calls are kept per provider. A call goes to
+    the healthy provider with the lowest mean latency weighted by its error rate, a provider
+    with failing calls is taken out of rotation for a cool down. If the call fails it fails over to the next
+    provider, and if it is still running after the provider's latency percentile (p95 by
+    default) the call is hedged by sending it to the next provider too, the first
+    successful response wins. Streamed calls are not hedged, as the tokens of both would
+    be relayed, and do not fail over once tokens of the failed call have been relayed.
+    """
+
+    DEFAULT_WINDOW: int = 50
+    DEFAULT_HEDGE_PERCENTILE: float = 0.95
+    DEFAULT_MIN_SAMPLES: int = 5
+    DEFAULT_MAX_ERROR_RATE: float = 0.5
+    DEFAULT_MAX_CONSECUTIVE_FAILURES: int = 3
+    DEFAULT_COOL_DOWN_SECONDS: float = 30.0
+
+    class EnvVars(str, Enum):
+        HEDGE_PERCENTILE = "MCP_LLM_HEDGE_PERCENTILE"
+        COOL_DOWN = "MCP_LLM_COOL_DOWN"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class _Provider:
+        def __init__(self,
+                     name: str,
+                     call: Callable[[str, Optional[Callable[[str], None]]], Awaitable[Tuple[bool, Any]]],
+                     window: int,
+                     model: Optional[str],
+                     temperature: Optional[float]) -> None:
+            self.name: str = name
+            self.call = call
+            self.model: Optional[str] = model
+            self.temperature: Optional[float] = temperature
+            self.latencies: Deque[float] = deque(maxlen=window)
+            self.outcomes: Deque[bool] = deque(maxlen=window)
+            self.consecutive_failures: int = 0
+            self.unhealthy_until: float = 0.0
+            self.requests: int = 0
+            self.failures: int = 0
+            self.selected: int = 0
+            self.hedges: int = 0
+            self.hedge_wins: int = 0
+            self.failovers: int = 0
+
+        def info(self) -> Dict[str, Any]:
+            return {"provider": self.name, "model": self.model, "temperature": self.temperature}
+
+        def healthy(self, now: float) -> bool:
+            return self.unhealthy_until <= now
+
+        def mean_latency(self) -> float:
+            # Providers not yet measured are tried first, so every provider gets measured.
+            return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+        def expected_latency(self) -> float:
+            # A provider failing half its calls takes, in effect, twice as long to answer.
+            return self.mean_latency() / max(1.0 - self.error_rate(), 0.1)
+
+        def error_rate(self) -> float:
+            return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+        def latency_percentile(self, percentile: float) -> Optional[float]:
+            if not self.latencies:
+                return None
+            ordered: List[float] = sorted(self.latencies)
+            return ordered[min(len(ordered) - 1, math.ceil(percentile * len(ordered)) - 1)]
+
+    def __init__(self,
+                 hedge_percentile: float = DEFAULT_HEDGE_PERCENTILE,
+                 window: int = DEFAULT_WINDOW,
+                 min_samples: int = DEFAULT_MIN_SAMPLES,
+                 max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+                 max_consecutive_failures: int = DEFAULT_MAX_CONSECUTIVE_FAILURES,
+                 cool_down_seconds: float = DEFAULT_COOL_DOWN_SECONDS) -> None:
+        """
+        :param hedge_percentile: Latency percentile of the provider after which a call is hedged, 0 to never hedge.
+        :param window: Number of recent calls the latency and error rate of a provider are taken over.
+        :param min_samples: Calls a provider needs before its latency percentile or error rate is acted on.
+        :param cool_down_seconds: Seconds an unhealthy provider is out of rotation.
+        """
+        self._log: logging.Logger = logging.getLogger(__name__)
+        self._hedge_percentile: float = hedge_percentile
+        self._window: int = window
+        self._min_samples: int = min_samples
+        self._max_error_rate: float = max_error_rate
+        self._max_consecutive_failures: int = max_consecutive_failures
+        self._cool_down_seconds: float = cool_down_seconds
+        self._providers: List[LLMRouter._Provider] = []
+
+    @classmethod
+    def from_environment(cls) -> "LLMRouter":
+        return cls(hedge_percentile=float(os.environ.get(str(cls.EnvVars.HEDGE_PERCENTILE), cls.DEFAULT_HEDGE_PERCENTILE)),
+                   cool_down_seconds=float(os.environ.get(str(cls.EnvVars.COOL_DOWN), cls.DEFAULT_COOL_DOWN_SECONDS)))
+
+    def add_provider(self,
+                     name: str,
+                     call: Callable[[str, Optional[Callable[[str], None]]], Awaitable[Tuple[bool, Any]]],
+                     model: Optional[str] = None,
+                     temperature: Optional[float] = None) -> None:
+        """
+        :param call: Coroutine function of (prompt, on_token) giving (success, response) as the LLM adapters do.
+        :param model: The model the provider calls, and the temperature it calls it at.
+        """
+        self._providers.append(LLMRouter._Provider(name, call, self._window, model, temperature))
+
+    def preferred(self) -> Optional[Dict[str, Any]]:
+        """
+        The provider, model and temperature a call would be sent to first, None if there are no providers.
+        """
+        ranked: List[LLMRouter._Provider] = self._ranked()
+        return ranked[0].info() if ranked else None
+
+    def __len__(self) -> int:
+        return len(self._providers)
+
+    @property
+    def provider_names(self) -> List[str]:
+        return [provider.name for provider in self._providers]
+
+    def _ranked(self) -> List["LLMRouter._Provider"]:
+        """
+        Healthy providers fastest first, then those cooling down as a last resort.
+        """
+        now: float = time.monotonic()
+        return sorted(self._providers,
+                      key=lambda provider: (not provider.healthy(now), provider.expected_latency()))
+
+    def _hedge_after(self, provider: "LLMRouter._Provider") -> Optional[float]:
+        if self._hedge_percentile <= 0 or len(provider.latencies) < self._min_samples:
+            return None
+        return provider.latency_percentile(self._hedge_percentile)
+
+    def _record(self,
+                provider: "LLMRouter._Provider",
+                success: bool,
+                latency: float) -> None:
+        provider.requests += 1
+        provider.outcomes.append(success)
+        if success:
+            provider.latencies.append(latency)
+            provider.consecutive_failures = 0
+            return
+        provider.failures += 1
+        provider.consecutive_failures += 1
+        if provider.consecutive_failures >= self._max_consecutive_failures or \
+                (len(provider.outcomes) >= self._min_samples and provider.error_rate() > self._max_error_rate):
+            provider.unhealthy_until = time.monotonic() + self._cool_down_seconds
+            self._log.warning(
+                f"LLM provider [{provider.name}] out of rotation for {self._cool_down_seconds}s, "
+                f"error rate {provider.error_rate():.2f}, {provider.consecutive_failures} consecutive failures")
+
+    async def _timed_call(self,
+                          provider: "LLMRouter._Provider",
+                          prompt: str,
+                          on_token: Optional[Callable[[str], None]]) -> Tuple[bool, Any]:
+        start: float = time.monotonic()
+        try:
+            success, response = await provider.call(prompt, on_token)
+        except Exception as e:  # pylint: disable=broad-except
+            success, response = False, {"error": f"LLM provider [{provider.name}] failed: {str(e)}"}
+        self._record(provider, success, time.monotonic() - start)
+        return success, response
+
+    async def get_llm_response(self,
+                               prompt: str,
+                               on_token: Optional[Callable[[str], None]] = None
+                               ) -> Tuple[bool, Any, Optional[Dict[str, Any]]]:
+        """
+        The response of the first provider to answer successfully, else the last failure,
+        with the provider, model and temperature that gave it (None if none was called).
+        """
+        candidates: List[LLMRouter._Provider] = self._ranked()
+        if not candidates:
+            return False, {"error": "No LLM provider is configured"}, None
+        candidates[0].selected += 1
+
+        running: Dict[asyncio.Task, LLMRouter._Provider] = {}
+        hedged: List[LLMRouter._Provider] = []
+        next_candidate: int = 0
+        last_failure: Any = {"error": "No LLM provider answered"}
+        last_provider: Optional[LLMRouter._Provider] = None
+        tokens_relayed: bool = False
+
+        def relay(token: str) -> None:
+            nonlocal tokens_relayed
+            tokens_relayed = True
+            on_token(token)
+
+        def start(hedge: bool) -> LLMRouter._Provider:
+            nonlocal next_candidate
+            provider: LLMRouter._Provider = candidates[next_candidate]
+            next_candidate += 1
+            if hedge:
+                provider.hedges += 1
+                hedged.append(provider)
+            running[asyncio.ensure_future(self._timed_call(provider,
+                                                           prompt,
+                                                           relay if on_token is not None else None))] = provider
+            return provider
+
+        start(hedge=False)
+        try:
+            while running:
+                hedge_after: Optional[float] = None
+                if on_token is None and len(running) == 1 and next_candidate < len(candidates):
+                    hedge_after = self._hedge_after(next(iter(running.values())))
+                done, _ = await asyncio.wait(list(running),
+                                             timeout=hedge_after,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    slow: LLMRouter._Provider = next(iter(running.values()))
+                    hedge: LLMRouter._Provider = start(hedge=True)
+                    self._log.info(
+                        f"LLM call to [{slow.name}] slower than p{int(self._hedge_percentile * 100)} "
+                        f"({hedge_after:.2f}s), hedging with [{hedge.name}]")
+                    continue
+                for task in done:
+                    provider: LLMRouter._Provider = running.pop(task)
+                    success, response = task.result()
+                    if success:
+                        if provider in hedged:
+                            provider.hedge_wins += 1
+                        return True, response, provider.info()
+                    last_failure = response
+                    last_provider = provider
+                if not running and next_candidate < len(candidates):
+                    if tokens_relayed:
+                        # The caller already has part of this answer, another would run into it.
+                        self._log.warning(
+                            f"Streamed LLM call failed after relaying tokens, not failing over: {last_failure}")
+                        break
+                    failed_over: LLMRouter._Provider = start(hedge=False)
+                    failed_over.failovers += 1
+                    self._log.warning(
+                        f"LLM call failed, failing over to [{failed_over.name}]: {last_failure}")
+        finally:
+            for task in running:
+                task.cancel()
+        return False, last_failure, last_provider.info() if last_provider is not None else None
+
+    def metrics(self) -> Dict[str, Any]:
+        now: float = time.monotonic()
+        ranked: List[LLMRouter._Provider] = self._ranked()
+        return {"preferred": ranked[0].name if ranked else None,
+                "hedge_percentile": self._hedge_percentile,
+                "providers": {provider.name: {"healthy": provider.healthy(now),
+                                              "requests": provider.requests,
+                                              "failures": provider.failures,
+                                              "error_rate": round(provider.error_rate(), 4),
+                                              "mean_latency_seconds": round(provider.mean_latency(), 4),
+                                              "p50_latency_seconds": provider.latency_percentile(0.5),
+                                              "p95_latency_seconds": provider.latency_percentile(0.95),
+                                              "selected": provider.selected,
+                                              "hedges": provider.hedges,
+                                              "hedge_wins": provider.hedge_wins,
+                                              "failovers": provider.failovers}
+                              for provider in self._providers}}
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import logging
+import uuid
+from typing import Any, Dict, List, Optional
+from session_store import SessionStore
+from mcp_client import MCPClient
+
+
+class MCPCallMemo:
+    """
+    The MCP responses of each LLM session, in the order they were added.
+
+    Responses to calls of read only tools (annotated readOnlyHint) are keyed by a canonical
+    hash of the call, so a repeated call can be answered from the memo and appears once in
+    the prompt. Other responses are always added as new entries.
+
+    Responses are held in a session store, so idle sessions are evicted rather than kept
+    for the life of the client.
+    """
+
+    NAMESPACE: str = "mcp_responses"
+
+    CALL_FIELDS: List[str] = ["mcp_server_name",
+                              "mcp_capability",
+                              "mcp_capability_name",
+                              "mcp_capability_uri",
+                              "parameters",
+                              "fields"]
+
+    def __init__(self,
+                 session_store: Optional[SessionStore] = None) -> None:
+        self._log: logging.Logger = logging.getLogger(__name__)
+        self._session_store: SessionStore = session_store if session_store is not None else SessionStore()
+
+    @classmethod
+    def call_key(cls, call: Dict[str, Any]) -> str:
+        """
+        A hash of the call that is the same for the same server, capability, name, URI and
+        parameters whatever the order of the keys.
+        """
+        canonical: str = json.dumps({field: call.get(field) for field in cls.CALL_FIELDS},
+                                    sort_keys=True,
+                                    separators=(",", ":"),
+                                    default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_memoizable(annotations: Optional[Dict[str, Any]]) -> bool:
+        """
+        True for read only tools. An idempotent tool may still change state, so a repeated
+        call is run again rather than dropped.
+        """
+        return bool(annotations and annotations.get("readOnlyHint"))
+
+    @staticmethod
+    def is_read_only(annotations: Optional[Dict[str, Any]]) -> bool:
+        """
+        True for tools without side effects, whose calls may be made before they are asked for.
+        A tool also hinted destructive is not trusted to be read only.
+        """
+        return bool(annotations and annotations.get("readOnlyHint") and not annotations.get("destructiveHint"))
+
+    @staticmethod
+    def is_error(response: Any) -> bool:
+        """
+        True for a failed call, by the same check MCPClient uses for its response cache.
+        """
+        return MCPClient.is_failed_result(response)
+
+    def get(self,
+            llm_session: uuid.UUID,
+            key: str) -> Optional[Dict[str, Any]]:
+        return self._session_store.get(llm_session, self.NAMESPACE, key)
+
+    def add(self,
+            llm_session: uuid.UUID,
+            response: Dict[str, Any],
+            key: Optional[str] = None) -> None:
+        """
+        Add a response to the session, under the call key if given, else as a new entry.
+        """
+        self._session_store.put(llm_session, self.NAMESPACE,
+                                key if key else str(uuid.uuid4()), response)
+
+    def responses(self, llm_session: uuid.UUID) -> List[Dict[str, Any]]:
+        return self._session_store.values(llm_session, self.NAMESPACE)
@@ -6,19 +6,25 @@ import urllib.parse
 from calendar import c
 from enum import Enum
 from math import e
-from typing import List, Dict, Any, Optional, Text, Union, Literal, final
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Text, Tuple, Union, Literal, final
 from mcp.client.session import ClientSession
-from mcp.client.sse import sse_client
 from pydantic import AnyUrl
 import pydantic
 import mcp.types as types
 import json
+from tracing import get_tracer
+from mcp_session_pool import MCPSessionPool
+from capability_cache import CapabilityCache
+from mcp_routing_table import MCPRoutingTable
+from mcp_response_cache import MCPResponseCache
 
 
 class MCPClient:
     """
     A client to connect to MCP servers and retrieve their capabilities.
     """
+    DEFAULT_DISCOVERY_TIMEOUT_SECONDS: float = 10.0
+
     class FailedToGetMCPServerCapabilities(Exception):
         pass
 
@@ -66,12 +72,30 @@ class MCPClient:
         def __str__(self) -> Literal['sse', 'stdio', 'streamable-http']:
             return self.value
 
-    def __init__(self, server_base_urls: List[str]):
+    def __init__(self,
+                 server_base_urls: List[str],
+                 session_pool: Optional[MCPSessionPool] = None,
+                 discovery_timeout_seconds: float = DEFAULT_DISCOVERY_TIMEOUT_SECONDS,
+                 capability_cache: Optional[CapabilityCache] = None,
+                 response_cache: Optional[MCPResponseCache] = None):
         if not server_base_urls:
             raise ValueError("At least one server base URL must be provided.")
         self._server_base_urls: List[str] = server_base_urls
-        self._capabilities_cache: Dict[str, Dict[str, Any]] = {}
+        # Tool and resource calls reuse long lived sessions rather than connecting per call.
+        self._session_pool: MCPSessionPool = session_pool if session_pool else MCPSessionPool.from_environment()
+        self._discovery_timeout_seconds: float = discovery_timeout_seconds
+        # Capabilities are served from the cache, stale entries are refreshed in the background
+        # and servers' list_changed notifications mark their entry stale.
+        self._capabilities_cache: CapabilityCache = capability_cache if capability_cache else CapabilityCache.from_environment()
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        # Responses of read only, idempotent tools are shared across sessions until their TTL expires.
+        self._response_cache: MCPResponseCache = response_cache if response_cache else MCPResponseCache.from_environment()
+        # Server name to URL and tool name to server lookups, kept in step with the cache.
+        self._routing_table: MCPRoutingTable = MCPRoutingTable()
+        self._session_pool.set_message_handler_factory(
+            self._capability_change_handler)
         self._transport: MCPClient.MCPServerTransport = MCPClient.MCPServerTransport.SSE
+        self._tracer = get_tracer()
         self._log: logging.Logger = logging.getLogger(
             __name__)  # Added logger instance
         # Configure basic logging if no handlers are already set for the root logger
@@ -82,6 +106,7 @@ class MCPClient:
                 format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
                 handlers=[logging.StreamHandler()]
             )
+        self._update_routes_from_cache()
 
     def get_trasnsport(self) -> "MCPClient.MCPServerTransport":
         return self._transport
@@ -97,20 +122,107 @@ class MCPClient:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         self._log.debug("MCPClient exiting async context.")
-        # Perform any cleanup if needed.
-        # If an exception occurred, it will be passed here.
-        # Return False (or nothing, which defaults to False) to re-raise the exception.
-        # Return True to suppress the exception (generally not recommended unless handled).
-        pass
+        # Close the pooled sessions, any exception passed in is re-raised.
+        await self.close()
 
-    async def get_server_capabilities(self, server_base_url: str) -> Dict[str, Any]:
+    async def close(self) -> None:
+        await self._session_pool.close()
 
-        sse_url: str = self.get_full_server_url(server_base_url)
+    @property
+    def session_pool(self) -> MCPSessionPool:
+        return self._session_pool
 
-        if server_base_url in self._capabilities_cache:
-            self._log.info(
+    @property
+    def capabilities_version(self) -> int:
+        return self._capabilities_cache.version
+
+    @property
+    def response_cache(self) -> MCPResponseCache:
+        return self._response_cache
+
+    @property
+    def routing_table(self) -> MCPRoutingTable:
+        return self._routing_table
+
+    def serves(self, server_name: str) -> bool:
+        """
+        True if the named server is one of this client's servers and its capabilities are known.
+        """
+        return self._routing_table.server_url(server_name) is not None
+
+    def _update_routes_from_cache(self) -> None:
+        for server_base_url, capabilities in self._capabilities_cache.items():
+            if server_base_url in self._server_base_urls:
+                self._update_routes(server_base_url, capabilities)
+
+    def _update_routes(self,
+                       server_base_url: str,
+                       capabilities: Dict[str, Any]) -> None:
+        try:
+            self._routing_table.update(server_base_url, capabilities)
+        except ValueError as ve:
+            self._log.warning(
+                f"Not routing to MCP server at [{server_base_url}]: {str(ve)}")
+
+    def _capability_change_handler(self, sse_url: str) -> Callable[[Any], Awaitable[None]]:
+        server_base_url: Optional[str] = next((url for url in self._server_base_urls
+                                               if self.get_full_server_url(url) == sse_url), None)
+
+        async def handle_message(message: Any) -> None:
+            if server_base_url is None or not isinstance(message, types.ServerNotification):
+                return
+            if isinstance(message.root, (types.ToolListChangedNotification,
+                                         types.ResourceListChangedNotification,
+                                         types.PromptListChangedNotification)):
+                self._log.info(
+                    f"Server at [{server_base_url}] reported {message.root.method}, refreshing capabilities")
+                self._capabilities_cache.invalidate(server_base_url)
+                self._schedule_refresh(server_base_url)
+
+        return handle_message
+
+    def _schedule_refresh(self, server_base_url: str) -> None:
+        task: Optional[asyncio.Task] = self._refresh_tasks.get(server_base_url)
+        if task is not None and not task.done():
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._fetch_server_capabilities(server_base_url)
+            except Exception as e:  # pylint: disable=broad-except
+                self._log.warning(
+                    f"Background refresh of capabilities for [{server_base_url}] failed: {str(e)}")
+
+        self._refresh_tasks[server_base_url] = asyncio.get_running_loop().create_task(refresh())
+
+    async def refresh_capabilities(self, force: bool = False) -> None:
+        """
+        Fetch the capabilities of all servers whose cache entry is stale, or of all
+        servers if forced, and wait for them to complete.
+        """
+        urls: List[str] = list(self._server_base_urls) if force else self._capabilities_cache.stale_urls(
+            self._server_base_urls)
+        results = await asyncio.gather(*[self._fetch_server_capabilities(url) for url in urls],
+                                       return_exceptions=True)
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                self._log.warning(
+                    f"Refresh of capabilities for [{url}] failed: {str(result)}")
+
+    async def get_server_capabilities(self, server_base_url: str) -> Dict[str, Any]:
+        cached: Optional[Dict[str, Any]] = self._capabilities_cache.get(
+            server_base_url)
+        if cached is not None:
+            if not self._capabilities_cache.is_fresh(server_base_url):
+                self._schedule_refresh(server_base_url)
+            self._log.debug(
                 f"Returning cached capabilities for [{server_base_url}]")
-            return self._capabilities_cache[server_base_url]
+            return cached
+        return await self._fetch_server_capabilities(server_base_url)
+
+    async def _fetch_server_capabilities(self, server_base_url: str) -> Dict[str, Any]:
+
+        sse_url: str = self.get_full_server_url(server_base_url)
 
         capabilities: Dict[str, Any] = {}
         capabilities[MCPClient.MCPServerCapabilities.SERVER_DETAIL.value] = {}
@@ -122,55 +234,70 @@ class MCPClient:
         try:
             self._log.info(
                 f"Attempting to connect to MCP server at: {sse_url}")
-            async with sse_client(sse_url) as (read_stream, write_stream):
-                async with ClientSession(read_stream, write_stream) as session:
-                    initialize_result: types.InitializeResult = await session.initialize()
-                    await asyncio.sleep(1)
-
-                    self._log.info(
-                        f"Successfully connected to {sse_url}. Fetching capabilities from {initialize_result.serverInfo.name}")
-
-                    capabilities[MCPClient.MCPServerCapabilities.SERVER_DETAIL.value][
-                        MCPClient.MCPServerDetail.SERVER_URL.value] = server_base_url
-                    capabilities[MCPClient.MCPServerCapabilities.SERVER_DETAIL.value][
-                        MCPClient.MCPServerDetail.NAME.value] = initialize_result.serverInfo.name
-                    capabilities[MCPClient.MCPServerCapabilities.SERVER_DETAIL.value][
-                        MCPClient.MCPServerDetail.INSTRUCTIONS.value] = initialize_result.instructions
-                    capabilities[MCPClient.MCPServerCapabilities.SERVER_DETAIL.value][
-                        MCPClient.MCPServerDetail.VERSION.value] = initialize_result.serverInfo.version
-
-                    list_tools_result: types.ListToolsResult = await session.list_tools()
-                    if list_tools_result and list_tools_result.tools:
-                        for tool in list_tools_result.tools:
-                            capabilities[MCPClient.MCPServerCapabilities.TOOLS.value].append(
-                                self._format_tool(tool))
-
-                    list_resources_result: types.ListResourcesResult = await session.list_resources()
-                    if list_resources_result and list_resources_result.resources:
-                        for resource in list_resources_result.resources:
-                            capabilities[MCPClient.MCPServerCapabilities.RESOURCES.value].append(
-                                self._format_resource(resource))
-
-                    list_resource_templates_result: types.ListResourceTemplatesResult = await session.list_resource_templates()
-                    if list_resource_templates_result and list_resource_templates_result.resourceTemplates:
-                        for rt in list_resource_templates_result.resourceTemplates:
-                            capabilities[MCPClient.MCPServerCapabilities.RESOURCE_TEMPLATES.value].append(
-                                self._format_resource_template(rt))
-
-                    list_prompts_result: types.ListPromptsResult = await session.list_prompts()
-                    if list_prompts_result and list_prompts_result.prompts:
-                        for prompt in list_prompts_result.prompts:
-                            capabilities[MCPClient.MCPServerCapabilities.PROMPTS.value].append(
-                                self._format_prompt(prompt))
-
-            self._capabilities_cache[server_base_url] = capabilities
+
+            async def list_all(session: ClientSession) -> Tuple[Any, ...]:
+                # The session is initialized when handed out by the pool, so the four list
+                # calls can go straight out, concurrently over the one session.
+                return await asyncio.gather(session.list_tools(),
+                                            session.list_resources(),
+                                            session.list_resource_templates(),
+                                            session.list_prompts())
+
+            list_results: Tuple[Any, ...] = await asyncio.wait_for(self._session_pool.run(sse_url, list_all, retry=True),
+                                                                   self._discovery_timeout_seconds)
+            list_tools_result: types.ListToolsResult
+            list_resources_result: types.ListResourcesResult
+            list_resource_templates_result: types.ListResourceTemplatesResult
+            list_prompts_result: types.ListPromptsResult
+            list_tools_result, list_resources_result, list_resource_templates_result, list_prompts_result = list_results
+
+            initialize_result: Optional[types.InitializeResult] = self._session_pool.server_info(
+                sse_url)
+            if initialize_result is None:
+                raise MCPClient.FailedToEstablishMCPServerSession(
+                    f"No initialized session for {sse_url}")
+
+            self._log.info(
+                f"Successfully connected to {sse_url}. Fetched capabilities from {initialize_result.serverInfo.name}")
+
+            capabilities[MCPClient.MCPServerCapabilities.SERVER_DETAIL.value][
+                MCPClient.MCPServerDetail.SERVER_URL.value] = server_base_url
+            capabilities[MCPClient.MCPServerCapabilities.SERVER_DETAIL.value][
+                MCPClient.MCPServerDetail.NAME.value] = initialize_result.serverInfo.name
+            capabilities[MCPClient.MCPServerCapabilities.SERVER_DETAIL.value][
+                MCPClient.MCPServerDetail.INSTRUCTIONS.value] = initialize_result.instructions
+            capabilities[MCPClient.MCPServerCapabilities.SERVER_DETAIL.value][
+                MCPClient.MCPServerDetail.VERSION.value] = initialize_result.serverInfo.version
+
+            if list_tools_result and list_tools_result.tools:
+                for tool in list_tools_result.tools:
+                    capabilities[MCPClient.MCPServerCapabilities.TOOLS.value].append(
+                        self._format_tool(tool))
+
+            if list_resources_result and list_resources_result.resources:
+                for resource in list_resources_result.resources:
+                    capabilities[MCPClient.MCPServerCapabilities.RESOURCES.value].append(
+                        self._format_resource(resource))
+
+            if list_resource_templates_result and list_resource_templates_result.resourceTemplates:
+                for rt in list_resource_templates_result.resourceTemplates:
+                    capabilities[MCPClient.MCPServerCapabilities.RESOURCE_TEMPLATES.value].append(
+                        self._format_resource_template(rt))
+
+            if list_prompts_result and list_prompts_result.prompts:
+                for prompt in list_prompts_result.prompts:
+                    capabilities[MCPClient.MCPServerCapabilities.PROMPTS.value].append(
+                        self._format_prompt(prompt))
+
+            self._capabilities_cache.put(server_base_url, capabilities)
+            self._update_routes(server_base_url, capabilities)
             return capabilities
         except ConnectionRefusedError as ce:
             raise MCPClient.FailedToGetMCPServerCapabilities(
                 f"Connection refused when trying to connect to {sse_url}. Is the server running?") from ce
         except asyncio.TimeoutError as te:
             raise MCPClient.FailedToGetMCPServerCapabilities(
-                f"Timeout when trying to connect or communicate with {sse_url}.") from te
+                f"Timeout after {self._discovery_timeout_seconds}s when trying to connect or communicate with {sse_url}.") from te
         except Exception as e:
             raise MCPClient.FailedToGetMCPServerCapabilities(
                 f"Unable to get MCP capabilities for server at this address {server_base_url}: {str(e)}"
@@ -180,12 +307,15 @@ class MCPClient:
         input_schema_data = tool.inputSchema if isinstance(
             tool.inputSchema, dict) else {}
 
-        return {
+        formatted_tool: Dict[str, Any] = {
             "name": tool.name,
             "description": tool.description,
             "inputSchema": input_schema_data,
             "annotations": self._format_tool_annotations(tool.annotations) if tool.annotations else None
         }
+        if tool.meta and tool.meta.get(MCPResponseCache.TTL_META_KEY) is not None:
+            formatted_tool[MCPResponseCache.TTL_META_KEY] = tool.meta[MCPResponseCache.TTL_META_KEY]
+        return formatted_tool
 
     def _format_tool_annotations(self, annotations: types.ToolAnnotations) -> Dict[str, Any]:
         return {
@@ -242,9 +372,16 @@ class MCPClient:
         try:
             tasks = [self.get_server_capabilities(
                 url) for url in self._server_base_urls]
-            task_results = await asyncio.gather(*tasks, return_exceptions=False)
-            for result in task_results:
-                if isinstance(result, dict):
+            # Each server has its own discovery timeout, a server that fails or is slow is
+            # left out so the capabilities of the others are still returned.
+            task_results = await asyncio.gather(*tasks, return_exceptions=True)
+            failed: List[str] = []
+            for url, result in zip(self._server_base_urls, task_results):
+                if isinstance(result, Exception):
+                    self._log.warning(
+                        f"Skipping MCP server at [{url}], capabilities not available: {str(result)}")
+                    failed.append(url)
+                elif isinstance(result, dict):
                     server_name = result[MCPClient.MCPServerCapabilities.SERVER_DETAIL.value][
                         MCPClient.MCPServerDetail.NAME.value]
                     if not server_name or not isinstance(server_name, str) or server_name.strip() == "":
@@ -257,6 +394,9 @@ class MCPClient:
                 else:
                     raise TypeError(
                         f"Unexpected result type: {type(result)}. Expected {type({})}.")
+            if len(failed) == len(self._server_base_urls):
+                raise MCPClient.FailedToGetMCPServerCapabilities(
+                    f"No MCP server responded, tried {failed}")
         except Exception as e:
             msg: str = f"An error occurred while fetching server details. [{str(e)}]"
             self._log.error(msg=msg)
@@ -265,53 +405,31 @@ class MCPClient:
 
     async def _get_server_url(self, server_name: str) -> Optional[str]:
         """
-        Retrieves the base URL for a given server name from the cache.
-        If the cache is empty, it attempts to populate it first.
+        Retrieves the base URL for a given server name from the routing table.
+        If the server is not known yet, the capabilities of all servers are fetched first.
 
         :param server_name: The unique name of the MCP server.
-        :return: The base URL of the server, or None if not found.
+        :return: The base URL of the server.
         """
+        found_url: Optional[str] = self._routing_table.server_url(server_name)
+        if found_url:
+            return found_url
         try:
-            if not self._capabilities_cache:
+            self._update_routes_from_cache()
+            if not self.serves(server_name):
                 self._log.info(
-                    "_get_server_url: Capabilities cache is empty, populating...")
-                await self.get_details_of_all_servers()  # This populates the cache by base_url
-
-            # Iterate through the cached capabilities (which are keyed by base_url)
-            # to find the server by its name.
-            found_url: Optional[str] = None
-            for base_url, cached_data in self._capabilities_cache.items():
-                if isinstance(cached_data, dict):
-                    server_detail = cached_data.get(
-                        self.MCPServerCapabilities.SERVER_DETAIL.value)
-                    if isinstance(server_detail, dict):
-                        if server_detail.get(self.MCPServerDetail.NAME.value, None) == server_name:
-                            found_url = server_detail.get(
-                                self.MCPServerDetail.SERVER_URL.value, None)
-                        if found_url:
-                            # Validate found_url is a valid URL
-                            try:
-                                pydantic.AnyUrl(found_url)
-                                self._log.debug(
-                                    f"Found valid URL '{found_url}' for server name '{server_name}'.")
-                            except pydantic.ValidationError:
-                                msg = f"Found URL '{found_url}' for server name '{server_name}', but it is not a valid URL."
-                                self._log.error(msg=msg)
-                                found_url = None
-                                raise ValueError(msg) from None
-                            break
-                else:
-                    raise TypeError(
-                        f"Internal error, Expected cached server data to be a dict, got {type(cached_data)} for base_url {base_url}.")
-            if not found_url:
-                msg = f"_get_server_url: Server name '{server_name}' not found in the cache."
-                self._log.error(msg=msg)
-                raise MCPClient.FailedToFindMCPServerURL(msg)
-            return found_url
+                    f"_get_server_url: Server name '{server_name}' not routed yet, fetching capabilities...")
+                await self.get_details_of_all_servers()
+            found_url = self._routing_table.server_url(server_name)
         except Exception as e:
             msg = f"_get_server_url: An error occurred while retrieving the server URL for '{server_name}': {str(e)}"
             self._log.error(msg=msg)
             raise MCPClient.FailedToFindMCPServerURL(msg) from e
+        if not found_url:
+            msg = f"_get_server_url: Server name '{server_name}' not found in the cache."
+            self._log.error(msg=msg)
+            raise MCPClient.FailedToFindMCPServerURL(msg)
+        return found_url
 
     async def _get_server_session(self, server_name: str) -> Optional[ClientSession]:
         session: Optional[ClientSession] = None
@@ -319,12 +437,11 @@ class MCPClient:
             sse_url: Optional[str] = await self._get_server_url(server_name)
             if sse_url:
                 sse_url = self.get_full_server_url(sse_url)
-                async with sse_client(sse_url) as (read_stream, write_stream):
-                    async with ClientSession(read_stream, write_stream) as session:
-                        initialize_result: types.InitializeResult = await session.initialize()
-                        await asyncio.sleep(1)
-                        self._log.info(
-                            f"Successfully connected to {sse_url}. created new session with {initialize_result.serverInfo.name}")
+                pooled = await self._session_pool.acquire(sse_url)
+                self._session_pool.release(pooled)
+                session = pooled.session
+                self._log.info(
+                    f"Using pooled session to {sse_url} with {pooled.initialize_result.serverInfo.name}")
 
         except Exception as e:
             msg = f"_get_server_session: An error occurred while getting session for server '{server_name}': {str(e)}"
@@ -368,8 +485,10 @@ class MCPClient:
             result = [
                 {self.MCPResponse.ERROR.value: "No result retruned from tool execution."}]
         if tool_result.isError:
-            result = [
-                {self.MCPResponse.ERROR.value: "Tool reported an error and did not return a result"}]
+            # The content of a failed call is the error message, not a result.
+            return [{self.MCPResponse.ERROR.value: "Tool reported an error and did not return a result",
+                     self.MCPResponse.DETAILS.value: " ".join(content.text for content in tool_result.content
+                                                              if isinstance(content, types.TextContent))}]
         res: List[Dict[str, Any]] = []
         for content in tool_result.content:
             if isinstance(content, types.TextContent):
@@ -434,7 +553,19 @@ class MCPClient:
         resource_uri: str,
         arguments: dict[str, Any]
     ) -> Any:
-        mcp_session: Optional[ClientSession] = None
+        with self._tracer.span("MCPClient.execute_resource", server=server_name, resource=resource_name):
+            return await self._execute_resource(server_name=server_name,
+                                                resource_name=resource_name,
+                                                resource_uri=resource_uri,
+                                                arguments=arguments)
+
+    async def _execute_resource(
+        self,
+        server_name: str,
+        resource_name: str,
+        resource_uri: str,
+        arguments: dict[str, Any]
+    ) -> Any:
         result: Dict[str, List[Dict[str, Any]]] = {
             self.MCPResponse.RESULTS.value: []}
         result[self.MCPResponse.RESULTS.value].append({self.MCPResponse.SOURCE.value: self._request_source(
@@ -445,19 +576,17 @@ class MCPClient:
             sse_url: Optional[str] = await self._get_server_url(server_name)
             if sse_url:
                 sse_url = self.get_full_server_url(sse_url)
-                async with sse_client(sse_url) as (read_stream, write_stream):
-                    async with ClientSession(read_stream, write_stream) as mcp_session:
-                        initialize_result: types.InitializeResult = await mcp_session.initialize()
-                        self._log.info(
-                            f"Successfully connected to {sse_url} to get resource '{resource_name}' on server '{initialize_result.serverInfo.name}'.")
-                        resource_any_uri: pydantic.AnyUrl = self._encode_arguments_into_url(
-                            url=resource_uri, arguments=arguments)
-                        resource_result: types.ReadResourceResult = await mcp_session.read_resource(resource_any_uri)
-                        if resource_result is None:
-                            raise MCPClient.FailedToInvokeMCPServerCapability(
-                                f"Resource '{resource_name}' returned no result from server '{server_name}'.")
-                        result[self.MCPResponse.RESPONSE.value].append(
-                            {self.MCPResponse.RESULTS.value: self._extract_resource_result(resource_result)})
+                resource_any_uri: pydantic.AnyUrl = self._encode_arguments_into_url(
+                    url=resource_uri, arguments=arguments)
+                resource_result: types.ReadResourceResult = await self._session_pool.run(
+                    sse_url, lambda mcp_session: mcp_session.read_resource(resource_any_uri), retry=True)
+                self._log.info(
+                    f"Got resource '{resource_name}' from {sse_url} on server '{server_name}'.")
+                if resource_result is None:
+                    raise MCPClient.FailedToInvokeMCPServerCapability(
+                        f"Resource '{resource_name}' returned no result from server '{server_name}'.")
+                result[self.MCPResponse.RESPONSE.value].append(
+                    {self.MCPResponse.RESULTS.value: self._extract_resource_result(resource_result)})
             else:
                 raise MCPClient.FailedToFindMCPServerURL(
                     f"Server URL for '{server_name}' could not be found in the cache.")
@@ -476,7 +605,68 @@ class MCPClient:
         tool_name: str,
         arguments: dict[str, Any]
     ) -> Any:
-        mcp_session: Optional[ClientSession] = None
+        cache_ttl: Optional[float] = self._response_cache_ttl(server_name=server_name,
+                                                              tool_name=tool_name)
+        cache_key: Optional[str] = None
+        if cache_ttl is not None:
+            cache_key = MCPResponseCache.key(server_name, tool_name, arguments)
+            cached: Optional[Any] = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._log.debug(
+                    f"Returning cached response of tool '{tool_name}' on server '{server_name}'.")
+                return cached
+        with self._tracer.span("MCPClient.execute_tool", server=server_name, tool=tool_name):
+            result = await self._execute_tool(server_name=server_name,
+                                              tool_name=tool_name,
+                                              arguments=arguments)
+        if cache_key is not None and not self.is_failed_result(result):
+            self._response_cache.put(cache_key, result, cache_ttl)
+        return result
+
+    def _response_cache_ttl(self,
+                            server_name: str,
+                            tool_name: str) -> Optional[float]:
+        """
+        The seconds the tool's responses may be cached for across sessions, None unless the
+        server opted the tool in with cache_ttl_seconds and it is read only, idempotent and
+        not destructive.
+        """
+        annotations: Optional[Dict[str, Any]] = self._routing_table.tool_annotations(
+            server_name, tool_name)
+        if not annotations or not (annotations.get("readOnlyHint") and annotations.get("idempotentHint")) or \
+                annotations.get("destructiveHint"):
+            return None
+        if self._response_cache.default_ttl_seconds <= 0:
+            return None  # The cache is disabled.
+        return self._routing_table.tool_cache_ttl(server_name, tool_name)
+
+    @classmethod
+    def is_failed_result(cls, result: Any) -> bool:
+        """
+        True for a failed call, reported as an error, an error among the results or an error
+        in the response of a result (a tool that raised or reported an error).
+        """
+        if not isinstance(result, dict):
+            return True
+        if cls.MCPResponse.ERROR.value in result:
+            return True
+        for r in result.get(cls.MCPResponse.RESULTS.value, []):
+            if not isinstance(r, dict):
+                continue
+            if cls.MCPResponse.ERROR.value in r:
+                return True
+            response: Any = r.get(cls.MCPResponse.RESPONSE.value)
+            entries: List[Any] = response if isinstance(response, list) else [response]
+            if any(isinstance(entry, dict) and cls.MCPResponse.ERROR.value in entry for entry in entries):
+                return True
+        return False
+
+    async def _execute_tool(
+        self,
+        server_name: str,
+        tool_name: str,
+        arguments: dict[str, Any]
+    ) -> Any:
         result: Dict[str, List[Dict[str, Any]]] = {
             self.MCPResponse.RESULTS.value: []}
         result[self.MCPResponse.RESULTS.value].append({self.MCPResponse.SOURCE.value: self._request_source(
@@ -487,17 +677,20 @@ class MCPClient:
             sse_url: Optional[str] = await self._get_server_url(server_name)
             if sse_url:
                 sse_url = self.get_full_server_url(sse_url)
-                async with sse_client(sse_url) as (read_stream, write_stream):
-                    async with ClientSession(read_stream, write_stream) as mcp_session:
-                        initialize_result: types.InitializeResult = await mcp_session.initialize()
-                        self._log.info(
-                            f"Successfully connected to {sse_url} to execute tool '{tool_name}' on server '{initialize_result.serverInfo.name}'.")
-                        tool_result: types.CallToolResult = await mcp_session.call_tool(tool_name, arguments)
-                        if tool_result is None:
-                            raise MCPClient.FailedToInvokeMCPServerCapability(
-                                f"Tool '{tool_name}' returned no result from server '{server_name}'.")
-                        result[self.MCPResponse.RESULTS.value].append({self.MCPResponse.RESPONSE.value: self._extract_tool_result(
-                            tool_result)})
+                meta: Optional[Dict[str, Any]] = self._tracer.inject() or None
+                # A tool with side effects may have run before the connection failed, so is not retried.
+                annotations: Optional[Dict[str, Any]] = self._routing_table.tool_annotations(
+                    server_name, tool_name)
+                tool_result: types.CallToolResult = await self._session_pool.run(
+                    sse_url, lambda mcp_session: mcp_session.call_tool(tool_name, arguments, meta=meta),
+                    retry=bool(annotations and (annotations.get("readOnlyHint") or annotations.get("idempotentHint"))))
+                self._log.info(
+                    f"Executed tool '{tool_name}' at {sse_url} on server '{server_name}'.")
+                if tool_result is None:
+                    raise MCPClient.FailedToInvokeMCPServerCapability(
+                        f"Tool '{tool_name}' returned no result from server '{server_name}'.")
+                result[self.MCPResponse.RESULTS.value].append({self.MCPResponse.RESPONSE.value: self._extract_tool_result(
+                    tool_result)})
             else:
                 raise MCPClient.FailedToFindMCPServerURL(
                     f"Server URL for '{server_name}' could not be found in the cache.")
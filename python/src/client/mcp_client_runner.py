@@ -8,22 +8,37 @@ import os
 import re
 import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 from yarl import URL
 
 from .mcp_client import MCPClient
 from .mcp_client_web_server import MCPClientWebServer
 from .mcp_invoke import MCPInvoke
+from .mcp_call_memo import MCPCallMemo
+from .mcp_session_pool import MCPSessionPool
+from .capability_cache import CapabilityCache
+from .mcp_response_cache import MCPResponseCache
 from .ollama_utils import Ollama
 from .openrouter_utils import OpenRouter
 from .prompts import Prompts
+from .prompt_budget import PromptBudget
+from .llm_http_client import LLMHttpClient
+from .llm_response_cache import LLMResponseCache
+from .llm_router import LLMRouter
+from .session_store import SessionStore
+from .token_stats import TokenStats
 from network_utils import NetworkUtils
+from tracing import get_tracer
 from vault import Vault
 
 
 class MCPClientRunner:
 
+    CLARIFICATIONS_NAMESPACE: str = "clarifications"
+    PREFETCH_NAMESPACE: str = "mcp_prefetch"
+    OLLAMA_TEMPERATURE: float = 0.3
+
     class ErrorGettingServerCapabilities(Exception):
         pass
 
@@ -56,6 +71,10 @@ class MCPClientRunner:
         def as_str(self) -> str:
             return str(self.value)
 
+    class StreamEvents(str, enum.Enum):
+        TOKEN = "token"
+        RESPONSE = "response"
+
     def __init__(self) -> None:
         """
         Initializes the MCPClientRunner.
@@ -73,19 +92,34 @@ class MCPClientRunner:
         self._ollama_host_url: URL | None = None
         self._ollama_model_name: str | None = None
         self._ollama_enabled: bool = args.ollama_enabled
+        # One pool of keep-alive connections shared by the LLM providers.
+        self._llm_http_client: LLMHttpClient = LLMHttpClient(connect_timeout_seconds=args.llm_connect_timeout,
+                                                             read_timeout_seconds=args.llm_read_timeout,
+                                                             max_retries=args.llm_max_retries)
         if self._ollama_enabled:
             self._ollama_host_url, self._ollama_model_name = self._get_ollama_url_and_model(
                 args)
-            self._ollama: Ollama = Ollama()
+            self._ollama: Ollama = Ollama(http_client=self._llm_http_client)
         else:
             self._log.info(
                 "Ollama integration is disabled, no Ollama conenction will be made.")
 
         self._mcp_host_urls: List[str] = self._get_mcp_host_urls(args)
         self._mcp_client: MCPClient = MCPClient(
-            server_base_urls=self._mcp_host_urls)
-
-        self._invoker: MCPInvoke = MCPInvoke([self._mcp_client])
+            server_base_urls=self._mcp_host_urls,
+            session_pool=MCPSessionPool(pool_size=args.mcp_pool_size,
+                                        idle_timeout_seconds=args.mcp_pool_idle_timeout,
+                                        health_check_interval_seconds=args.mcp_pool_health_check_interval),
+            discovery_timeout_seconds=args.mcp_discovery_timeout,
+            capability_cache=CapabilityCache(ttl_seconds=args.capability_ttl,
+                                             cache_file=args.capability_cache_file,
+                                             ttl_by_url=self._capability_ttls),
+            response_cache=MCPResponseCache(max_bytes=args.mcp_response_cache_max_bytes,
+                                            default_ttl_seconds=args.mcp_response_cache_ttl))
+
+        self._invoker: MCPInvoke = MCPInvoke([self._mcp_client],
+                                             max_concurrent_calls=args.mcp_max_concurrent_calls,
+                                             call_timeout_seconds=args.mcp_call_timeout)
 
         self._web_server_host: str
         self._web_server_port: int
@@ -95,8 +129,29 @@ class MCPClientRunner:
                                               port=self._web_server_port)
         self._add_web_routes()
 
-        self._mcp_responses_cache: Dict[uuid.UUID, Dict[str, Any]] = {}
-        self._clarifications_cache: Dict[uuid.UUID, Dict[str, str]] = {}
+        # MCP responses and clarifications by LLM session, idle sessions are evicted.
+        self._session_store: SessionStore = SessionStore(max_sessions=args.session_store_max_sessions,
+                                                         max_bytes=args.session_store_max_bytes,
+                                                         idle_ttl_seconds=args.session_store_idle_ttl,
+                                                         spill_dir=args.session_store_spill_dir)
+        self._mcp_call_memo: MCPCallMemo = MCPCallMemo(
+            session_store=self._session_store)
+        self._prefetch_enabled: bool = args.mcp_prefetch
+        # Optional, for development and replay runs that send the same prompts again.
+        self._llm_response_cache: Optional[LLMResponseCache] = LLMResponseCache(cache_dir=args.llm_cache_dir,
+                                                                                max_bytes=args.llm_cache_max_bytes) \
+            if args.llm_cache_dir else None
+        self._llm_cache_only: bool = args.llm_cache_only
+        if self._llm_cache_only and self._llm_response_cache is None:
+            msg = "--llm-cache-only needs an LLM response cache, set --llm-cache-dir."
+            self._log.error(msg)
+            raise MCPClientRunner.ErrorStartingClientRunner(msg)
+        # The running prefetch of each session, awaited by the session's next turn.
+        self._prefetch_tasks: Dict[uuid.UUID, asyncio.Task] = {}
+        self._prompt_budget: PromptBudget = PromptBudget(default_budget_tokens=args.prompt_token_budget,
+                                                         budget_by_model=json.loads(args.prompt_model_token_budgets or "{}"))
+        # Tokens per prompt section and tool response, and LLM latency and usage, per session.
+        self._token_stats: TokenStats = TokenStats(max_sessions=args.stats_max_sessions)
 
         self._openrouter_url: URL = URL(args.openrouter_url)
         self._openrouter_model: str = args.openrouter_model
@@ -113,9 +168,12 @@ class MCPClientRunner:
             msg = "Neither Ollama nor OpenRouter is enabled. Client will not be able to call LLMs."
             self._log.error(msg)
             raise MCPClientRunner.ErrorStartingClientRunner(msg)
+        self._llm_router: LLMRouter = self._setup_llm_router(args)
 
         self._prompts: Prompts = Prompts()
 
+        self._tracer = get_tracer()
+
     def _setup_openrouter(self,
                           openrouter_url: URL,
                           openrouter_model: str,
@@ -129,9 +187,39 @@ class MCPClientRunner:
             self._log.info(f"Openrouter avaialble")
             return OpenRouter(openrouter_url=openrouter_url.name,
                               model_name=openrouter_model,
-                              api_key=openrouter_api_key,)
+                              api_key=openrouter_api_key,
+                              http_client=self._llm_http_client,
+                              on_usage=self._token_stats.record_usage)
         return None
 
+    def _setup_llm_router(self, args: argparse.Namespace) -> LLMRouter:
+        """
+        Route LLM calls over every configured provider, fastest healthy provider first.
+        """
+        router: LLMRouter = LLMRouter(hedge_percentile=args.llm_hedge_percentile,
+                                      cool_down_seconds=args.llm_cool_down)
+        if self._openrouter:
+            openrouter: OpenRouter = self._openrouter
+            router.add_provider(name=f"openrouter:{self._openrouter_model}",
+                                call=lambda prompt, on_token: openrouter.get_llm_response(prompt=prompt,
+                                                                                          on_token=on_token),
+                                model=self._openrouter_model,
+                                temperature=openrouter.get_temperature())
+        if self._ollama_enabled and self._ollama:
+            ollama: Ollama = self._ollama
+            router.add_provider(name=f"ollama:{self._ollama_model_name}",
+                                call=lambda prompt, on_token: ollama.get_llm_response(prompt=prompt,
+                                                                                      model=str(
+                                                                                          self._ollama_model_name),
+                                                                                      host=str(
+                                                                                          self._ollama_host_url),
+                                                                                      temperature=self.OLLAMA_TEMPERATURE,
+                                                                                      on_token=on_token),
+                                model=self._ollama_model_name,
+                                temperature=self.OLLAMA_TEMPERATURE)
+        self._log.info(f"LLM providers: {router.provider_names}")
+        return router
+
     def _add_web_routes(self) -> None:
         self._web_server.add_route(
             route='/config', methods=['GET'], handler=self.get_config)
@@ -143,6 +231,12 @@ class MCPClientRunner:
             route='/prompts', methods=['GET'], handler=self.get_prompts)
         self._web_server.add_route(
             route='/model_response', methods=['POST'], handler=self.get_model_response)
+        self._web_server.add_stream_route(
+            route='/model_response_stream', methods=['POST'], handler=self.get_model_response_stream)
+        self._web_server.add_route(
+            route='/llm_router', methods=['GET'], handler=self.get_llm_router_metrics)
+        self._web_server.add_route(
+            route='/stats', methods=['GET'], handler=self.get_stats)
 
     def _parse_command_line(self) -> argparse.Namespace:
         """
@@ -234,6 +328,204 @@ class MCPClientRunner:
             default=os.environ.get("OPENROUTER_API_KEY", ""),
             help="API key for OpenRouter. Overrides OPENROUTER_API_KEY env var. Defaults to empty string."
         )
+        parser.add_argument(
+            "--mcp-pool-size",
+            type=int,
+            default=os.environ.get(str(MCPSessionPool.EnvVars.POOL_SIZE),
+                                   MCPSessionPool.DEFAULT_POOL_SIZE),
+            help="Maximum number of pooled sessions per MCP server. Overrides MCP_SESSION_POOL_SIZE env var."
+        )
+        parser.add_argument(
+            "--mcp-pool-idle-timeout",
+            type=float,
+            default=os.environ.get(str(MCPSessionPool.EnvVars.IDLE_TIMEOUT),
+                                   MCPSessionPool.DEFAULT_IDLE_TIMEOUT_SECONDS),
+            help="Seconds after which an unused pooled MCP session is closed. Overrides MCP_SESSION_IDLE_TIMEOUT env var."
+        )
+        parser.add_argument(
+            "--mcp-pool-health-check-interval",
+            type=float,
+            default=os.environ.get(str(MCPSessionPool.EnvVars.HEALTH_CHECK_INTERVAL),
+                                   MCPSessionPool.DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS),
+            help="Seconds a pooled MCP session may be idle before it is pinged ahead of reuse. "
+                 "Overrides MCP_SESSION_HEALTH_CHECK_INTERVAL env var."
+        )
+        parser.add_argument(
+            "--mcp-discovery-timeout",
+            type=float,
+            default=os.environ.get("MCP_DISCOVERY_TIMEOUT",
+                                   MCPClient.DEFAULT_DISCOVERY_TIMEOUT_SECONDS),
+            help="Seconds to wait for each MCP server's capabilities, servers that take longer are skipped. "
+                 "Overrides MCP_DISCOVERY_TIMEOUT env var."
+        )
+        parser.add_argument(
+            "--mcp-max-concurrent-calls",
+            type=int,
+            default=os.environ.get("MCP_MAX_CONCURRENT_CALLS",
+                                   MCPInvoke.DEFAULT_MAX_CONCURRENT_CALLS),
+            help="Maximum number of the MCP server calls requested in one turn that run at the same time. "
+                 "Overrides MCP_MAX_CONCURRENT_CALLS env var."
+        )
+        parser.add_argument(
+            "--mcp-call-timeout",
+            type=float,
+            default=os.environ.get("MCP_CALL_TIMEOUT",
+                                   MCPInvoke.DEFAULT_CALL_TIMEOUT_SECONDS),
+            help="Seconds after which a single MCP server call is reported as timed out. "
+                 "Overrides MCP_CALL_TIMEOUT env var."
+        )
+        parser.add_argument(
+            "--mcp-response-cache-max-bytes",
+            type=int,
+            default=os.environ.get(str(MCPResponseCache.EnvVars.MAX_BYTES),
+                                   MCPResponseCache.DEFAULT_MAX_BYTES),
+            help="Memory bound of the shared cache of read only, idempotent tool responses. "
+                 "Overrides MCP_RESPONSE_CACHE_MAX_BYTES env var."
+        )
+        parser.add_argument(
+            "--mcp-response-cache-ttl",
+            type=float,
+            default=os.environ.get(str(MCPResponseCache.EnvVars.TTL),
+                                   MCPResponseCache.DEFAULT_TTL_SECONDS),
+            help="Seconds a shared tool response is cached when no TTL is given, 0 disables the cache. Only read "
+                 "only, idempotent tools whose server sets cache_ttl_seconds are cached, for that TTL. "
+                 "Overrides MCP_RESPONSE_CACHE_TTL env var."
+        )
+        parser.add_argument(
+            "--prompt-token-budget",
+            type=int,
+            default=os.environ.get(str(PromptBudget.EnvVars.TOKEN_BUDGET),
+                                   PromptBudget.DEFAULT_TOKEN_BUDGET),
+            help="Estimated tokens the MCP responses and clarifications may take in a prompt, older responses are "
+                 "trimmed or summarised to fit. Overrides MCP_PROMPT_TOKEN_BUDGET env var."
+        )
+        parser.add_argument(
+            "--prompt-model-token-budgets",
+            type=str,
+            default=os.environ.get(str(PromptBudget.EnvVars.MODEL_TOKEN_BUDGETS), ""),
+            help="JSON object of model name to token budget, for models that differ from --prompt-token-budget. "
+                 "Overrides MCP_PROMPT_MODEL_TOKEN_BUDGETS env var."
+        )
+        parser.add_argument(
+            "--stats-max-sessions",
+            type=int,
+            default=os.environ.get(str(TokenStats.EnvVars.MAX_SESSIONS),
+                                   TokenStats.DEFAULT_MAX_SESSIONS),
+            help="Sessions whose token and LLM usage stats are kept for /stats, the least recently active are "
+                 "dropped. Overrides MCP_STATS_MAX_SESSIONS env var."
+        )
+        parser.add_argument(
+            "--mcp-prefetch",
+            action="store_true",
+            default=os.environ.get("MCP_PREFETCH", "false").lower() == "true",
+            help="Run the read only tool calls in an LLM response in the background, so their results are ready "
+                 "when the calls are sent back with the next turn. Overrides MCP_PREFETCH env var. Defaults to false."
+        )
+        parser.add_argument(
+            "--session-store-max-sessions",
+            type=int,
+            default=os.environ.get(str(SessionStore.EnvVars.MAX_SESSIONS),
+                                   SessionStore.DEFAULT_MAX_SESSIONS),
+            help="Most LLM sessions whose MCP responses and clarifications are held in memory, the least recently "
+                 "used are evicted beyond this. Overrides MCP_SESSION_STORE_MAX_SESSIONS env var."
+        )
+        parser.add_argument(
+            "--session-store-max-bytes",
+            type=int,
+            default=os.environ.get(str(SessionStore.EnvVars.MAX_BYTES),
+                                   SessionStore.DEFAULT_MAX_BYTES),
+            help="Memory bound of the LLM session state, the least recently used sessions are evicted beyond this. "
+                 "Overrides MCP_SESSION_STORE_MAX_BYTES env var."
+        )
+        parser.add_argument(
+            "--session-store-idle-ttl",
+            type=float,
+            default=os.environ.get(str(SessionStore.EnvVars.IDLE_TTL),
+                                   SessionStore.DEFAULT_IDLE_TTL_SECONDS),
+            help="Seconds after which the state of an unused LLM session is evicted. "
+                 "Overrides MCP_SESSION_STORE_IDLE_TTL env var."
+        )
+        parser.add_argument(
+            "--session-store-spill-dir",
+            type=Path,
+            default=os.environ.get(str(SessionStore.EnvVars.SPILL_DIR)),
+            help="Optional directory evicted LLM sessions are written to, so they can be resumed. "
+                 "Overrides MCP_SESSION_STORE_SPILL_DIR env var."
+        )
+        parser.add_argument(
+            "--llm-connect-timeout",
+            type=float,
+            default=os.environ.get(str(LLMHttpClient.EnvVars.CONNECT_TIMEOUT),
+                                   LLMHttpClient.DEFAULT_CONNECT_TIMEOUT_SECONDS),
+            help="Seconds to wait for a connection to the LLM provider. Overrides MCP_LLM_CONNECT_TIMEOUT env var."
+        )
+        parser.add_argument(
+            "--llm-read-timeout",
+            type=float,
+            default=os.environ.get(str(LLMHttpClient.EnvVars.READ_TIMEOUT),
+                                   LLMHttpClient.DEFAULT_READ_TIMEOUT_SECONDS),
+            help="Seconds to wait for each read of the LLM provider's response. Overrides MCP_LLM_READ_TIMEOUT env var."
+        )
+        parser.add_argument(
+            "--llm-max-retries",
+            type=int,
+            default=os.environ.get(str(LLMHttpClient.EnvVars.MAX_RETRIES),
+                                   LLMHttpClient.DEFAULT_MAX_RETRIES),
+            help="Times a failed, throttled (429) or unavailable (5xx) LLM request is retried with backoff. "
+                 "Overrides MCP_LLM_MAX_RETRIES env var."
+        )
+        parser.add_argument(
+            "--llm-hedge-percentile",
+            type=float,
+            default=os.environ.get(str(LLMRouter.EnvVars.HEDGE_PERCENTILE),
+                                   LLMRouter.DEFAULT_HEDGE_PERCENTILE),
+            help="Latency percentile of an LLM provider after which a call is also sent to the next provider, "
+                 "the first answer wins, 0 never hedges. Overrides MCP_LLM_HEDGE_PERCENTILE env var."
+        )
+        parser.add_argument(
+            "--llm-cool-down",
+            type=float,
+            default=os.environ.get(str(LLMRouter.EnvVars.COOL_DOWN),
+                                   LLMRouter.DEFAULT_COOL_DOWN_SECONDS),
+            help="Seconds a failing LLM provider is taken out of rotation. Overrides MCP_LLM_COOL_DOWN env var."
+        )
+        parser.add_argument(
+            "--llm-cache-dir",
+            type=Path,
+            default=os.environ.get(str(LLMResponseCache.EnvVars.CACHE_DIR)),
+            help="Optional directory to cache LLM responses in, keyed by model, temperature and prompt, for "
+                 "development and replay runs. Overrides MCP_LLM_CACHE_DIR env var."
+        )
+        parser.add_argument(
+            "--llm-cache-max-bytes",
+            type=int,
+            default=os.environ.get(str(LLMResponseCache.EnvVars.MAX_BYTES),
+                                   LLMResponseCache.DEFAULT_MAX_BYTES),
+            help="Size bound of the LLM response cache, least recently used responses are deleted beyond it. "
+                 "Overrides MCP_LLM_CACHE_MAX_BYTES env var."
+        )
+        parser.add_argument(
+            "--llm-cache-only",
+            action="store_true",
+            default=os.environ.get("MCP_LLM_CACHE_ONLY", "false").lower() == "true",
+            help="Answer only from the LLM response cache and never call the LLM, e.g. to benchmark the MCP path "
+                 "alone. Overrides MCP_LLM_CACHE_ONLY env var. Defaults to false."
+        )
+        parser.add_argument(
+            "--capability-ttl",
+            type=float,
+            default=os.environ.get(str(CapabilityCache.EnvVars.TTL),
+                                   CapabilityCache.DEFAULT_TTL_SECONDS),
+            help="Seconds before cached MCP server capabilities are refreshed in the background, "
+                 "unless set per server as capability_ttl in the host list. Overrides MCP_CAPABILITY_TTL env var."
+        )
+        parser.add_argument(
+            "--capability-cache-file",
+            type=Path,
+            default=os.environ.get(str(CapabilityCache.EnvVars.CACHE_FILE)),
+            help="Optional JSON file to persist MCP server capabilities for a warm start. "
+                 "Overrides MCP_CAPABILITY_CACHE_FILE env var."
+        )
         args: argparse.Namespace = parser.parse_args()
 
         return args
@@ -273,6 +565,9 @@ class MCPClientRunner:
     def _get_mcp_host_urls(self, args: argparse.Namespace) -> List[str]:
         host_urls: List[str] = []
         connections_to_process: List[Tuple[str, int]] = []
+        # Optional per server capability cache TTL, given as "capability_ttl" in the host list.
+        capability_ttls: Dict[Tuple[str, int], float] = {}
+        self._capability_ttls: Dict[str, float] = {}
 
         if args.host_list:
             config_file_path = Path(args.host_list)
@@ -298,6 +593,9 @@ class MCPClientRunner:
                             port = int(server_item["port"])
                             connections_to_process.append(
                                 (str(server_item["host"]), port))
+                            if "capability_ttl" in server_item:
+                                capability_ttls[(str(server_item["host"]), port)] = float(
+                                    server_item["capability_ttl"])
                         except ValueError:
                             self._log.warning(
                                 f"Skipping server entry with invalid port: {server_item}")
@@ -351,6 +649,8 @@ class MCPClientRunner:
 
             host_url: str = f"http://{host}:{port}"
             host_urls.append(host_url)
+            if (host, port) in capability_ttls:
+                self._capability_ttls[host_url] = capability_ttls[(host, port)]
             self._log.info(f"Configured client connection URL: {host_url}")
 
         if not host_urls:
@@ -444,24 +744,145 @@ class MCPClientRunner:
                    params: Dict) -> Dict:
         return self._get_config()
 
-    def _get_cache_and_merge_mcp_responses_by_session(self,
-                                                      mcp_responses: List[Dict[str, Any]],
-                                                      llm_session: uuid.UUID) -> List[Dict[str, Any]]:
+    def _memo_key(self, mcp_call: Any) -> Optional[str]:
+        """
+        The memo key of a call to a read only tool, None for any other call.
+        """
+        if not isinstance(mcp_call, dict) or mcp_call.get("mcp_capability") != str(MCPClient.MCPServerCapabilities.TOOLS):
+            return None
+        annotations: Optional[Dict[str, Any]] = self._invoker.tool_annotations(server_name=str(mcp_call.get("mcp_server_name")),
+                                                                               tool_name=str(mcp_call.get("mcp_capability_name")))
+        if not MCPCallMemo.is_memoizable(annotations):
+            return None
+        return MCPCallMemo.call_key(mcp_call)
+
+    def _start_prefetch(self,
+                        llm_session: uuid.UUID,
+                        llm_content: Any) -> None:
+        """
+        Start running, in the background, the read only tool calls the LLM asked for, so their
+        responses are ready when the calls are sent back with the session's next turn.
+        """
+        if not self._prefetch_enabled or not isinstance(llm_content, dict):
+            return
+        mcp_calls: Any = llm_content.get("mcp_server_calls")
+        if mcp_calls is None and isinstance(llm_content.get("response"), dict):
+            mcp_calls = llm_content["response"].get("mcp_server_calls")
+        if not isinstance(mcp_calls, list):
+            return
+
+        prefetch: List[Tuple[str, Dict[str, Any]]] = []
+        for mcp_call in mcp_calls:
+            memo_key: Optional[str] = self._memo_key(mcp_call)
+            if memo_key is None or any(memo_key == key for key, _ in prefetch):
+                continue
+            annotations: Optional[Dict[str, Any]] = self._invoker.tool_annotations(server_name=str(mcp_call.get("mcp_server_name")),
+                                                                                   tool_name=str(mcp_call.get("mcp_capability_name")))
+            # Idempotent tools may still change state, only read only tools run before they are asked for.
+            if not MCPCallMemo.is_read_only(annotations) or \
+                    self._mcp_call_memo.get(llm_session, memo_key) is not None or \
+                    self._session_store.get(llm_session, self.PREFETCH_NAMESPACE, memo_key) is not None:
+                continue
+            prefetch.append((memo_key, mcp_call))
+        if not prefetch:
+            return
+
+        previous: Optional[asyncio.Task] = self._prefetch_tasks.get(llm_session)
+        task: asyncio.Task = asyncio.ensure_future(
+            self._prefetch(llm_session, prefetch, previous))
+        self._prefetch_tasks[llm_session] = task
+
+        def done(_: asyncio.Task) -> None:
+            if self._prefetch_tasks.get(llm_session) is task:
+                del self._prefetch_tasks[llm_session]
+        task.add_done_callback(done)
+
+    async def _prefetch(self,
+                        llm_session: uuid.UUID,
+                        prefetch: List[Tuple[str, Dict[str, Any]]],
+                        previous: Optional[asyncio.Task]) -> None:
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        self._log.debug(
+            f"Prefetching {len(prefetch)} read only MCP calls for session {llm_session}")
+        try:
+            with self._tracer.span("MCPClientRunner.prefetch", calls=len(prefetch)):
+                mcp_responses: List[Dict[str, Any]] = await self._invoker.get_mcp_server_responses(
+                    [mcp_call for _, mcp_call in prefetch])
+            for (memo_key, _), mcp_response in zip(prefetch, mcp_responses):
+                if not MCPCallMemo.is_error(mcp_response):
+                    self._session_store.put(session_id=llm_session,
+                                            namespace=self.PREFETCH_NAMESPACE,
+                                            key=memo_key,
+                                            value=mcp_response)
+        except Exception as e:  # pylint: disable=broad-except
+            # The calls are run as usual if they are sent back.
+            self._log.warning(
+                f"Prefetch for session {llm_session} failed: {str(e)}")
+
+    async def _await_prefetch(self, llm_session: uuid.UUID) -> None:
+        task: Optional[asyncio.Task] = self._prefetch_tasks.get(llm_session)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _get_cache_and_merge_mcp_responses_by_session(self,
+                                                            mcp_calls: List[Dict[str, Any]],
+                                                            llm_session: uuid.UUID) -> List[Dict[str, Any]]:
         """
-        Adds mcp_responses to the session cache and returns the merged responses.
+        Runs the mcp_calls not already answered in the session, adds their responses to the
+        session cache and returns the merged responses.
         """
         try:
-            mcp_sesson_responses: Dict[str, Any] = self._mcp_responses_cache.get(
-                llm_session, {})
-            for mcp_response in mcp_responses:
-                # calls to mcp servers can be duplicated, so we use a new UUID for each response
-                mcp_sesson_responses[str(uuid.uuid4())] = mcp_response
-            self._mcp_responses_cache[llm_session] = mcp_sesson_responses
-            return list(mcp_sesson_responses.values())
+            # Calls already being prefetched are answered from the prefetch, not run twice.
+            await self._await_prefetch(llm_session)
+            if not isinstance(mcp_calls, list):
+                # Let the invoker report the malformed calls.
+                mcp_calls_to_run: List[Any] = mcp_calls
+                memo_keys: List[Optional[str]] = []
+            else:
+                mcp_calls_to_run = []
+                memo_keys = []
+                for mcp_call in mcp_calls:
+                    memo_key: Optional[str] = self._memo_key(mcp_call)
+                    if memo_key is not None and (memo_key in memo_keys or
+                                                 self._mcp_call_memo.get(llm_session, memo_key) is not None):
+                        self._log.debug(
+                            f"Answering repeated call to [{mcp_call.get('mcp_capability_name')}] from the session memo")
+                        continue
+                    prefetched: Optional[Dict[str, Any]] = self._session_store.get(
+                        llm_session, self.PREFETCH_NAMESPACE, memo_key) if memo_key is not None else None
+                    if prefetched is not None:
+                        self._log.debug(
+                            f"Answering call to [{mcp_call.get('mcp_capability_name')}] from the prefetch")
+                        self._mcp_call_memo.add(llm_session=llm_session,
+                                                response=PromptBudget.project(
+                                                    prefetched, mcp_call.get("fields")),
+                                                key=memo_key)
+                        continue
+                    mcp_calls_to_run.append(mcp_call)
+                    memo_keys.append(memo_key)
+
+            mcp_responses: List[Dict[str, Any]] = []
+            if not isinstance(mcp_calls_to_run, list) or len(mcp_calls_to_run) > 0:
+                mcp_responses = await self._invoker.get_mcp_server_responses(mcp_calls_to_run)
+
+            # Responses are in call order, a batch level error is the only response without a call.
+            for i, mcp_response in enumerate(mcp_responses):
+                memo_key = memo_keys[i] if i < len(memo_keys) else None
+                if MCPCallMemo.is_error(mcp_response):
+                    memo_key = None  # Failed calls are retried when asked for again.
+                if i < len(mcp_calls_to_run) and isinstance(mcp_calls_to_run[i], dict):
+                    # Keep only the record fields the model asked for.
+                    mcp_response = PromptBudget.project(
+                        mcp_response, mcp_calls_to_run[i].get("fields"))
+                self._mcp_call_memo.add(llm_session=llm_session,
+                                        response=mcp_response,
+                                        key=memo_key)
+            return self._mcp_call_memo.responses(llm_session)
         except Exception as e:
             msg: str = f"Error merging MCP responses by session: {str(e)}"
             self._log.error(msg)
-            return mcp_responses
+            return [{"error": msg}]
 
     def _get_cache_and_merge_clarifications_by_session(self,
                                                        clarifications: List[Dict[str, Any]],
@@ -470,145 +891,249 @@ class MCPClientRunner:
         Adds clarifications to the session cache and returns the merged clarifications.
         """
         try:
-            clarifications_session: Dict[str, Any] = self._clarifications_cache.get(
-                llm_session, {})
             for clarification in clarifications:
-                clarifications_session[clarification["question"]
-                                       ] = clarification
-            self._clarifications_cache[llm_session] = clarifications_session
-            return list(clarifications_session.values())
+                self._session_store.put(session_id=llm_session,
+                                        namespace=self.CLARIFICATIONS_NAMESPACE,
+                                        key=clarification["question"],
+                                        value=clarification)
+            return self._session_store.values(llm_session, self.CLARIFICATIONS_NAMESPACE)
         except Exception as e:
             msg: str = f"Error merging clarifications by session: {str(e)}"
             self._log.error(msg)
             return clarifications
 
-    async def _get_model_response(self,
-                                  params: Dict[str, Any]) -> Dict[str, Any]:
+    def _llm_model_name(self) -> Optional[str]:
         """
-        Handles the /model_response endpoint, processing incoming data,
-        invoking MCP actions, and calling the LLM.
+        The model the router will send the next call to first.
         """
-        try:
-            if not params or not isinstance(params, dict):
-                msg = "Invalid or empty parameters provided for model response."
-                self._log.error(msg)
-                raise ValueError(msg)
+        preferred: Optional[Dict[str, Any]] = self._llm_router.preferred()
+        return preferred["model"] if preferred else None
 
-            args: Dict[str, Any] = params.get("args", {})
-            if not args or not isinstance(args, dict):
-                msg = "No or invalid 'args' provided in parameters for model response."
-                self._log.error(msg)
-                raise ValueError(msg)
+    def _llm_cache_key(self,
+                       full_prompt: str,
+                       provider: Optional[Dict[str, Any]]) -> str:
+        """
+        The LLM response cache key of the prompt sent to the provider's model and temperature.
+        """
+        return LLMResponseCache.key(model=provider["model"] if provider else None,
+                                    temperature=provider["temperature"] if provider else None,
+                                    prompt=full_prompt)
 
-            llm_session_id: str | None = args.get("session")
-            if not llm_session_id:
-                msg = "No session ID provided in parameters for model response."
-                self._log.error(msg)
-                raise ValueError(msg)
+    async def _build_model_prompt(self,
+                                  params: Dict[str, Any]) -> Tuple[uuid.UUID, str, TokenStats.Turn]:
+        """
+        Runs the MCP calls and merges the clarifications of a /model_response request into
+        its session and builds the LLM prompt, raises ValueError for an invalid request.
+        The tokens of each section of the prompt are measured for the turn's stats.
+        """
+        if not params or not isinstance(params, dict):
+            msg = "Invalid or empty parameters provided for model response."
+            self._log.error(msg)
+            raise ValueError(msg)
 
-            try:
-                llm_session = uuid.UUID(llm_session_id)
-            except ValueError as e:
-                msg = f"Invalid session ID provided: {llm_session_id}. Must be a valid UUID."
-                self._log.error(msg)
-                raise ValueError(msg) from e
+        args: Dict[str, Any] = params.get("args", {})
+        if not args or not isinstance(args, dict):
+            msg = "No or invalid 'args' provided in parameters for model response."
+            self._log.error(msg)
+            raise ValueError(msg)
 
-            capabilities: Dict[str, Any] = await self._get_capabilities()
-            if "error" in capabilities:  # Propagate error from _get_capabilities
-                raise MCPClientRunner.ErrorGettingServerCapabilities(
-                    capabilities["error"])
+        llm_session_id: str | None = args.get("session")
+        if not llm_session_id:
+            msg = "No session ID provided in parameters for model response."
+            self._log.error(msg)
+            raise ValueError(msg)
 
-            goal: str = args.get("goal", "")
-            if not goal:
-                msg = "User prompt (goal) is required but was empty."
-                self._log.error(msg)
-                raise ValueError(msg)
+        try:
+            llm_session = uuid.UUID(llm_session_id)
+        except ValueError as e:
+            msg = f"Invalid session ID provided: {llm_session_id}. Must be a valid UUID."
+            self._log.error(msg)
+            raise ValueError(msg) from e
 
-            user_role: str | None = args.get("user_role", None)
-            if not user_role:
-                user_role = Prompts.UserRole.SALES_TRADER.value
-                self._log.info(
-                    f"No user role provided, defaulting to '{user_role}'.")
+        with self._tracer.span("MCPClientRunner.get_capabilities"):
+            capabilities: Dict[str, Any] = await self._get_capabilities()
+        if "error" in capabilities:  # Propagate error from _get_capabilities
+            raise MCPClientRunner.ErrorGettingServerCapabilities(
+                capabilities["error"])
 
-            staff_id: str | None = args.get("staff_id", None)
-            if not staff_id:
-                staff_id = "NONE GIVEN"
-                self._log.info(
-                    f"No staff id provided, defaulting to 'NONE', prompt will not be able to repsond based on staff id, but will still work.")
+        goal: str = args.get("goal", "")
+        if not goal:
+            msg = "User prompt (goal) is required but was empty."
+            self._log.error(msg)
+            raise ValueError(msg)
 
-            # Get the clarification and mcp_server_calls from the args
-            response_structure: Dict[str, Any] = args.get("response", {})
+        user_role: str | None = args.get("user_role", None)
+        if not user_role:
+            user_role = Prompts.UserRole.SALES_TRADER.value
+            self._log.info(
+                f"No user role provided, defaulting to '{user_role}'.")
 
-            # Check user clarifications are in correct format and extract juste the question and response elements
-            user_clarifications: List[Dict[str, Any]] = response_structure.get(
-                "clarifications", [])
-            clarification_responses: List[Dict[str, Any]] = await self._invoker.get_clarification_responses(user_clarifications)
-            merged_clarifications = self._get_cache_and_merge_clarifications_by_session(
-                clarifications=clarification_responses,
-                llm_session=llm_session
-            )
+        staff_id: str | None = args.get("staff_id", None)
+        if not staff_id:
+            staff_id = "NONE GIVEN"
+            self._log.info(
+                f"No staff id provided, defaulting to 'NONE', prompt will not be able to repsond based on staff id, but will still work.")
+
+        # Get the clarification and mcp_server_calls from the args
+        response_structure: Dict[str, Any] = args.get("response", {})
+
+        # Check user clarifications are in correct format and extract juste the question and response elements
+        user_clarifications: List[Dict[str, Any]] = response_structure.get(
+            "clarifications", [])
+        clarification_responses: List[Dict[str, Any]] = await self._invoker.get_clarification_responses(user_clarifications)
+        merged_clarifications = self._get_cache_and_merge_clarifications_by_session(
+            clarifications=clarification_responses,
+            llm_session=llm_session
+        )
 
-            # Process MCP server calls, by calling the MCP server & adding results to the cache
-            previous_mcp_calls = response_structure.get("mcp_server_calls", [])
-            mcp_responses: List[Dict[str, Any]] = await self._invoker.get_mcp_server_responses(previous_mcp_calls)
-            merged_mcp_responses = self._get_cache_and_merge_mcp_responses_by_session(
-                mcp_responses=mcp_responses,
+        # Process MCP server calls, by calling the MCP server & adding results to the cache
+        previous_mcp_calls = response_structure.get("mcp_server_calls", [])
+        with self._tracer.span("MCPClientRunner.mcp_server_calls", calls=len(previous_mcp_calls)):
+            merged_mcp_responses = await self._get_cache_and_merge_mcp_responses_by_session(
+                mcp_calls=previous_mcp_calls,
                 llm_session=llm_session
             )
 
+        # The session keeps every response, the prompt gets as much of them as fits the model's budget.
+        prompt_mcp_responses: List[Dict[str, Any]] = self._prompt_budget.compact(mcp_responses=merged_mcp_responses,
+                                                                                 clarifications=merged_clarifications,
+                                                                                 model=self._llm_model_name())
+
+        with self._tracer.span("MCPClientRunner.build_prompt"):
             full_prompt: Optional[str] = self._prompts.build_prompt(user_goal=goal,
                                                                     session_id=llm_session,
                                                                     user_role=user_role,
                                                                     staff_id=staff_id,
                                                                     mcp_server_descriptions=capabilities,
-                                                                    mcp_responses=merged_mcp_responses,
-                                                                    clarifications=merged_clarifications)
-
-            llm_call_successful: bool = False
-            llm_content: Dict[str, Any] = {}
+                                                                    mcp_responses=prompt_mcp_responses,
+                                                                    clarifications=merged_clarifications,
+                                                                    mcp_server_descriptions_version=self._mcp_client.capabilities_version)
 
-            if not full_prompt:
-                msg = "Failed to generate a valid prompt for the LLM."
-                self._log.error(msg)
-                raise ValueError(msg)
-
-            if self._openrouter:
-                llm_call_successful, llm_content = self._openrouter.get_llm_response(
-                    prompt=full_prompt
-                )
-            elif self._ollama_enabled and self._ollama:
-                llm_call_successful, llm_content = self._ollama.get_llm_response(prompt=full_prompt,
-                                                                                 model=str(
-                                                                                     self._ollama_model_name),
-                                                                                 host=str(
-                                                                                     self._ollama_host_url),
-                                                                                 temperature=0.3
-                                                                                 )
-            else:
+        if not full_prompt:
+            msg = "Failed to generate a valid prompt for the LLM."
+            self._log.error(msg)
+            raise ValueError(msg)
+        turn: TokenStats.Turn = self._token_stats.measure_prompt(session_id=llm_session,
+                                                                 prompt=full_prompt,
+                                                                 capabilities=capabilities,
+                                                                 mcp_responses=prompt_mcp_responses,
+                                                                 clarifications=merged_clarifications)
+        return llm_session, full_prompt, turn
+
+    async def _call_llm(self,
+                        full_prompt: str,
+                        turn: TokenStats.Turn,
+                        on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        The parsed LLM response to the prompt, streamed to on_token as it is generated if given.
+        The turn is added to the token stats whether or not the call succeeds.
+        """
+        try:
+            return await self._call_llm_for_turn(full_prompt, turn, on_token)
+        finally:
+            self._token_stats.add_turn(turn)
+
+    async def _call_llm_for_turn(self,
+                                 full_prompt: str,
+                                 turn: TokenStats.Turn,
+                                 on_token: Optional[Callable[[str], None]]) -> Dict[str, Any]:
+        if self._llm_response_cache is not None:
+            # Looked up for the provider the call would go to, stored for the one that answers.
+            cached: Optional[Dict[str, Any]] = self._llm_response_cache.get(
+                self._llm_cache_key(full_prompt, self._llm_router.preferred()))
+            if cached is not None:
+                self._log.debug("LLM response answered from the LLM response cache")
+                turn.cached = True
+                if on_token is not None:
+                    on_token(json.dumps(cached, ensure_ascii=False))
+                return cached
+            if self._llm_cache_only:
+                raise MCPClientRunner.FailedLLMCall(
+                    "LLM response not in the LLM response cache and the LLM is not called in cache only mode")
+
+        llm_call_successful: bool = False
+        llm_content: Dict[str, Any] = {}
+        answered_by: Optional[Dict[str, Any]] = None
+
+        with self._tracer.span("MCPClientRunner.llm_call"):
+            if len(self._llm_router) == 0:
                 msg = "No LLM provider (OpenRouter or Ollama) is enabled or configured."
                 self._log.error(msg)
                 raise MCPClientRunner.FailedLLMCall(msg)
-
-            if not llm_call_successful:
-                error_message = str(
-                    llm_content) if llm_content else "Unknown LLM error during get_initial_response"
-                raise MCPClientRunner.FailedLLMCall(error_message)
-
-            # Assuming llm_content is the actual response data from the model on success
-            return {"response": llm_content, "status": "success"}
-
-        except MCPClientRunner.FailedLLMCall as flc:
-            msg = f"LLM call failed: {flc}"
+            with self._token_stats.llm_call(turn):
+                llm_call_successful, llm_content, answered_by = await self._llm_router.get_llm_response(
+                    prompt=full_prompt,
+                    on_token=on_token)
+
+        if not llm_call_successful:
+            error_message = str(
+                llm_content) if llm_content else "Unknown LLM error during get_initial_response"
+            raise MCPClientRunner.FailedLLMCall(error_message)
+        if self._llm_response_cache is not None and isinstance(llm_content, dict) and "error" not in llm_content:
+            self._llm_response_cache.put(self._llm_cache_key(full_prompt, answered_by), llm_content)
+        return llm_content
+
+    def _model_response_error(self, e: Exception) -> Dict[str, Any]:
+        if isinstance(e, MCPClientRunner.FailedLLMCall):
+            msg = f"LLM call failed: {e}"
             self._log.error(msg)
             return json.loads(json.dumps({"error": msg, "type": "FailedLLMCall"}))
-        except ValueError as ve:
-            msg = f"Input error for model response: {ve}"
+        if isinstance(e, ValueError):
+            msg = f"Input error for model response: {e}"
             self._log.error(msg)
             return json.loads(json.dumps({"error": msg, "type": "ValueError"}))
+        msg = f"An unexpected error occurred while getting model response: {str(e)}"
+        self._log.exception(msg)
+        return json.loads(json.dumps({"error": msg, "type": "Exception"}))
+
+    async def _get_model_response(self,
+                                  params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handles the /model_response endpoint, processing incoming data,
+        invoking MCP actions, and calling the LLM.
+        """
+        try:
+            llm_session, full_prompt, turn = await self._build_model_prompt(params)
+            llm_content: Dict[str, Any] = await self._call_llm(full_prompt, turn)
+            self._start_prefetch(llm_session, llm_content)
+            # Assuming llm_content is the actual response data from the model on success
+            return {"response": llm_content, "status": "success"}
         except Exception as e:
-            msg = f"An unexpected error occurred while getting model response: {str(e)}"
-            self._log.exception(msg)
-            return json.loads(json.dumps({"error": msg, "type": "Exception"}))
+            return self._model_response_error(e)
+
+    async def _get_model_response_stream(self,
+                                         params: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Handles the /model_response_stream endpoint. As /model_response, but the LLM output
+        is relayed as "token" events as it is generated, then the parsed and validated
+        response (or error) is sent as a final "response" event.
+        """
+        try:
+            llm_session, full_prompt, turn = await self._build_model_prompt(params)
+        except Exception as e:
+            yield self.StreamEvents.RESPONSE.value, self._model_response_error(e)
+            return
+
+        tokens: asyncio.Queue = asyncio.Queue()
+        # The call runs as its own task feeding the queue, so tokens are relayed as they arrive.
+        llm_call: asyncio.Task = asyncio.ensure_future(
+            self._call_llm(full_prompt, turn, on_token=tokens.put_nowait))
+        llm_call.add_done_callback(lambda _: tokens.put_nowait(None))
+        try:
+            while True:
+                token: Optional[str] = await tokens.get()
+                if token is None:
+                    break
+                yield self.StreamEvents.TOKEN.value, {"text": token}
+        finally:
+            # Stops the LLM call if the caller went away before it finished.
+            llm_call.cancel()
+        try:
+            llm_content: Dict[str, Any] = llm_call.result()
+            self._start_prefetch(llm_session, llm_content)
+            yield self.StreamEvents.RESPONSE.value, {"response": llm_content, "status": "success"}
+        except Exception as e:
+            yield self.StreamEvents.RESPONSE.value, self._model_response_error(e)
 
     def _parse_prompt_dist_to_json(self,
                                    prompt_dict: Dict[str, str]) -> Dict[str, Any]:
@@ -675,9 +1200,39 @@ class MCPClientRunner:
             self._log.exception(msg)
             return json.loads(json.dumps({"error": msg, "type": "Exception"}))
 
-    def get_model_response(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Synchronous wrapper for the async get_model_response method."""
-        return asyncio.run(self._get_model_response(params))
+    async def get_model_response(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Runs on the web server's event loop, shared by all requests."""
+        return await self._get_model_response(params)
+
+    async def get_llm_router_metrics(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Latency, error rate, hedging and fail over of each LLM provider, and the one preferred.
+        """
+        return self._llm_router.metrics()
+
+    async def get_stats(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Estimated tokens per prompt section and per tool response, and LLM latency and usage,
+        of the session given as session_id, else totalled with the tools and sessions that
+        spend the most tokens first.
+        """
+        args: Any = params.get("args") if isinstance(params, dict) else None
+        session_id: Optional[str] = args.get("session_id") if isinstance(args, dict) else None
+        if not session_id:
+            return self._token_stats.stats() or {}
+        try:
+            session_stats: Optional[Dict[str, Any]] = self._token_stats.stats(uuid.UUID(session_id))
+        except ValueError:
+            msg = f"Invalid session ID provided: {session_id}. Must be a valid UUID."
+            self._log.error(msg)
+            return {"error": msg, "type": "ValueError"}
+        if session_stats is None:
+            return {"error": f"No stats for session {session_id}", "type": "ValueError"}
+        return {"session_id": session_id, **session_stats}
+
+    async def get_model_response_stream(self, params: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+        async for event in self._get_model_response_stream(params):
+            yield event
 
     async def _get_capabilities(self) -> Dict[str, Any]:
         """
@@ -691,16 +1246,19 @@ class MCPClientRunner:
             self._log.error(msg=msg)
             return json.loads(json.dumps({"error": msg}))
 
-    def get_capabilities(self,
-                         params: Dict) -> Dict:
-        return asyncio.run(self._get_capabilities())
+    async def get_capabilities(self,
+                               params: Dict) -> Dict:
+        return await self._get_capabilities()
 
     async def _start_services(self) -> None:
         """
         Ensures Ollama is ready, and starts the web server.
         """
         self._ensure_ollama_ready()
-        self._web_server.run()
+        try:
+            await self._web_server.serve()
+        finally:
+            await self._llm_http_client.aclose()
 
     async def run(self) -> None:
         await self._start_services()
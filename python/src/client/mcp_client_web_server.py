@@ -1,17 +1,34 @@
+import asyncio
+import inspect
+import os
 from operator import call
-from typing import Dict, Protocol, Any, Literal, List
-from functools import partial, update_wrapper
-from flask import Flask, Response, jsonify, request
-from flask_cors import CORS
+from typing import AsyncIterator, Awaitable, Dict, Optional, Protocol, Any, Literal, List, Tuple, Union
 import json
 from enum import Enum
-import signal
-import sys
-import threading
 import logging
+import anyio
+import uvicorn
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
+from tracing import get_tracer
 
 
 class MCPClientWebServer:
+    """
+    JSON over HTTP front end for the client runner, the message service and the vector DB
+    web service, served by uvicorn as an ASGI application.
+
+    Coroutine handlers run on the server's event loop, so async state outlives the request
+    that created it. Plain handlers run on a bounded pool of worker threads, so a slow
+    handler does not hold up other requests.
+    """
+
+    DEFAULT_WORKER_THREADS: int = 40
+    DEFAULT_KEEP_ALIVE_SECONDS: int = 5
+    DEFAULT_MAX_BODY_BYTES: int = 10 * 1024 * 1024
 
     class QueryParamKeys(Enum):
         PATH = "path"
@@ -20,26 +37,75 @@ class MCPClientWebServer:
         def __str__(self) -> str:
             return self.value
 
+    class EnvVars(str, Enum):
+        WORKER_THREADS = "MCP_WEB_WORKER_THREADS"
+        KEEP_ALIVE_SECONDS = "MCP_WEB_KEEP_ALIVE_SECONDS"
+        MAX_BODY_BYTES = "MCP_WEB_MAX_BODY_BYTES"
+        LIMIT_CONCURRENCY = "MCP_WEB_LIMIT_CONCURRENCY"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class RequestTooLarge(Exception):
+        pass
+
     class WebUserCallback(Protocol):
         def __call__(self, params: Dict) -> Dict: ...
 
+    class AsyncWebUserCallback(Protocol):
+        async def __call__(self, params: Dict) -> Dict: ...
+
+    class StreamWebUserCallback(Protocol):
+        def __call__(self, params: Dict) -> AsyncIterator[Tuple[str, Any]]: ...
+
     class WebCallback(Protocol):
-        def __call__(self) -> Response: ...
+        def __call__(self, request: Request) -> Awaitable[Response]: ...
 
     def __init__(self,
                  host: str,
-                 port: int) -> None:
+                 port: int,
+                 worker_threads: Optional[int] = None,
+                 keep_alive_seconds: Optional[int] = None,
+                 max_body_bytes: Optional[int] = None,
+                 limit_concurrency: Optional[int] = None) -> None:
+        """
+        :param worker_threads: Most plain (non coroutine) handlers that run at the same time.
+        :param keep_alive_seconds: Seconds an idle keep-alive connection is held open.
+        :param max_body_bytes: Largest request body accepted, larger requests get a 413.
+        :param limit_concurrency: Most connections or tasks before new requests get a 503, None for no limit.
+        Unset values are taken from the environment, else the defaults.
+        """
         self._log: logging.Logger = self._configure_logging()
-        self._app = Flask(__name__)
-        CORS(self._app, resources={r"/*": {"origins": f"http://localhost:*"}})
         self._host: str = host
         self._port: int = port
+        self._worker_threads: int = worker_threads if worker_threads else int(
+            os.environ.get(str(self.EnvVars.WORKER_THREADS), self.DEFAULT_WORKER_THREADS))
+        self._keep_alive_seconds: int = keep_alive_seconds if keep_alive_seconds else int(
+            os.environ.get(str(self.EnvVars.KEEP_ALIVE_SECONDS), self.DEFAULT_KEEP_ALIVE_SECONDS))
+        self._max_body_bytes: int = max_body_bytes if max_body_bytes else int(
+            os.environ.get(str(self.EnvVars.MAX_BODY_BYTES), self.DEFAULT_MAX_BODY_BYTES))
+        env_limit_concurrency: Optional[str] = os.environ.get(
+            str(self.EnvVars.LIMIT_CONCURRENCY))
+        self._limit_concurrency: Optional[int] = limit_concurrency if limit_concurrency else (
+            int(env_limit_concurrency) if env_limit_concurrency else None)
         self._log.debug(f"Client Web Server starting on {host}:{port}")
+
+        self._app = Starlette(middleware=[Middleware(CORSMiddleware,
+                                                     allow_origin_regex=r"http://localhost(:\d+)?",
+                                                     allow_methods=["*"],
+                                                     allow_headers=["*"])])
         self._routes: Dict[str, MCPClientWebServer.WebCallback] = {}
-        self._app.route('/')(self._home)
+        self._app.add_route('/', self._home, methods=['GET'])
+        # Created on the server's event loop when first needed.
+        self._limiter: Optional[anyio.CapacityLimiter] = None
+        self._server: Optional[uvicorn.Server] = None
 
         self._messages: Dict[str, str] = {}
 
+    @property
+    def app(self) -> Starlette:
+        return self._app
+
     def _configure_logging(self) -> logging.Logger:
         log: logging.Logger = logging.getLogger("MessageWebServer")
         if not logging.getLogger().hasHandlers():
@@ -50,7 +116,7 @@ class MCPClientWebServer:
             )
         return log
 
-    def _home(self) -> Response:
+    async def _home(self, request: Request) -> Response:
         self._log.debug("Home page requested")
 
         html = "<html><head><title>Client Service - Available Routes</title></head><body>"
@@ -62,24 +128,51 @@ class MCPClientWebServer:
         html += "</ul></body></html>"
 
         self._log.debug(f"Home page generated with {len(self._routes)} routes")
-        return Response(html, mimetype="text/html")
+        return HTMLResponse(html)
+
+    def _json_response(self,
+                       content: Any,
+                       status_code: int = 200) -> Response:
+        return Response(json.dumps(content, default=str),
+                        status_code=status_code,
+                        media_type="application/json")
 
-    def _web_user_callback_wrapper(self,
-                                   callback: "MCPClientWebServer.WebUserCallback") -> Response:
+    async def _read_body(self, request: Request) -> bytes:
+        content_length: Optional[str] = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self._max_body_bytes:
+            raise MCPClientWebServer.RequestTooLarge(
+                f"Request body of {content_length} bytes is larger than the limit of {self._max_body_bytes}")
+        body: bytearray = bytearray()
+        async for chunk in request.stream():
+            body.extend(chunk)
+            if len(body) > self._max_body_bytes:
+                raise MCPClientWebServer.RequestTooLarge(
+                    f"Request body is larger than the limit of {self._max_body_bytes} bytes")
+        return bytes(body)
+
+    async def _query_params(self, request: Request) -> Dict[str, Any]:
+        """
+        The path and args of the request, the args are the JSON body of a POST if it has one,
+        else the query string. Raises RequestTooLarge or ValueError for a bad body.
+        """
         self._log.debug(
-            f"Processing {request.method} request to {request.path}")
+            f"Processing {request.method} request to {request.url.path}")
 
         query_params: Dict[str, Any] = {}
-        query_params[self.QueryParamKeys.PATH.value] = request.path
+        query_params[self.QueryParamKeys.PATH.value] = request.url.path
 
         # Handle both GET and POST parameters
-        # Handle both GET and POST parameters
-        args_dict: Dict[str, Any] = request.args.to_dict()
+        args_dict: Dict[str, Any] = dict(request.query_params)
         self._log.debug(f"Initial args from query string: {args_dict}")
 
         # If this is a POST request with JSON body, use the JSON data directly for args
-        if request.method == 'POST' and request.is_json:
-            json_data = request.get_json()
+        content_type: str = request.headers.get(
+            "content-type", "").split(";")[0].strip()
+        if request.method == 'POST' and (content_type == "application/json" or content_type.endswith("+json")):
+            try:
+                json_data = json.loads(await self._read_body(request) or b"null")
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON body: {str(e)}") from e
             self._log.debug(f"Received JSON data: {json_data}")
             if isinstance(json_data, dict):
                 args_dict = json_data  # Use JSON data directly
@@ -87,82 +180,151 @@ class MCPClientWebServer:
 
         query_params[self.QueryParamKeys.ARGS.value] = args_dict
         self._log.debug(f"Final query params: {query_params}")
+        return query_params
 
+    async def _read_query_params(self, request: Request) -> Union[Dict[str, Any], Response]:
+        """
+        The query params of the request, or the error response for a bad body.
+        """
         try:
-            result: Dict[str, Any] = call(callback, query_params)
+            return await self._query_params(request)
+        except MCPClientWebServer.RequestTooLarge as e:
+            self._log.warning(str(e))
+            return self._json_response({"error": str(e)}, status_code=413)
+        except ValueError as e:
+            return self._json_response({"error": str(e)}, status_code=400)
+
+    async def _web_user_callback_wrapper(self,
+                                         request: Request,
+                                         callback: Union["MCPClientWebServer.WebUserCallback",
+                                                         "MCPClientWebServer.AsyncWebUserCallback"]) -> Response:
+        query_params = await self._read_query_params(request)
+        if isinstance(query_params, Response):
+            return query_params
+
+        try:
+            tracer = get_tracer()
+            with tracer.continue_trace(request.headers.get(tracer.TRACEPARENT)), \
+                    tracer.span(f"HTTP {request.method} {request.url.path}"):
+                result: Dict[str, Any]
+                if inspect.iscoroutinefunction(callback):
+                    result = await callback(query_params)
+                else:
+                    if self._limiter is None:
+                        self._limiter = anyio.CapacityLimiter(
+                            self._worker_threads)
+                    result = await anyio.to_thread.run_sync(call, callback, query_params,
+                                                            limiter=self._limiter)
             self._log.debug(f"Callback result: {result}")
-            return jsonify(result)
+            return self._json_response(result)
         except Exception as e:
             self._log.error(f"Error in callback execution: {str(e)}")
-            error_response = jsonify({"error": str(e)})
-            error_response.status_code = 500
-            return error_response
+            return self._json_response({"error": str(e)}, status_code=500)
 
     def add_route(self,
                   route: str,
                   methods: List[Literal['GET', 'POST', 'PUT', 'DELETE']],
-                  handler: "MCPClientWebServer.WebUserCallback") -> None:
+                  handler: Union["MCPClientWebServer.WebUserCallback",
+                                 "MCPClientWebServer.AsyncWebUserCallback"]) -> None:
         self._log.debug(f"Adding route: {route} with methods: {methods}")
 
-        wrapped_callback: MCPClientWebServer.WebCallback = partial(
-            self._web_user_callback_wrapper, callback=handler)
-        update_wrapper(wrapped_callback, handler)
+        async def wrapped_callback(request: Request) -> Response:
+            return await self._web_user_callback_wrapper(request, callback=handler)
+        wrapped_callback.__name__ = getattr(handler, "__name__", "unknown")
 
-        self._app.route(route)(wrapped_callback)
+        self._app.add_route(route, wrapped_callback, methods=list(methods))
         self._routes[route] = wrapped_callback
-        self._app.add_url_rule(
-            route, view_func=self._routes[route], methods=methods)
 
         self._log.debug(
             f"Route {route} successfully registered with methods: {methods}")
 
-    def shutdown_server(self):
-        # This function is designed to be called from a request handler
-        # to shut down the Werkzeug server.
-        self._log.debug("Shutdown request received")
+    async def _stream_callback_wrapper(self,
+                                       request: Request,
+                                       callback: "MCPClientWebServer.StreamWebUserCallback") -> Response:
+        query_params = await self._read_query_params(request)
+        if isinstance(query_params, Response):
+            return query_params
 
-        shutdown = request.environ.get('werkzeug.server.shutdown')
-        if shutdown is None:
-            self._log.error(
-                "Not running with the Werkzeug Server - cannot shutdown")
-            raise RuntimeError('Not running with the Werkzeug Server')
+        tracer = get_tracer()
+        traceparent: Optional[str] = request.headers.get(tracer.TRACEPARENT)
 
-        self._log.info("Shutting down server...")
-        shutdown()
-        return 'Server shutting down...'
+        async def events() -> AsyncIterator[str]:
+            with tracer.continue_trace(traceparent), \
+                    tracer.span(f"HTTP {request.method} {request.url.path}"):
+                try:
+                    async for event, data in callback(query_params):
+                        yield self._sse_event(event, data)
+                except Exception as e:
+                    self._log.error(f"Error in stream callback execution: {str(e)}")
+                    yield self._sse_event("error", {"error": str(e)})
 
-    def run(self) -> None:
-        self._log.info(
-            f"Starting MCPClientWebServer on {self._host}:{self._port}")
+        return StreamingResponse(events(),
+                                 media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache",
+                                          "X-Accel-Buffering": "no"})
+
+    @staticmethod
+    def _sse_event(event: str, data: Any) -> str:
+        return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
-        # Signal handler for graceful shutdown
-        def signal_handler(sig, frame):
-            self._log.info(f"Received signal {sig}, shutting down server...")
-            # In a real application, you might want to do more cleanup here
-            sys.exit(0)
-
-        # Only register signal handlers if this is the main thread
-        if threading.current_thread() is threading.main_thread():
-            self._log.debug(
-                "Registering signal handlers for graceful shutdown")
-            signal.signal(signal.SIGINT, signal_handler)
-            signal.signal(signal.SIGTERM, signal_handler)
-        else:
-            self._log.warning(
-                "Not registering signal handlers in non-main thread")
+    def add_stream_route(self,
+                         route: str,
+                         methods: List[Literal['GET', 'POST', 'PUT', 'DELETE']],
+                         handler: "MCPClientWebServer.StreamWebUserCallback") -> None:
+        """
+        Add a route whose handler is an async generator of (event, data) pairs, relayed to
+        the caller as they are produced as server sent events, data as JSON.
+        """
+        self._log.debug(f"Adding stream route: {route} with methods: {methods}")
 
+        async def wrapped_callback(request: Request) -> Response:
+            return await self._stream_callback_wrapper(request, callback=handler)
+        wrapped_callback.__name__ = getattr(handler, "__name__", "unknown")
+
+        self._app.add_route(route, wrapped_callback, methods=list(methods))
+        self._routes[route] = wrapped_callback
+
+    async def shutdown_server(self, request: Request) -> Response:
+        # Called from a request handler to stop the server once in-flight requests complete.
+        self._log.debug("Shutdown request received")
+        if self._server is None:
+            self._log.error("Server is not running - cannot shutdown")
+            raise RuntimeError('Server is not running')
+
+        self._log.info("Shutting down server...")
+        self._server.should_exit = True
+        return PlainTextResponse('Server shutting down...')
+
+    def _build_server(self) -> uvicorn.Server:
         # Add a shutdown route (optional, mainly for testing)
         self._log.debug("Adding shutdown route")
-        self._app.route('/shutdown')(self.shutdown_server)
+        self._app.add_route('/shutdown', self.shutdown_server, methods=['GET'])
+
+        # uvicorn handles SIGINT and SIGTERM, finishing in-flight requests, when run on the main thread.
+        self._server = uvicorn.Server(uvicorn.Config(self._app,
+                                                     host=self._host,
+                                                     port=self._port,
+                                                     timeout_keep_alive=self._keep_alive_seconds,
+                                                     limit_concurrency=self._limit_concurrency,
+                                                     log_config=None))
+        return self._server
 
+    async def serve(self) -> None:
+        """
+        Serve on the running event loop until shutdown.
+        """
+        self._log.info(
+            f"Starting MCPClientWebServer on {self._host}:{self._port}")
         try:
-            self._log.info(
-                f"Flask server starting on {self._host}:{self._port}")
-            self._app.run(host=self._host, port=self._port)
+            await self._build_server().serve()
         except Exception as e:
-            self._log.error(f"Error running Flask server: {str(e)}")
+            self._log.error(f"Error running web server: {str(e)}")
             raise
         finally:
-            # This block might not always be reached on abrupt termination,
-            # but it's good practice for cleaner exits.
-            self._log.info("Flask server process finished.")
+            self._log.info("Web server process finished.")
+
+    def run(self) -> None:
+        """
+        Serve on a new event loop until shutdown, blocking the calling thread.
+        """
+        asyncio.run(self.serve())
@@ -1,8 +1,9 @@
 import asyncio
 import logging
 import re
-from typing import List, Dict, Any, Optional, Protocol
+from typing import List, Dict, Any, Optional, Protocol, Tuple
 from .mcp_client import MCPClient
+from tracing import get_tracer
 
 
 class MCPInvoke:
@@ -16,23 +17,39 @@ class MCPInvoke:
                            capability_uri: Optional[str],
                            parameters: Dict) -> Dict[str, Any]: ...
 
+    class ServerNotRouted(Exception):
+        pass
+
+    DEFAULT_MAX_CONCURRENT_CALLS: int = 8
+    DEFAULT_CALL_TIMEOUT_SECONDS: float = 60.0
+
     def __init__(self,
                  mcp_clients: List[MCPClient],
-                 logger: Optional[logging.Logger] = None):
+                 logger: Optional[logging.Logger] = None,
+                 max_concurrent_calls: int = DEFAULT_MAX_CONCURRENT_CALLS,
+                 call_timeout_seconds: float = DEFAULT_CALL_TIMEOUT_SECONDS):
         """
         Initializes the MCPInvoke class.
 
         :param mcp_client: An instance of MCPClient to interact with MCP servers.
         :param logger: Optional logger instance.
+        :param max_concurrent_calls: The most MCP server calls of one request run at the same time.
+        :param call_timeout_seconds: Seconds after which a single MCP server call fails with a timeout.
         """
         if len(mcp_clients) == 0:
             raise ValueError("At least one MCPClient must be provided.")
+        if max_concurrent_calls < 1:
+            raise ValueError("max_concurrent_calls must be at least 1.")
+        self._max_concurrent_calls: int = max_concurrent_calls
+        self._call_timeout_seconds: float = call_timeout_seconds
 
         self._mcp_clients: List[MCPClient] = []
         for mcp_client in mcp_clients:
             if not isinstance(mcp_client, MCPClient):
                 raise ValueError("mcp_client must be an instance of MCPClient")
             self._mcp_clients.append(mcp_client)
+        # Server name to the client that owns the server, resolved from the clients' routing tables.
+        self._client_by_server: Dict[str, MCPClient] = {}
 
         self._log: logging.Logger = logger if logger else logging.getLogger(
             __name__)
@@ -40,6 +57,8 @@ class MCPInvoke:
             logging.basicConfig(
                 level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+        self._tracer = get_tracer()
+
         self._capability_handlers: Dict[str, MCPInvoke.MCPCapabilityHandler] = {
             str(MCPClient.MCPServerCapabilities.TOOLS): self._handle_tool_call,
             str(MCPClient.MCPServerCapabilities.RESOURCES): self._handle_resource_call,
@@ -47,6 +66,56 @@ class MCPInvoke:
             str(MCPClient.MCPServerCapabilities.PROMPTS): self._handle_prompt_call
         }
 
+    def _routed_client(self, server_name: str) -> Optional[MCPClient]:
+        mcp_client: Optional[MCPClient] = self._client_by_server.get(
+            server_name)
+        if mcp_client is not None and mcp_client.serves(server_name):
+            return mcp_client
+        for mcp_client in self._mcp_clients:
+            if mcp_client.serves(server_name):
+                self._client_by_server[server_name] = mcp_client
+                return mcp_client
+        return None
+
+    def tool_annotations(self,
+                         server_name: str,
+                         tool_name: str) -> Optional[Dict[str, Any]]:
+        """
+        The annotations of the tool as given by its server, None if the server is not known yet.
+        """
+        mcp_client: Optional[MCPClient] = self._routed_client(server_name)
+        if mcp_client is None:
+            return None
+        return mcp_client.routing_table.tool_annotations(server_name, tool_name)
+
+    async def _route(self,
+                     server_name: str,
+                     capability: str,
+                     capability_name: str) -> Tuple[MCPClient, str]:
+        """
+        The client that owns the named server, and the server name to call it with.
+
+        If the server is not known the capabilities of all servers are fetched. A server
+        that is still unknown is an error, naming the servers that do offer the capability
+        so the model can call it again, the call is never sent to a server it did not name.
+        """
+        mcp_client: Optional[MCPClient] = self._routed_client(server_name)
+        if mcp_client is not None:
+            return mcp_client, server_name
+
+        await asyncio.gather(*[c.get_details_of_all_servers() for c in self._mcp_clients])
+        mcp_client = self._routed_client(server_name)
+        if mcp_client is not None:
+            return mcp_client, server_name
+
+        owners: List[Tuple[MCPClient, str]] = [(c, owner)
+                                               for c in self._mcp_clients
+                                               for owner in c.routing_table.servers_for(capability_name, capability)]
+        msg = f"No MCP server named [{server_name}]" + \
+            (f", [{capability_name}] is offered by {[owner for _, owner in owners]}" if owners else "")
+        self._log.error(msg)
+        raise MCPInvoke.ServerNotRouted(msg)
+
     async def _handle_unsupported_call(self,
                                        server_name: str,
                                        capability_name: str,
@@ -80,14 +149,15 @@ class MCPInvoke:
 
         try:
             try:
-                for mcp_client in self._mcp_clients:
-                    result = await mcp_client.execute_resource(
-                        server_name=server_name,
-                        resource_name=capability_name,
-                        resource_uri=capability_uri,
-                        arguments=parameters)
-                    if result:  # Take result from first client with a server that can respond
-                        break
+                mcp_client, routed_server_name = await self._route(server_name=server_name,
+                                                                   capability=str(
+                                                                       MCPClient.MCPServerCapabilities.RESOURCES),
+                                                                   capability_name=capability_name)
+                result = await mcp_client.execute_resource(
+                    server_name=routed_server_name,
+                    resource_name=capability_name,
+                    resource_uri=capability_uri,
+                    arguments=parameters)
             except Exception as ex:
                 result = {
                     "error": f"Failed to execute resource '{capability_name}' on server '{server_name}': {str(ex)}"}
@@ -126,13 +196,14 @@ class MCPInvoke:
         result: Dict[str, Any] = {}
         try:
             try:
-                for mcp_client in self._mcp_clients:
-                    result = await mcp_client.execute_tool(
-                        server_name=server_name,
-                        tool_name=capability_name,
-                        arguments=parameters)
-                    if result:  # Take result from first client with a server that can respond
-                        break
+                mcp_client, routed_server_name = await self._route(server_name=server_name,
+                                                                   capability=str(
+                                                                       MCPClient.MCPServerCapabilities.TOOLS),
+                                                                   capability_name=capability_name)
+                result = await mcp_client.execute_tool(
+                    server_name=routed_server_name,
+                    tool_name=capability_name,
+                    arguments=parameters)
             except Exception as ex:
                 result = {
                     "error": f"Failed to execute tool '{capability_name}' on server '{server_name}': {str(ex)}"}
@@ -142,10 +213,92 @@ class MCPInvoke:
 
         return result
 
+    def _parse_call(self, call: Any) -> Tuple[str, str, str, Optional[str], Dict[str, Any]]:
+        """
+        Validate an MCP server call and return its server name, capability, capability name,
+        capability URI and parameters.
+        """
+        if not isinstance(call, dict):
+            msg = "Each MCP server call must be a dictionary."
+            self._log.error(msg)
+            raise ValueError(msg)
+
+        server_name = call.get("mcp_server_name")
+        if not server_name:
+            msg = "MCP server name is required in the call."
+            self._log.error(msg)
+            raise ValueError(msg)
+
+        capability = call.get("mcp_capability")
+        if not capability:
+            msg = "MCP capability (e.g. Tool, Prompt etc) is required in the call."
+            self._log.error(msg)
+            raise ValueError(msg)
+
+        capability_name = call.get("mcp_capability_name")
+        if not capability_name:
+            msg = "MCP capability (e.g. tool name) is required in the call."
+            self._log.error(msg)
+            raise ValueError(msg)
+
+        capability_uri: str | None = None
+        if capability in [MCPClient.MCPServerCapabilities.RESOURCES.value,
+                          MCPClient.MCPServerCapabilities.RESOURCE_TEMPLATES.value]:
+            capability_uri = call.get("mcp_capability_uri")
+            if not capability_name:
+                msg = "MCP capability URI required for a reosurce or resource template call."
+                self._log.error(msg)
+                raise ValueError(msg)
+
+        parameters = call.get("parameters", {})
+        if not isinstance(parameters, dict):
+            msg = "Parameters must be a dictionary."
+            self._log.error(msg)
+            raise ValueError(msg)
+
+        return server_name, capability, capability_name, capability_uri, parameters
+
+    async def _invoke_call(self,
+                           call: Any,
+                           limit: asyncio.Semaphore) -> Dict[str, Any]:
+        """
+        Run one MCP server call, a failure or timeout is returned as the error of this call only.
+        """
+        try:
+            server_name, capability, capability_name, capability_uri, parameters = self._parse_call(
+                call)
+        except Exception as e:
+            return {"error": f"Error processing MCP server call: {str(e)}"}
+
+        handler: MCPInvoke.MCPCapabilityHandler = self._capability_handlers.get(capability,
+                                                                                self._handle_unsupported_call)
+        async with limit:
+            try:
+                with self._tracer.span("MCPInvoke.call",
+                                       server=server_name,
+                                       capability=capability,
+                                       name=capability_name):
+                    return await asyncio.wait_for(handler(server_name=server_name,
+                                                          capability_name=capability_name,
+                                                          capability_uri=capability_uri,
+                                                          parameters=parameters),
+                                                  timeout=self._call_timeout_seconds)
+            except asyncio.TimeoutError:
+                msg = f"MCP call [{capability_name}] on server [{server_name}] timed out after {self._call_timeout_seconds}s"
+                self._log.error(msg)
+                return {"error": msg}
+            except Exception as e:
+                msg = f"Error processing MCP call [{capability_name}] on server [{server_name}]: {str(e)}"
+                self._log.error(msg)
+                return {"error": msg}
+
     async def get_mcp_server_responses(self,
                                        mcp_server_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Processes a list of MCP server calls and invokes the appropriate actions.
+
+        The calls are independent so they run concurrently, at most max_concurrent_calls at a
+        time, and the results are returned in the order of the calls.
         """
         results: List[Dict[str, Any]] = []
         try:
@@ -156,53 +309,9 @@ class MCPInvoke:
             if len(mcp_server_calls) == 0:
                 self._log.info("No MCP server calls to process.")
             else:
-                for call in mcp_server_calls:
-                    if not isinstance(call, dict):
-                        msg = "Each MCP server call must be a dictionary."
-                        self._log.error(msg)
-                        raise ValueError(msg)
-
-                    server_name = call.get("mcp_server_name")
-                    if not server_name:
-                        msg = "MCP server name is required in the call."
-                        self._log.error(msg)
-                        raise ValueError(msg)
-
-                    capability = call.get("mcp_capability")
-                    if not capability:
-                        msg = "MCP capability (e.g. Tool, Prompt etc) is required in the call."
-                        self._log.error(msg)
-                        raise ValueError(msg)
-
-                    capability_name = call.get("mcp_capability_name")
-                    if not capability_name:
-                        msg = "MCP capability (e.g. tool name) is required in the call."
-                        self._log.error(msg)
-                        raise ValueError(msg)
-
-                    capability_uri: str | None = None
-                    if capability in [MCPClient.MCPServerCapabilities.RESOURCES.value,
-                                      MCPClient.MCPServerCapabilities.RESOURCE_TEMPLATES.value]:
-                        capability_uri = call.get("mcp_capability_uri")
-                        if not capability_name:
-                            msg = "MCP capability URI required for a reosurce or resource template call."
-                            self._log.error(msg)
-                            raise ValueError(msg)
-
-                    parameters = call.get("parameters", {})
-                    if not isinstance(parameters, dict):
-                        msg = "Parameters must be a dictionary."
-                        self._log.error(msg)
-                        raise ValueError(msg)
-
-                    handler: MCPInvoke.MCPCapabilityHandler = self._capability_handlers.get(capability,
-                                                                                            self._handle_unsupported_call)
-
-                    results.append(
-                        await handler(server_name=server_name,
-                                      capability_name=capability_name,
-                                      capability_uri=capability_uri,
-                                      parameters=parameters))
+                limit = asyncio.Semaphore(self._max_concurrent_calls)
+                results = list(await asyncio.gather(*[self._invoke_call(call, limit)
+                                                      for call in mcp_server_calls]))
         except Exception as e:
             msg = f"Error processing MCP server calls: {str(e)}"
             self._log.error(msg)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
+
+
+class MCPResponseCache:
+    """
+    Tool responses shared across sessions, for read only, idempotent tools whose server
+    opts them in with a TTL.
+
+    Each response is held for the tool's TTL (from the server's tool config) and is kept serialised, so callers get their own copy and the memory used
+    is known. Least recently used responses are evicted once the bound is reached.
+    """
+
+    DEFAULT_MAX_BYTES: int = 32 * 1024 * 1024
+    DEFAULT_TTL_SECONDS: float = 60.0
+    # Tool _meta key the server sets to the seconds a response may be cached.
+    TTL_META_KEY: str = "cache_ttl_seconds"
+
+    class EnvVars(str, Enum):
+        MAX_BYTES = "MCP_RESPONSE_CACHE_MAX_BYTES"
+        TTL = "MCP_RESPONSE_CACHE_TTL"
+
+        def __str__(self) -> str:
+            return self.value
+
+    def __init__(self,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 default_ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self._log: logging.Logger = logging.getLogger(__name__)
+        self._max_bytes: int = max_bytes
+        self._default_ttl_seconds: float = default_ttl_seconds
+        self._lock: threading.Lock = threading.Lock()
+        # key -> (expires at, serialised response), least recently used first.
+        self._entries: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+        self._bytes: int = 0
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+
+    @classmethod
+    def from_environment(cls) -> "MCPResponseCache":
+        return cls(max_bytes=int(os.environ.get(str(cls.EnvVars.MAX_BYTES), cls.DEFAULT_MAX_BYTES)),
+                   default_ttl_seconds=float(os.environ.get(str(cls.EnvVars.TTL), cls.DEFAULT_TTL_SECONDS)))
+
+    @property
+    def default_ttl_seconds(self) -> float:
+        return self._default_ttl_seconds
+
+    @staticmethod
+    def key(server_name: str,
+            tool_name: str,
+            arguments: Dict[str, Any]) -> str:
+        canonical: str = json.dumps([server_name, tool_name, arguments],
+                                    sort_keys=True,
+                                    separators=(",", ":"),
+                                    default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return json.loads(entry[1])
+
+    def put(self,
+            key: str,
+            response: Any,
+            ttl_seconds: Optional[float] = None) -> None:
+        ttl: float = self._default_ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return
+        data: bytes = json.dumps(response, default=str).encode("utf-8")
+        if len(data) > self._max_bytes:
+            self._log.debug(
+                f"Not caching response of {len(data)} bytes, larger than the cache")
+            return
+        with self._lock:
+            self._remove(key)
+            while self._entries and self._bytes + len(data) > self._max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+            self._entries[key] = (time.monotonic() + ttl, data)
+            self._bytes += len(data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries),
+                    "bytes": self._bytes,
+                    "max_bytes": self._max_bytes,
+                    "hits": self._hits,
+                    "misses": self._misses,
+                    "evictions": self._evictions}
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
@@ -0,0 +1,96 @@
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import pydantic
+
+
+class MCPRoutingTable:
+    """
+    Lookup tables derived from server capabilities: server name to base URL, capability
+    name to the servers that offer it and tool annotations and cache TTLs by server and tool.
+
+    The tables are rebuilt when a server's capabilities are fetched and swapped in as a
+    whole, so lookups are plain dictionary reads without locking.
+    """
+
+    CACHE_TTL_KEY: str = "cache_ttl_seconds"
+
+    class InvalidServerURL(ValueError):
+        pass
+
+    def __init__(self) -> None:
+        self._log: logging.Logger = logging.getLogger(__name__)
+        self._lock: threading.Lock = threading.Lock()
+        self._capabilities_by_url: Dict[str, Dict[str, Any]] = {}
+        self._url_by_server: Dict[str, str] = {}
+        self._servers_by_capability: Dict[Tuple[str, str], List[str]] = {}
+        self._tool_annotations: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._tool_cache_ttls: Dict[Tuple[str, str], float] = {}
+
+    def update(self,
+               server_base_url: str,
+               capabilities: Dict[str, Any]) -> None:
+        """
+        Replace the routes of the server at the given URL with those of its capabilities.
+        """
+        server_name: Optional[str] = capabilities.get(
+            "server_detail", {}).get("name")
+        if not server_name:
+            raise ValueError(
+                f"Capabilities for [{server_base_url}] have no server name")
+        try:
+            pydantic.AnyUrl(server_base_url)
+        except pydantic.ValidationError as ve:
+            raise MCPRoutingTable.InvalidServerURL(
+                f"URL '{server_base_url}' for server name '{server_name}' is not a valid URL.") from ve
+
+        with self._lock:
+            self._capabilities_by_url[server_base_url] = capabilities
+            url_by_server: Dict[str, str] = {}
+            servers_by_capability: Dict[Tuple[str, str], List[str]] = {}
+            tool_annotations: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            tool_cache_ttls: Dict[Tuple[str, str], float] = {}
+            for url, server_capabilities in self._capabilities_by_url.items():
+                name: str = server_capabilities["server_detail"]["name"]
+                url_by_server[name] = url
+                for capability_type in ("tools", "resources", "resource_templates", "prompts"):
+                    for capability in server_capabilities.get(capability_type, []) or []:
+                        servers_by_capability.setdefault(
+                            (capability_type, capability["name"]), []).append(name)
+                        if capability_type == "tools" and capability.get("annotations"):
+                            tool_annotations[(name, capability["name"])
+                                             ] = capability["annotations"]
+                        if capability_type == "tools" and capability.get(MCPRoutingTable.CACHE_TTL_KEY) is not None:
+                            tool_cache_ttls[(name, capability["name"])
+                                            ] = float(capability[MCPRoutingTable.CACHE_TTL_KEY])
+            self._url_by_server = url_by_server
+            self._servers_by_capability = servers_by_capability
+            self._tool_annotations = tool_annotations
+            self._tool_cache_ttls = tool_cache_ttls
+        self._log.debug(
+            f"Routes updated for [{server_name}] at [{server_base_url}], {len(self._url_by_server)} servers routed")
+
+    def __len__(self) -> int:
+        return len(self._url_by_server)
+
+    @property
+    def server_names(self) -> List[str]:
+        return list(self._url_by_server)
+
+    def server_url(self, server_name: str) -> Optional[str]:
+        return self._url_by_server.get(server_name)
+
+    def servers_for(self,
+                    capability_name: str,
+                    capability_type: str = "tools") -> List[str]:
+        return list(self._servers_by_capability.get((capability_type, capability_name), []))
+
+    def tool_annotations(self,
+                         server_name: str,
+                         tool_name: str) -> Optional[Dict[str, Any]]:
+        return self._tool_annotations.get((server_name, tool_name))
+
+    def tool_cache_ttl(self,
+                       server_name: str,
+                       tool_name: str) -> Optional[float]:
+        return self._tool_cache_ttls.get((server_name, tool_name))
@@ -0,0 +1,358 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+import anyio
+from mcp.client.session import ClientSession
+from mcp.client.sse import sse_client
+from mcp.shared.exceptions import McpError
+import mcp.types as types
+from mcp.types import CONNECTION_CLOSED
+
+T = TypeVar("T")
+
+
+class MCPSessionPool:
+    """
+    Pool of long lived, initialized MCP client sessions keyed by server URL.
+
+    An MCP session multiplexes concurrent requests, so a call uses the least busy open
+    session for the server and a new connection is only opened when every session is
+    busy and the pool is below its size. Sessions idle for longer than the idle timeout
+    are closed, sessions idle for longer than the health check interval are pinged
+    before reuse, and a call that is safe to repeat and fails because of the connection
+    is retried once on a fresh session. A session ends as soon as its SSE stream does
+    (e.g. the server restarted), so calls are not sent to a dead session.
+
+    Sessions belong to the event loop that opened them, so the pool keeps its sessions
+    per event loop. Callers on different loops (e.g. request threads each running their
+    own loop) get their own sessions, and a loop's sessions go when the loop does.
+    """
+
+    DEFAULT_POOL_SIZE: int = 2
+    DEFAULT_IDLE_TIMEOUT_SECONDS: float = 300.0
+    DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS: float = 30.0
+    DEFAULT_CONNECT_TIMEOUT_SECONDS: float = 10.0
+
+    class FailedToOpenSession(Exception):
+        pass
+
+    class EnvVars(str, Enum):
+        POOL_SIZE = "MCP_SESSION_POOL_SIZE"
+        IDLE_TIMEOUT = "MCP_SESSION_IDLE_TIMEOUT"
+        HEALTH_CHECK_INTERVAL = "MCP_SESSION_HEALTH_CHECK_INTERVAL"
+        CONNECT_TIMEOUT = "MCP_SESSION_CONNECT_TIMEOUT"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class PooledSession:
+        """
+        One connection and initialized session. The connection is opened and closed by
+        a dedicated task, as the sse_client and session contexts must be entered and
+        exited in the same task.
+        """
+
+        def __init__(self,
+                     url: str,
+                     connect_timeout_seconds: float,
+                     message_handler: Optional[Callable] = None) -> None:
+            self.url: str = url
+            self.session: Optional[ClientSession] = None
+            self.initialize_result: Optional[types.InitializeResult] = None
+            self.error: Optional[BaseException] = None
+            self.in_flight: int = 0
+            self.last_used: float = time.monotonic()
+            self.last_checked: float = time.monotonic()
+            self._connect_timeout_seconds: float = connect_timeout_seconds
+            self._message_handler: Optional[Callable] = message_handler
+            self._ready: asyncio.Event = asyncio.Event()
+            self._close_requested: asyncio.Event = asyncio.Event()
+            self._closed: bool = False
+            self._task: Optional[asyncio.Task] = None
+
+        @property
+        def usable(self) -> bool:
+            return self.session is not None and not self._closed and not self._close_requested.is_set()
+
+        async def _relay(self,
+                         read_stream: Any,
+                         session_stream: Any) -> None:
+            """
+            Pass the server messages on to the session, and end the session when the SSE
+            stream ends.
+            """
+            try:
+                async with session_stream:
+                    async for message in read_stream:
+                        await session_stream.send(message)
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                pass
+            finally:
+                self.request_close()
+
+        async def _run(self) -> None:
+            relay: Optional[asyncio.Task] = None
+            try:
+                async with sse_client(self.url, timeout=self._connect_timeout_seconds) as (read_stream, write_stream):
+                    session_writer, session_reader = anyio.create_memory_object_stream(0)
+                    relay = asyncio.get_running_loop().create_task(self._relay(read_stream, session_writer))
+                    async with ClientSession(session_reader,
+                                             write_stream,
+                                             message_handler=self._message_handler) as session:
+                        self.initialize_result = await session.initialize()
+                        self.session = session
+                        self._ready.set()
+                        await self._close_requested.wait()
+            except Exception as e:  # pylint: disable=broad-except
+                self.error = e
+            finally:
+                if relay is not None:
+                    relay.cancel()
+                self._closed = True
+                self._ready.set()
+
+        def request_close(self) -> None:
+            """
+            Take the session out of use, it is closed by its own task.
+            """
+            self._close_requested.set()
+
+        async def open(self) -> None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            try:
+                await asyncio.wait_for(self._ready.wait(), self._connect_timeout_seconds)
+            except asyncio.TimeoutError as te:
+                await self.close()
+                raise MCPSessionPool.FailedToOpenSession(
+                    f"Timeout opening MCP session to [{self.url}]") from te
+            if self.session is None or self._closed:
+                raise MCPSessionPool.FailedToOpenSession(
+                    f"Unable to open MCP session to [{self.url}]: {str(self.error)}") from self.error
+
+        async def close(self) -> None:
+            self.request_close()
+            if self._task is not None and not self._task.done():
+                try:
+                    await asyncio.wait_for(asyncio.shield(self._task), self._connect_timeout_seconds)
+                except (asyncio.TimeoutError, asyncio.CancelledError):
+                    self._task.cancel()
+
+    class _LoopSessions:
+        def __init__(self) -> None:
+            self.sessions: Dict[str, List[MCPSessionPool.PooledSession]] = {}
+            self.opening: Dict[str, List[asyncio.Future]] = {}
+
+    def __init__(self,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 idle_timeout_seconds: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+                 health_check_interval_seconds: float = DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS,
+                 connect_timeout_seconds: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+                 message_handler_factory: Optional[Callable[[str], Callable]] = None) -> None:
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be 1 or more, got {pool_size}")
+        self._log: logging.Logger = logging.getLogger(__name__)
+        self._pool_size: int = pool_size
+        self._idle_timeout_seconds: float = idle_timeout_seconds
+        self._health_check_interval_seconds: float = health_check_interval_seconds
+        self._connect_timeout_seconds: float = connect_timeout_seconds
+        self._message_handler_factory: Optional[Callable[[str], Callable]] = message_handler_factory
+        self._lock: threading.Lock = threading.Lock()
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, MCPSessionPool._LoopSessions]" = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_environment(cls) -> "MCPSessionPool":
+        return cls(pool_size=int(os.environ.get(str(cls.EnvVars.POOL_SIZE), cls.DEFAULT_POOL_SIZE)),
+                   idle_timeout_seconds=float(os.environ.get(
+                       str(cls.EnvVars.IDLE_TIMEOUT), cls.DEFAULT_IDLE_TIMEOUT_SECONDS)),
+                   health_check_interval_seconds=float(os.environ.get(
+                       str(cls.EnvVars.HEALTH_CHECK_INTERVAL), cls.DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS)),
+                   connect_timeout_seconds=float(os.environ.get(
+                       str(cls.EnvVars.CONNECT_TIMEOUT), cls.DEFAULT_CONNECT_TIMEOUT_SECONDS)))
+
+    def set_message_handler_factory(self, factory: Optional[Callable[[str], Callable]]) -> None:
+        """
+        Set the factory that gives the message handler (server notifications) for
+        sessions opened to a given URL from now on.
+        """
+        self._message_handler_factory = factory
+
+    def _loop_sessions(self) -> "MCPSessionPool._LoopSessions":
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loop_sessions = self._loops.get(loop)
+            if loop_sessions is None:
+                loop_sessions = MCPSessionPool._LoopSessions()
+                self._loops[loop] = loop_sessions
+        return loop_sessions
+
+    @property
+    def _sessions(self) -> Dict[str, List["MCPSessionPool.PooledSession"]]:
+        return self._loop_sessions().sessions
+
+    @property
+    def _opening(self) -> Dict[str, List[asyncio.Future]]:
+        return self._loop_sessions().opening
+
+    async def _evict_idle(self, url: str) -> None:
+        now = time.monotonic()
+        sessions = self._sessions.get(url, [])
+        keep: List[MCPSessionPool.PooledSession] = []
+        for pooled in sessions:
+            if not pooled.usable:
+                continue
+            if pooled.in_flight == 0 and now - pooled.last_used > self._idle_timeout_seconds:
+                self._log.debug(f"Closing idle MCP session to [{url}]")
+                await pooled.close()
+                continue
+            keep.append(pooled)
+        self._sessions[url] = keep
+
+    async def _healthy(self, pooled: "MCPSessionPool.PooledSession") -> bool:
+        if time.monotonic() - pooled.last_checked < self._health_check_interval_seconds or pooled.in_flight > 0:
+            return True
+        try:
+            await asyncio.wait_for(pooled.session.send_ping(), self._connect_timeout_seconds)
+            pooled.last_checked = time.monotonic()
+            return True
+        except Exception as e:  # pylint: disable=broad-except
+            self._log.warning(
+                f"MCP session to [{pooled.url}] failed health check, reconnecting: {str(e)}")
+            await self._discard(pooled)
+            return False
+
+    async def _discard(self, pooled: "MCPSessionPool.PooledSession") -> None:
+        self._discard_nowait(pooled)
+        await pooled.close()
+
+    def _discard_nowait(self, pooled: "MCPSessionPool.PooledSession") -> None:
+        sessions = self._sessions.get(pooled.url, [])
+        if pooled in sessions:
+            sessions.remove(pooled)
+        pooled.request_close()
+
+    async def _open(self, url: str) -> "MCPSessionPool.PooledSession":
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        opening = self._opening.setdefault(url, [])
+        opening.append(future)
+        try:
+            handler = self._message_handler_factory(
+                url) if self._message_handler_factory else None
+            pooled = MCPSessionPool.PooledSession(url=url,
+                                                  connect_timeout_seconds=self._connect_timeout_seconds,
+                                                  message_handler=handler)
+            await pooled.open()
+            self._sessions.setdefault(url, []).append(pooled)
+            self._log.info(
+                f"Opened pooled MCP session to [{url}] server [{pooled.initialize_result.serverInfo.name}]")
+            future.set_result(pooled)
+            return pooled
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved, waiters re-raise it themselves.
+            raise
+        finally:
+            opening.remove(future)
+
+    async def acquire(self, url: str) -> "MCPSessionPool.PooledSession":
+        """
+        Get an open session for the URL; the caller must call release when done.
+        """
+        await self._evict_idle(url)
+        while True:
+            sessions = [s for s in self._sessions.get(url, []) if s.usable]
+            opening: List[asyncio.Future] = self._opening.get(url, [])
+            pooled: Optional[MCPSessionPool.PooledSession] = min(
+                sessions, key=lambda s: s.in_flight) if sessions else None
+            at_capacity: bool = len(sessions) + len(opening) >= self._pool_size
+            if pooled is not None and (pooled.in_flight == 0 or at_capacity):
+                if not await self._healthy(pooled):
+                    continue
+            elif not at_capacity:
+                pooled = await self._open(url)
+            else:
+                # Every slot is a connection still being opened, share the first one.
+                pooled = await asyncio.shield(opening[0])
+            pooled.in_flight += 1
+            pooled.last_used = time.monotonic()
+            return pooled
+
+    def release(self, pooled: "MCPSessionPool.PooledSession") -> None:
+        pooled.in_flight = max(0, pooled.in_flight - 1)
+        pooled.last_used = time.monotonic()
+
+    async def run(self,
+                  url: str,
+                  operation: Callable[[ClientSession], Awaitable[T]],
+                  retry: bool = False) -> T:
+        """
+        Run the operation on a pooled session for the URL. An error returned by the
+        server is raised as is. If retry is set, for operations safe to repeat (reads and
+        read only or idempotent tools), a connection failure is retried once on a new
+        session. Others may have reached the server before the failure, so are not retried.
+        A session that failed, or whose call was cancelled or timed out, leaves the pool.
+        """
+        for attempt in range(2 if retry else 1):
+            pooled = await self.acquire(url)
+            try:
+                return await operation(pooled.session)
+            except asyncio.CancelledError:
+                # Cancelled or timed out part way, the session may still get the reply, don't reuse it.
+                self._discard_nowait(pooled)
+                raise
+            except McpError as e:
+                if e.error.code != CONNECTION_CLOSED:
+                    raise
+                await self._discard(pooled)
+                if not retry or attempt > 0:
+                    raise
+                self._log.warning(
+                    f"MCP session to [{url}] closed, retrying on a new session: {str(e)}")
+            except Exception as e:  # pylint: disable=broad-except
+                await self._discard(pooled)
+                if not retry or attempt > 0:
+                    raise
+                self._log.warning(
+                    f"MCP call to [{url}] failed, retrying on a new session: {str(e)}")
+            finally:
+                self.release(pooled)
+        raise MCPSessionPool.FailedToOpenSession(f"Unable to call [{url}]")
+
+    def _all_sessions(self) -> Dict[str, List["MCPSessionPool.PooledSession"]]:
+        with self._lock:
+            all_loop_sessions = list(self._loops.values())
+        merged: Dict[str, List[MCPSessionPool.PooledSession]] = {}
+        for loop_sessions in all_loop_sessions:
+            for url, sessions in loop_sessions.sessions.items():
+                merged.setdefault(url, []).extend(sessions)
+        return merged
+
+    def server_info(self, url: str) -> Optional[types.InitializeResult]:
+        for pooled in self._all_sessions().get(url, []):
+            if pooled.initialize_result is not None:
+                return pooled.initialize_result
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self._pool_size,
+            "idle_timeout_seconds": self._idle_timeout_seconds,
+            "health_check_interval_seconds": self._health_check_interval_seconds,
+            "sessions": {url: {"open": len(sessions),
+                               "in_flight": sum(s.in_flight for s in sessions)}
+                         for url, sessions in self._all_sessions().items()},
+        }
+
+    async def close(self) -> None:
+        """
+        Close the sessions opened on the running event loop.
+        """
+        loop_sessions = self._loop_sessions()
+        for sessions in list(loop_sessions.sessions.values()):
+            for pooled in list(sessions):
+                await pooled.close()
+        loop_sessions.sessions.clear()
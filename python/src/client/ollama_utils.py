@@ -1,18 +1,23 @@
 import os
 import mcp
 import requests
+import httpx
 import json
 import logging
-import re
 import uuid
-from typing import Optional, Tuple, Dict, Any, List
+from typing import Callable, Optional, Tuple, Dict, Any, List
 from enum import Enum
 from datetime import datetime
 from yarl import URL
+from llm_http_client import LLMHttpClient
+from llm_json_extractor import LLMJSONExtractor
 
 
 class Ollama:
 
+    class OllamaError(Exception):
+        pass
+
     class OllamaModel(Enum):
         LLAMA2_7B = "llama2:7b"
         LLAMA3_3_LATEST = "llama3.3:latest"
@@ -21,7 +26,8 @@ class Ollama:
         def __str__(self) -> str:
             return self.value
 
-    def __init__(self) -> None:
+    def __init__(self,
+                 http_client: Optional[LLMHttpClient] = None) -> None:
 
         self._log: logging.Logger = logging.getLogger(__name__)
         if not logging.getLogger().hasHandlers():
@@ -31,8 +37,12 @@ class Ollama:
                 handlers=[logging.StreamHandler()]
             )
 
+        self._json_extractor: LLMJSONExtractor = LLMJSONExtractor()
+
         self._ollama_model = Ollama.OllamaModel.QWEN2_5_72B.value
         self._ollama_host = "http://localhost:11434"
+        # Pooled, so connections to the Ollama host are reused across calls.
+        self._http_client: LLMHttpClient = http_client if http_client is not None else LLMHttpClient.from_environment()
 
     def ollama_running_and_model_loaded(self,
                                         host_url: URL,
@@ -54,33 +64,42 @@ class Ollama:
             return False
 
     def clean_json_str(self,
-                       jason_str: str) -> str:
-        jason_str = re.sub(r"[\n\t`']", "", jason_str, flags=re.MULTILINE)
-        jason_str = re.sub(r"^json", "", jason_str, flags=re.IGNORECASE)
-        response: Dict[str, str] = {}
-        try:
-            response = json.loads(jason_str)
-        except json.JSONDecodeError as je:
-            msg: str = f"JSON Decode Error: {je.msg} at line {je.lineno}, column {je.colno}"
-            self._log.error(msg=msg)
-            response = {
-                "error": "Invalid JSON format",
-                "details": msg
-            }
-        except Exception as e:
-            msg: str = f"Unexpected error while parsing JSON: {str(e)}"
-            self._log.error(msg=msg)
-            response = {
-                "error": "Unexpected error while parsing JSON",
-                "details": msg
-            }
-        return json.dumps(response, ensure_ascii=False)
-
-    def get_ollama_response(self,
-                            prompt: str,
-                            model: str,
-                            host_and_port_url: str,
-                            temperature: float) -> Tuple[bool, Dict]:
+                       jason_str: str) -> Dict[str, Any]:
+        return self._json_extractor.extract(jason_str)
+
+    async def _read_stream(self,
+                           response: httpx.Response,
+                           on_token: Callable[[str], None]) -> Dict[str, Any]:
+        """
+        Reads a streamed chat response (one JSON object per line), passing each piece of
+        content to on_token as it arrives, and returns it as a non streamed response.
+        """
+        content: List[str] = []
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            chunk: Dict[str, Any] = json.loads(line)
+            if "error" in chunk:
+                raise Ollama.OllamaError(
+                    f"Ollama stream error: {chunk['error']}")
+            token: str = chunk.get("message", {}).get("content", "")
+            if token:
+                content.append(token)
+                on_token(token)
+            if chunk.get("done"):
+                break
+        return {"message": {"role": "assistant", "content": "".join(content)}}
+
+    async def get_ollama_response(self,
+                                  prompt: str,
+                                  model: str,
+                                  host_and_port_url: str,
+                                  temperature: float,
+                                  on_token: Optional[Callable[[str], None]] = None) -> Tuple[bool, Dict]:
+        """
+        :param on_token: If given the response is streamed, each piece of content is passed to
+                         on_token as it arrives and the whole content is parsed at the end.
+        """
         try:
             start_time: str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             self._log.debug(f"Model request starts: {start_time}")
@@ -91,26 +110,37 @@ class Ollama:
             payload: Dict[str, Any] = {
                 'model': model,
                 'messages': [{'role': 'user', 'content': prompt}],
-                'stream': False,
+                'stream': on_token is not None,
                 'options': {'temperature': temperature}
             }
 
-            response: requests.Response = requests.post(url, headers=headers,
-                                                        data=json.dumps(payload))
-            response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+            async with self._http_client.stream("POST", url,
+                                                headers=headers,
+                                                content=json.dumps(payload)) as response:
+                response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
 
-            data: Dict[str, Any] = response.json()
-            json_str: str = self.clean_json_str(data['message']['content'])
+                if on_token is not None:
+                    data: Dict[str, Any] = await self._read_stream(response, on_token)
+                else:
+                    await response.aread()
+                    data = response.json()
+            llm_response: Dict[str, Any] = self.clean_json_str(data['message']['content'])
 
             end_time: str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             self._log.debug(f"Model request ends: {end_time}")
             self._log.debug(
                 f"Model request duration: {(datetime.strptime(end_time, '%Y-%m-%d %H:%M:%S') - datetime.strptime(start_time, '%Y-%m-%d %H:%M:%S')).seconds // 60} mins and {(datetime.strptime(end_time, '%Y-%m-%d %H:%M:%S') - datetime.strptime(start_time, '%Y-%m-%d %H:%M:%S')).seconds % 60} seconds")
 
-            return (True, json.loads(json_str))
+            if "error" in llm_response:
+                # The content could not be parsed into a response, e.g. invalid or cut short JSON.
+                self._log.error(f"Ollama - invalid response content: {llm_response}")
+                return (False, llm_response)
+            return (True, llm_response)
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             return (False, {"error": f"Failed to connect to Ollama: {str(e)}"})
+        except Ollama.OllamaError as e:
+            return (False, {"error": str(e)})
         except json.JSONDecodeError:
             return (False, {"error": "Invalid JSON response from Ollama."})
         except KeyError:
@@ -118,14 +148,15 @@ class Ollama:
         except Exception as e:
             return (False, {"error": f"An unexpected error occurred: {str(e)}"})
 
-    def get_llm_response(self,
-                         prompt: str,
-                         model: str,
-                         host: str,
-                         temperature) -> Tuple[bool, Dict]:
+    async def get_llm_response(self,
+                               prompt: str,
+                               model: str,
+                               host: str,
+                               temperature,
+                               on_token: Optional[Callable[[str], None]] = None) -> Tuple[bool, Dict]:
         try:
-            res, reply = self.get_ollama_response(
-                prompt, model=model, host_and_port_url=host, temperature=temperature)
+            res, reply = await self.get_ollama_response(
+                prompt, model=model, host_and_port_url=host, temperature=temperature, on_token=on_token)
             # No change needed here now, as reply will always be a Dict
             return res, reply
         except Exception as e:
@@ -1,9 +1,10 @@
 import os
-import requests
+import httpx
 import json
 import logging
-import re
-from typing import Tuple, Dict, Any, Optional, List
+from typing import Callable, Tuple, Dict, Any, Optional, List
+from llm_http_client import LLMHttpClient
+from llm_json_extractor import LLMJSONExtractor
 
 OPENROUTER_API_BASE_URL = "https://openrouter.ai/api/v1"
 DEFAULT_OPENROUTER_MODEL = "google/gemini-2.5-pro-preview"
@@ -20,7 +21,12 @@ class OpenRouter:
                  model_name: Optional[str] = None,
                  max_tokens: Optional[int] = None,
                  system_prompt: Optional[str] = None,
-                 temperature: float = 0.3,) -> None:
+                 temperature: float = 0.3,
+                 http_client: Optional[LLMHttpClient] = None,
+                 on_usage: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
+        """
+        :param on_usage: Called with the token usage and cost OpenRouter reports for each response.
+        """
 
         self._log: logging.Logger = logging.getLogger(__name__)
         if not logging.getLogger().hasHandlers():
@@ -30,6 +36,8 @@ class OpenRouter:
                 handlers=[logging.StreamHandler()]
             )
 
+        self._json_extractor: LLMJSONExtractor = LLMJSONExtractor()
+
         if openrouter_url is None:
             self._openrouter_url = OPENROUTER_API_BASE_URL
         else:
@@ -48,6 +56,10 @@ class OpenRouter:
 
         self._url: str = f"{OPENROUTER_API_BASE_URL}/chat/completions"
 
+        # Pooled, so connections to OpenRouter are reused across calls.
+        self._http_client: LLMHttpClient = http_client if http_client is not None else LLMHttpClient.from_environment()
+        self._on_usage: Optional[Callable[[Dict[str, Any]], None]] = on_usage
+
         if system_prompt is not None:
             self._system_prompt: str = system_prompt
         else:
@@ -75,27 +87,7 @@ class OpenRouter:
 
     def _clean_json_str(self,
                         jason_str: str) -> Dict[str, Any]:
-        jason_str = re.sub(r"[\n\t`']", "", jason_str, flags=re.MULTILINE)
-        jason_str = re.sub(r"^json", "", jason_str, flags=re.IGNORECASE)
-        response: Dict[str, str] = {}
-        try:
-            response = json.loads(jason_str)
-        except json.JSONDecodeError as je:
-            msg: str = f"JSON Decode Error: {je.msg} at line {je.lineno}, column {je.colno}"
-            self._log.error(msg=msg)
-            response = {
-                "error": "Invalid JSON format",
-                "details": msg
-            }
-        except Exception as e:
-            msg: str = f"Unexpected error while parsing JSON: {str(e)}"
-            self._log.error(msg=msg)
-            response = {
-                "error": "Unexpected error while parsing JSON",
-                "details": msg
-            }
-        # Normalize the JSON string to ensure it's a valid JSON object
-        return json.loads(json.dumps(response, ensure_ascii=False))
+        return self._json_extractor.extract(jason_str)
 
     def _missing_response(self,
                           error_message: str) -> Dict[str, Any]:
@@ -113,13 +105,48 @@ class OpenRouter:
             "status": "error"
         }
 
-    def get_llm_response(self,
-                         prompt: str
-                         ) -> Tuple[bool, Any]:
+    async def _read_stream(self,
+                           response: httpx.Response,
+                           on_token: Callable[[str], None]) -> Dict[str, Any]:
+        """
+        Reads a streamed (server sent events) completion, passing each piece of content to
+        on_token as it arrives, and returns it as a non streamed response.
+        """
+        content: List[str] = []
+        usage: Optional[Dict[str, Any]] = None
+        async for line in response.aiter_lines():
+            # Blank lines separate events, lines starting : are keep-alive comments.
+            if not line or not line.startswith("data:"):
+                continue
+            data: str = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            chunk: Dict[str, Any] = json.loads(data)
+            if "error" in chunk:
+                raise OpenRouter.OpenRouterError(
+                    f"OpenRouter stream error: {chunk['error']}")
+            for choice in chunk.get("choices", []):
+                token: Optional[str] = choice.get("delta", {}).get("content")
+                if token:
+                    content.append(token)
+                    on_token(token)
+            # The usage comes with the last chunk.
+            usage = chunk.get("usage") or usage
+        response_data: Dict[str, Any] = {"choices": [{"message": {"content": "".join(content)}}]}
+        if usage:
+            response_data["usage"] = usage
+        return response_data
+
+    async def get_llm_response(self,
+                               prompt: str,
+                               on_token: Optional[Callable[[str], None]] = None
+                               ) -> Tuple[bool, Any]:
         """
         Contacts the OpenRouter.ai API to get a response to the given prompt.
 
         :param prompt: The user's prompt.
+        :param on_token: If given the response is streamed, each piece of content is passed to
+                         on_token as it arrives and the whole content is parsed at the end.
         :return: A tuple (success: bool, response_content: Any).
                  If success is True, response_content is formatted JSON response from the API.
                  If success is False, response_content is formatted JSON with error in answer field.
@@ -143,25 +170,39 @@ class OpenRouter:
         }
         if self._max_tokens is not None:
             payload["max_tokens"] = self._max_tokens
+        if on_token is not None:
+            payload["stream"] = True
+        if self._on_usage is not None:
+            payload["usage"] = {"include": True}
 
         try:
             self._log.debug(
                 f"Sending request to OpenRouter: URL='{self._url}', Model='{self._model_name}', Payload='{json.dumps(payload)}'")
-            response: requests.Response = requests.post(self._url,
-                                                        headers=headers,
-                                                        json=payload,
-                                                        timeout=120)
-            response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
-
-            response_data = response.json()
+            async with self._http_client.stream("POST",
+                                                self._url,
+                                                headers=headers,
+                                                json=payload) as response:
+                response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+
+                if on_token is not None:
+                    response_data: Dict[str, Any] = await self._read_stream(response, on_token)
+                else:
+                    await response.aread()
+                    response_data = response.json()
             self._log.debug(
                 f"Received response from OpenRouter: {json.dumps(response_data)}")
+            if self._on_usage is not None and isinstance(response_data.get("usage"), dict):
+                self._on_usage(response_data["usage"])
 
             if response_data.get("choices") and len(response_data["choices"]) > 0:
                 # Typically, the main content is in the first choice's message
                 message_content = self._clean_json_str(
                     response_data["choices"][0].get("message", {}).get("content"))
-                if message_content:
+                if "error" in message_content:
+                    msg = f"Error, {message_content['error']} in the llm response: {message_content.get('details')}"
+                    self._log.error(msg)
+                    return False, self._missing_response(msg)
+                elif message_content:
                     # Return response as Response JSON object expected by the client
                     return True, message_content
                 else:
@@ -173,16 +214,15 @@ class OpenRouter:
                 self._log.error(msg)
                 return False, self._missing_response(msg)
 
-        except requests.exceptions.HTTPError as http_err:
-            error_content = "Unknown error"
+        except httpx.HTTPStatusError as http_err:
             try:
                 error_content = http_err.response.json()
             except json.JSONDecodeError:
                 error_content = http_err.response.text
-                msg = f"Error, OpenRouter HTTP error: {http_err.response.status_code} - {error_content}"
-                self._log.error(msg)
-                return False, self._missing_response(msg)
-        except requests.exceptions.RequestException as req_err:
+            msg = f"Error, OpenRouter HTTP error: {http_err.response.status_code} - {error_content}"
+            self._log.error(msg)
+            return False, self._missing_response(msg)
+        except httpx.RequestError as req_err:
             msg = f"Error, OpenRouter request exception: {req_err}"
             self._log.error(msg)
             return False, self._missing_response(msg)
@@ -198,4 +238,3 @@ class OpenRouter:
             msg = f"Error, an unexpected error occurred while calling OpenRouter: {str(e)}"
             self._log.exception(msg)
             return False, self._missing_response(msg)
-        return False, self._missing_response("Unknown error occurred in get_llm_response.")
@@ -0,0 +1,189 @@
+import copy
+import json
+import logging
+import math
+import os
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+
+class PromptBudget:
+    """
+    Keeps the MCP responses and clarifications put in a prompt within a token budget for
+    the model in use.
+
+    Tokens are estimated from the length of the serialised text. Repeated responses are
+    dropped (the latest is kept), then older responses are trimmed to their first records
+    and, if that is not enough, replaced by a short summary naming the call so the model
+    can ask for it again. The newest response is only trimmed as a last resort.
+    """
+
+    CHARS_PER_TOKEN: int = 4
+    DEFAULT_TOKEN_BUDGET: int = 24000
+    TRIMMED_RECORDS: int = 10
+
+    class EnvVars(str, Enum):
+        TOKEN_BUDGET = "MCP_PROMPT_TOKEN_BUDGET"
+        MODEL_TOKEN_BUDGETS = "MCP_PROMPT_MODEL_TOKEN_BUDGETS"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class ResponseKeys(str, Enum):
+        RESULTS = "results"
+        SOURCE = "source"
+        RESPONSE = "response"
+        OMITTED = "omitted"
+
+        def __str__(self) -> str:
+            return self.value
+
+    def __init__(self,
+                 default_budget_tokens: int = DEFAULT_TOKEN_BUDGET,
+                 budget_by_model: Optional[Dict[str, int]] = None) -> None:
+        self._log: logging.Logger = logging.getLogger(__name__)
+        self._default_budget_tokens: int = default_budget_tokens
+        self._budget_by_model: Dict[str, int] = dict(budget_by_model or {})
+
+    @classmethod
+    def from_environment(cls) -> "PromptBudget":
+        budget_by_model: Dict[str, int] = {}
+        model_budgets: Optional[str] = os.environ.get(
+            str(cls.EnvVars.MODEL_TOKEN_BUDGETS))
+        if model_budgets:
+            budget_by_model = {model: int(tokens)
+                               for model, tokens in json.loads(model_budgets).items()}
+        return cls(default_budget_tokens=int(os.environ.get(str(cls.EnvVars.TOKEN_BUDGET), cls.DEFAULT_TOKEN_BUDGET)),
+                   budget_by_model=budget_by_model)
+
+    def budget_for(self, model: Optional[str]) -> int:
+        if model is None:
+            return self._default_budget_tokens
+        return self._budget_by_model.get(model, self._default_budget_tokens)
+
+    @classmethod
+    def estimate_tokens(cls, value: Any) -> int:
+        text: str = value if isinstance(value, str) else json.dumps(
+            value, ensure_ascii=False, default=str)
+        return math.ceil(len(text) / cls.CHARS_PER_TOKEN)
+
+    @classmethod
+    def project(cls,
+                mcp_response: Dict[str, Any],
+                fields: Optional[List[str]]) -> Dict[str, Any]:
+        """
+        Keep only the given fields (dotted for nested fields) of each record in the response.
+        """
+        if not fields or not isinstance(mcp_response, dict) or str(cls.ResponseKeys.RESULTS) not in mcp_response:
+            return mcp_response
+        projected: Dict[str, Any] = copy.copy(mcp_response)
+        projected[str(cls.ResponseKeys.RESULTS)] = [
+            {**result, str(cls.ResponseKeys.RESPONSE): [cls._project_record(record, fields)
+                                                       for record in result[str(cls.ResponseKeys.RESPONSE)]]}
+            if isinstance(result, dict) and isinstance(result.get(str(cls.ResponseKeys.RESPONSE)), list) else result
+            for result in mcp_response.get(str(cls.ResponseKeys.RESULTS), [])]
+        return projected
+
+    @staticmethod
+    def _project_record(record: Any,
+                        fields: List[str]) -> Any:
+        if not isinstance(record, dict):
+            return record
+        projected: Dict[str, Any] = {}
+        for field in fields:
+            value: Any = record
+            path: List[str] = field.split(".")
+            for name in path:
+                if not isinstance(value, dict) or name not in value:
+                    break
+                value = value[name]
+            else:
+                target: Dict[str, Any] = projected
+                for name in path[:-1]:
+                    target = target.setdefault(name, {})
+                target[path[-1]] = value
+        return projected
+
+    def compact(self,
+                mcp_responses: List[Dict[str, Any]],
+                clarifications: List[Dict[str, Any]],
+                model: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        The MCP responses to put in the prompt so that they and the clarifications fit the
+        model's budget, oldest first as given.
+        """
+        budget: int = self.budget_for(model)
+        available: int = budget - self.estimate_tokens(clarifications)
+
+        responses: List[Any] = self._drop_duplicates(mcp_responses)
+        costs: List[int] = [self.estimate_tokens(r) for r in responses]
+        if sum(costs) <= available:
+            return responses
+
+        # Older responses give way first, the newest is kept whole for as long as possible.
+        for stage in (self._trim, self._summarise):
+            for i in range(len(responses) - 1):
+                if sum(costs) <= available:
+                    break
+                responses[i] = stage(responses[i])
+                costs[i] = self.estimate_tokens(responses[i])
+        if responses and sum(costs) > available:
+            responses[-1] = self._trim(responses[-1],
+                                       max(0, available - sum(costs[:-1])))
+            costs[-1] = self.estimate_tokens(responses[-1])
+        self._log.info(
+            f"MCP responses compacted to ~{sum(costs)} tokens for a budget of {budget} ({model})")
+        return responses
+
+    def _drop_duplicates(self, mcp_responses: List[Any]) -> List[Any]:
+        seen: set = set()
+        kept: List[Any] = []
+        for mcp_response in reversed(mcp_responses):
+            key: str = json.dumps(mcp_response, sort_keys=True, default=str)
+            if key not in seen:
+                seen.add(key)
+                kept.append(mcp_response)
+        return list(reversed(kept))
+
+    def _trim(self,
+              mcp_response: Any,
+              max_tokens: Optional[int] = None) -> Any:
+        """
+        Keep the first records of each result, as many as fit max_tokens, else TRIMMED_RECORDS.
+        """
+        if not isinstance(mcp_response, dict) or str(self.ResponseKeys.RESULTS) not in mcp_response:
+            return mcp_response
+        keep: int = self.TRIMMED_RECORDS
+        while True:
+            trimmed: Dict[str, Any] = copy.copy(mcp_response)
+            trimmed[str(self.ResponseKeys.RESULTS)] = [self._trim_result(result, keep)
+                                                       for result in mcp_response.get(str(self.ResponseKeys.RESULTS), [])]
+            if max_tokens is None or keep == 0 or self.estimate_tokens(trimmed) <= max_tokens:
+                return trimmed
+            keep //= 2
+
+    def _trim_result(self,
+                     result: Any,
+                     keep: int) -> Any:
+        records: Any = result.get(str(self.ResponseKeys.RESPONSE)) if isinstance(
+            result, dict) else None
+        if not isinstance(records, list) or len(records) <= keep:
+            return result
+        return {**result,
+                str(self.ResponseKeys.RESPONSE): records[:keep],
+                str(self.ResponseKeys.OMITTED): f"{len(records) - keep} of {len(records)} records omitted to fit the prompt, call again if needed"}
+
+    def _summarise(self, mcp_response: Any) -> Any:
+        if not isinstance(mcp_response, dict) or str(self.ResponseKeys.RESULTS) not in mcp_response:
+            return mcp_response
+        sources: List[str] = []
+        records: int = 0
+        for result in mcp_response.get(str(self.ResponseKeys.RESULTS), []):
+            if not isinstance(result, dict):
+                continue
+            if str(self.ResponseKeys.SOURCE) in result:
+                sources.append(str(result[str(self.ResponseKeys.SOURCE)]))
+            if isinstance(result.get(str(self.ResponseKeys.RESPONSE)), list):
+                records += len(result[str(self.ResponseKeys.RESPONSE)])
+        return {str(self.ResponseKeys.RESULTS): [{str(self.ResponseKeys.SOURCE): source} for source in sources] +
+                [{str(self.ResponseKeys.OMITTED): f"Response of {records} records omitted to fit the prompt, call again if needed"}]}
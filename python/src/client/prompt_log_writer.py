@@ -0,0 +1,189 @@
+import gzip
+import logging
+import os
+import queue
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class PromptLogWriter:
+    """
+    Writes prompts to one append-only log per session on a background thread.
+
+    Each prompt is appended as its own gzip member, so the log as a whole is a valid gzip
+    file, and its offset and length are kept in an in-memory index. Reading a session's
+    prompts is a seek to each member rather than a directory scan. The index of a log
+    written before a restart is rebuilt from the file the first time the session is seen.
+
+    Prompts are queued without blocking the caller, when the queue is full a prompt is
+    dropped and logged as such.
+    """
+
+    DEFAULT_QUEUE_SIZE: int = 1000
+    DEFAULT_MAX_INDEXED_SESSIONS: int = 1000
+    LOG_FILE_SUFFIX: str = ".log.gz"
+
+    class EnvVars(str, Enum):
+        QUEUE_SIZE = "MCP_PROMPT_LOG_QUEUE_SIZE"
+
+        def __str__(self) -> str:
+            return self.value
+
+    def __init__(self,
+                 log_folder: Path,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 max_indexed_sessions: int = DEFAULT_MAX_INDEXED_SESSIONS) -> None:
+        self._log: logging.Logger = logging.getLogger(__name__)
+        self._log_folder: Path = Path(log_folder)
+        self._queue: "queue.Queue[Optional[Tuple[uuid.UUID, str]]]" = queue.Queue(
+            maxsize=queue_size)
+        self._lock: threading.Lock = threading.Lock()
+        self._max_indexed_sessions: int = max_indexed_sessions
+        # Session -> (offset, length) of each prompt, in version order, least recently used first.
+        self._index: OrderedDict[uuid.UUID, List[Tuple[int, int]]] = OrderedDict()
+        self._dropped: int = 0
+        self._thread: threading.Thread = threading.Thread(target=self._write_loop,
+                                                          name="PromptLogWriter",
+                                                          daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_environment(cls, log_folder: Path) -> "PromptLogWriter":
+        return cls(log_folder=log_folder,
+                   queue_size=int(os.environ.get(str(cls.EnvVars.QUEUE_SIZE), cls.DEFAULT_QUEUE_SIZE)))
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def _log_file(self, session_id: uuid.UUID) -> Path:
+        return self._log_folder / f"prompt_{str(session_id)}{self.LOG_FILE_SUFFIX}"
+
+    def write(self,
+              session_id: uuid.UUID,
+              prompt: str) -> bool:
+        """
+        Queue the prompt to be logged, False if the queue is full and it was dropped.
+        """
+        try:
+            self._queue.put_nowait((session_id, prompt))
+            return True
+        except queue.Full:
+            self._dropped += 1
+            self._log.warning(
+                f"Prompt log queue full, prompt for session {session_id} not logged ({self._dropped} dropped)")
+            return False
+
+    def flush(self) -> None:
+        """
+        Wait until every queued prompt has been written.
+        """
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+
+    def read(self, session_id: uuid.UUID) -> Dict[str, str]:
+        """
+        The logged prompts of the session by name, prompt_<session>_<version>.txt, in version order.
+        """
+        self.flush()
+        entries: List[Tuple[int, int]] = self._entries(session_id)
+        prompts: Dict[str, str] = {}
+        if not entries:
+            return prompts
+        with open(self._log_file(session_id), "rb") as f:
+            for version, (offset, length) in enumerate(entries, start=1):
+                f.seek(offset)
+                prompts[f"prompt_{str(session_id)}_{version}.txt"] = gzip.decompress(
+                    f.read(length)).decode("utf-8")
+        return prompts
+
+    def _entries(self, session_id: uuid.UUID) -> List[Tuple[int, int]]:
+        with self._lock:
+            entries: Optional[List[Tuple[int, int]]] = self._index.get(
+                session_id)
+            if entries is None:
+                entries = self._scan(self._log_file(session_id))
+            self._set_entries(session_id, entries)
+            return list(entries)
+
+    def _set_entries(self,
+                     session_id: uuid.UUID,
+                     entries: List[Tuple[int, int]]) -> None:
+        self._index[session_id] = entries
+        self._index.move_to_end(session_id)
+        while len(self._index) > self._max_indexed_sessions:
+            self._index.popitem(last=False)
+
+    def _scan(self, log_file: Path) -> List[Tuple[int, int]]:
+        """
+        Offsets and lengths of the gzip members of a log written before this process started.
+        """
+        entries: List[Tuple[int, int]] = []
+        if not log_file.is_file():
+            return entries
+        data: bytes = log_file.read_bytes()
+        offset: int = 0
+        while offset < len(data):
+            decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+            decompressor.decompress(data[offset:])
+            if not decompressor.eof:
+                self._log.warning(
+                    f"Ignoring incomplete prompt at offset {offset} of [{log_file}]")
+                break
+            length: int = len(data) - offset - len(decompressor.unused_data)
+            entries.append((offset, length))
+            offset += length
+        return entries
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: List[Optional[Tuple[uuid.UUID, str]]] = [item]
+            # Write everything queued in one pass, each session's log is opened once.
+            while item is not None:
+                try:
+                    item = self._queue.get_nowait()
+                    batch.append(item)
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch([entry for entry in batch if entry is not None])
+            except Exception as e:  # pylint: disable=broad-except
+                self._log.error(f"Failed to log prompts: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is None:
+                return
+
+    def _write_batch(self, batch: List[Tuple[uuid.UUID, str]]) -> None:
+        by_session: Dict[uuid.UUID, List[str]] = {}
+        for session_id, prompt in batch:
+            by_session.setdefault(session_id, []).append(prompt)
+        self._log_folder.mkdir(parents=True, exist_ok=True)
+        for session_id, prompts in by_session.items():
+            entries: List[Tuple[int, int]] = self._entries(session_id)
+            new_entries: List[Tuple[int, int]] = []
+            with open(self._log_file(session_id), "ab") as f:
+                offset: int = f.tell()
+                for prompt in prompts:
+                    record: str = "=" * 80 + "\n\n" + \
+                        f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')}\n\n" + \
+                        prompt + "\n" + "=" * 80 + "\n\n"
+                    member: bytes = gzip.compress(record.encode("utf-8"))
+                    f.write(member)
+                    new_entries.append((offset, len(member)))
+                    offset += len(member)
+            with self._lock:
+                self._set_entries(session_id, entries + new_entries)
+            self._log.debug(
+                f"Logged prompt versions {len(entries) + 1}-{len(entries) + len(new_entries)} for session {session_id}")
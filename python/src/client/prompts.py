@@ -1,15 +1,16 @@
 import os
 import logging
+import threading
 from tkinter import N
 import uuid
 import json
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Optional, Protocol, List, Any
-from datetime import datetime
+from typing import Dict, Optional, Protocol, List, Any, Tuple
 from flask import session
 from langchain.prompts import PromptTemplate
 from static_data_service import Permissions
+from prompt_log_writer import PromptLogWriter
 import random
 
 from numpy import var
@@ -50,7 +51,8 @@ class Prompts:
 
     def __init__(self,
                  template_root_folder: Optional[Path] = None,
-                 default_prompt_file_name: Optional[str] = None) -> None:
+                 default_prompt_file_name: Optional[str] = None,
+                 prompt_log_writer: Optional[PromptLogWriter] = None) -> None:
 
         self._log: logging.Logger = logging.getLogger(__name__)
         if not logging.getLogger().hasHandlers():
@@ -60,8 +62,9 @@ class Prompts:
                 handlers=[logging.StreamHandler()]
             )
 
-        self._prompt_version_by_session: Dict[uuid.UUID, int] = {}
-        self._prompt_log_folder: Path = Path("prompt_logs")
+        # Prompts are logged off the request path, one compressed log per session.
+        self._prompt_log_writer: PromptLogWriter = prompt_log_writer if prompt_log_writer else PromptLogWriter.from_environment(
+            Path("prompt_logs"))
 
         if template_root_folder:
             self._template_root_folder: Path = Path(template_root_folder)
@@ -75,6 +78,14 @@ class Prompts:
 
         self._prompts: Dict[str, Path] = {}
 
+        # Template files are read once and re-read only when their modification time or
+        # size changes, compiled templates are kept by template text and variable names.
+        self._cache_lock: threading.Lock = threading.Lock()
+        self._file_cache: Dict[Path, Tuple[int, int, str]] = {}
+        self._compiled_templates: Dict[Tuple[str, Tuple[str, ...]], PromptTemplate] = {}
+        # The serialised server descriptions, kept while the capability catalogue is unchanged.
+        self._server_descriptions_json: Optional[Tuple[Any, str]] = None
+
         # If default_prompt_file_name is given, use it as the default prompt if the file exists
         proposed_default_prompt_file_name: Path
         if default_prompt_file_name:
@@ -98,14 +109,65 @@ class Prompts:
             template=prompt_template_as_text
         )
 
+    def _read_template_file(self,
+                            file_name: Path) -> str:
+        stat: os.stat_result = file_name.stat()
+        with self._cache_lock:
+            cached: Optional[Tuple[int, int, str]] = self._file_cache.get(
+                file_name)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        with open(file_name, "r", encoding="utf-8") as f:
+            text: str = f.read()
+        with self._cache_lock:
+            self._file_cache[file_name] = (
+                stat.st_mtime_ns, stat.st_size, text)
+        self._log.debug(f"Loaded prompt template file [{file_name}]")
+        return text
+
+    def _compiled_prompt_template(self,
+                                  prompt_template_as_text: str,
+                                  variable_names: List[str]) -> PromptTemplate:
+        key: Tuple[str, Tuple[str, ...]] = (
+            prompt_template_as_text, tuple(sorted(variable_names)))
+        prompt_template: Optional[PromptTemplate] = self._compiled_templates.get(
+            key)
+        if prompt_template is None:
+            prompt_template = self._make_default_prompt_template(prompt_template_as_text,
+                                                                 variable_names=variable_names)
+            with self._cache_lock:
+                # Templates compiled from earlier versions of a file are never used again, keep the cache bounded.
+                if len(self._compiled_templates) >= 32:
+                    self._compiled_templates.clear()
+                self._compiled_templates[key] = prompt_template
+        return prompt_template
+
+    def _server_descriptions_as_json(self,
+                                     mcp_server_descriptions: Dict[str, Any],
+                                     mcp_server_descriptions_version: Optional[int]) -> str:
+        """
+        The descriptions as JSON, serialised again only when the catalogue version or the set
+        of servers changes.
+        """
+        if mcp_server_descriptions_version is None:
+            return json.dumps(mcp_server_descriptions, ensure_ascii=False)
+        key: Tuple[int, Tuple[str, ...]] = (mcp_server_descriptions_version,
+                                            tuple(mcp_server_descriptions.keys()))
+        cached: Optional[Tuple[Any, str]] = self._server_descriptions_json
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        descriptions_json: str = json.dumps(
+            mcp_server_descriptions, ensure_ascii=False)
+        self._server_descriptions_json = (key, descriptions_json)
+        return descriptions_json
+
     def _load_prompt_fragment(self,
                               fragment_file: Path) -> str:
         try:
             if not fragment_file.is_file():
                 raise ValueError(
                     f"Server definition file '{str(fragment_file)}' does not exist.")
-            with open(fragment_file, "r", encoding="utf-8") as f:
-                return f.read()
+            return self._read_template_file(fragment_file)
         except FileNotFoundError as fne:
             raise ValueError(
                 f"Server definition file not found.") from fne
@@ -179,8 +241,7 @@ class Prompts:
                 raise ValueError(
                     f"Prompt file '{str(self._prompts[prompt_name])}' does not exist.")
             file_name: Path = self._prompts[prompt_name]
-            with open(file_name, "r", encoding="utf-8") as f:
-                return f.read()
+            return self._read_template_file(file_name)
         except FileNotFoundError as fne:
             raise ValueError(
                 f"Prompt template file not found.") from fne
@@ -210,7 +271,7 @@ class Prompts:
             variables["staff_id"] = staff_id
 
             if makePromptTemplate is None:
-                makePromptTemplate = self._make_default_prompt_template  # type: ignore
+                makePromptTemplate = self._compiled_prompt_template  # type: ignore
 
             if loadTemplateFragments is None:
                 loadTemplateFragments = self._load_default_fragments
@@ -229,43 +290,19 @@ class Prompts:
             raise ValueError(f"Error formatting prompt: {str(e)}"
                              )
 
-    def extract_version(self,
-                        prompt_log_file_name: Path) -> int:
-        try:
-            return int(str(prompt_log_file_name).split("_")[-1].split(".")[0])
-        except Exception:
-            return 0
-
     def get_prompts_by_session_id(self,
                                   session_id: uuid.UUID) -> Dict[str, str]:
         try:
-            session_files = list(Path(self._prompt_log_folder).glob(
-                f"prompt_{str(session_id)}_*.txt"))
-            session_files.sort(key=self.extract_version)
-            return {str(f): f.read_text(encoding="utf-8") for f in session_files if f.is_file()}
+            return self._prompt_log_writer.read(session_id)
         except Exception as e:
-            self._log.error(f"Failed to log prompt: {str(e)}")
+            self._log.error(f"Failed to read logged prompts: {str(e)}")
             return {}
 
     def _log_prompt(self,
                     session_id: uuid.UUID,
                     prompt: str) -> None:
-        try:
-            prompt_version: int = self._prompt_version_by_session.get(
-                session_id, 0) + 1
-            self._prompt_version_by_session[session_id] = prompt_version
-            self._log.info(
-                f"Logging prompt version {prompt_version} for session {session_id}")
-
-            prompt_log_file_name: Path = Path(
-                self._prompt_log_folder) / f"prompt_{str(session_id)}_{prompt_version}.txt"
-            with open(prompt_log_file_name, "a", encoding="utf-8") as f:
-                f.write("=" * 80 + "\n\n")
-                f.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')}\n\n")
-                f.write(prompt + "\n")
-                f.write("=" * 80 + "\n\n")
-        except Exception as e:
-            self._log.error(f"Failed to log prompt: {str(e)}")
+        if self._prompt_log_writer.write(session_id=session_id, prompt=prompt):
+            self._log.info(f"Logging prompt for session {session_id}")
 
     def build_prompt(self,
                      user_goal: str,
@@ -274,8 +311,14 @@ class Prompts:
                      staff_id: str,
                      mcp_server_descriptions: Dict[str, Any],
                      mcp_responses: List[Dict[str, Any]],
-                     clarifications: List[Dict[str, Any]]
+                     clarifications: List[Dict[str, Any]],
+                     mcp_server_descriptions_version: Optional[int] = None
                      ) -> Optional[str]:
+        """
+        Form the prompt for the session. If mcp_server_descriptions_version is given (the
+        capability catalogue version) the serialised descriptions are reused while it is
+        unchanged.
+        """
         try:
             prompt: str = self.get_prompt(
                 goal=user_goal,
@@ -283,7 +326,8 @@ class Prompts:
                 staff_id=staff_id,
                 session_id=str(session_id),
                 variables={
-                    "mcp_server_descriptions": json.dumps(mcp_server_descriptions, ensure_ascii=False),
+                    "mcp_server_descriptions": self._server_descriptions_as_json(mcp_server_descriptions,
+                                                                                 mcp_server_descriptions_version),
                     "mcp_server_responses": json.dumps(mcp_responses, ensure_ascii=False),
                     "clarification_responses": json.dumps(clarifications, ensure_ascii=False)
                 }
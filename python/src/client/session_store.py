@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class SessionStore:
+    """
+    Per LLM session state, held in named namespaces of keyed values (e.g. the session's MCP
+    responses and its clarifications), with the memory used by each session accounted for.
+
+    Sessions idle for longer than the TTL are evicted, as are the least recently used
+    sessions once there are more than the maximum or they take more than the byte bound.
+    If a spill directory is given an evicted session is written there as JSON and loaded
+    back if the session is used again, spilled sessions not used again are deleted after
+    the spill TTL.
+    """
+
+    DEFAULT_MAX_SESSIONS: int = 1000
+    DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+    DEFAULT_IDLE_TTL_SECONDS: float = 3600.0
+    DEFAULT_SPILL_TTL_SECONDS: float = 24 * 3600.0
+    SPILL_FILE_SUFFIX: str = ".session.json"
+
+    class EnvVars(str, Enum):
+        MAX_SESSIONS = "MCP_SESSION_STORE_MAX_SESSIONS"
+        MAX_BYTES = "MCP_SESSION_STORE_MAX_BYTES"
+        IDLE_TTL = "MCP_SESSION_STORE_IDLE_TTL"
+        SPILL_DIR = "MCP_SESSION_STORE_SPILL_DIR"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class _Session:
+        def __init__(self) -> None:
+            self.namespaces: Dict[str, Dict[str, Any]] = {}
+            self.sizes: Dict[str, Dict[str, int]] = {}
+            self.bytes: int = 0
+            self.last_used: float = time.monotonic()
+
+    def __init__(self,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 idle_ttl_seconds: float = DEFAULT_IDLE_TTL_SECONDS,
+                 spill_dir: Optional[Path] = None,
+                 spill_ttl_seconds: float = DEFAULT_SPILL_TTL_SECONDS) -> None:
+        self._log: logging.Logger = logging.getLogger(__name__)
+        self._max_sessions: int = max_sessions
+        self._max_bytes: int = max_bytes
+        self._idle_ttl_seconds: float = idle_ttl_seconds
+        self._spill_dir: Optional[Path] = Path(spill_dir) if spill_dir else None
+        self._spill_ttl_seconds: float = spill_ttl_seconds
+        self._lock: threading.RLock = threading.RLock()
+        # Least recently used first.
+        self._sessions: OrderedDict[uuid.UUID, SessionStore._Session] = OrderedDict()
+        self._bytes: int = 0
+        self._evictions: int = 0
+        self._spilled: int = 0
+        self._restored: int = 0
+        self._last_spill_sweep: float = 0.0
+
+    @classmethod
+    def from_environment(cls) -> "SessionStore":
+        spill_dir: Optional[str] = os.environ.get(str(cls.EnvVars.SPILL_DIR))
+        return cls(max_sessions=int(os.environ.get(str(cls.EnvVars.MAX_SESSIONS), cls.DEFAULT_MAX_SESSIONS)),
+                   max_bytes=int(os.environ.get(str(cls.EnvVars.MAX_BYTES), cls.DEFAULT_MAX_BYTES)),
+                   idle_ttl_seconds=float(os.environ.get(str(cls.EnvVars.IDLE_TTL), cls.DEFAULT_IDLE_TTL_SECONDS)),
+                   spill_dir=Path(spill_dir) if spill_dir else None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: uuid.UUID) -> bool:
+        return session_id in self._sessions
+
+    def get(self,
+            session_id: uuid.UUID,
+            namespace: str,
+            key: str) -> Optional[Any]:
+        with self._lock:
+            session: Optional[SessionStore._Session] = self._session(session_id, create=False)
+            if session is None:
+                return None
+            return session.namespaces.get(namespace, {}).get(key)
+
+    def values(self,
+               session_id: uuid.UUID,
+               namespace: str) -> List[Any]:
+        """
+        The values in the namespace of the session, in the order they were first put.
+        """
+        with self._lock:
+            session: Optional[SessionStore._Session] = self._session(session_id, create=False)
+            if session is None:
+                return []
+            return list(session.namespaces.get(namespace, {}).values())
+
+    def put(self,
+            session_id: uuid.UUID,
+            namespace: str,
+            key: str,
+            value: Any) -> None:
+        size: int = len(json.dumps(value, default=str).encode("utf-8"))
+        with self._lock:
+            session: SessionStore._Session = self._session(session_id, create=True)  # type: ignore[assignment]
+            sizes: Dict[str, int] = session.sizes.setdefault(namespace, {})
+            change: int = size - sizes.get(key, 0)
+            session.namespaces.setdefault(namespace, {})[key] = value
+            sizes[key] = size
+            session.bytes += change
+            self._bytes += change
+            self._evict(keep=session_id)
+
+    def remove(self, session_id: uuid.UUID) -> None:
+        with self._lock:
+            session: Optional[SessionStore._Session] = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._bytes -= session.bytes
+        if self._spill_dir is not None:
+            self._spill_file(session_id).unlink(missing_ok=True)
+
+    def session_bytes(self, session_id: uuid.UUID) -> int:
+        session: Optional[SessionStore._Session] = self._sessions.get(session_id)
+        return session.bytes if session is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"sessions": len(self._sessions),
+                    "bytes": self._bytes,
+                    "max_sessions": self._max_sessions,
+                    "max_bytes": self._max_bytes,
+                    "evictions": self._evictions,
+                    "spilled": self._spilled,
+                    "restored": self._restored}
+
+    def _session(self,
+                 session_id: uuid.UUID,
+                 create: bool) -> Optional["SessionStore._Session"]:
+        self._evict()
+        session: Optional[SessionStore._Session] = self._sessions.get(session_id)
+        if session is None:
+            session = self._restore(session_id)
+            if session is None and not create:
+                return None
+            if session is None:
+                session = SessionStore._Session()
+            self._sessions[session_id] = session
+            self._bytes += session.bytes
+        session.last_used = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _evict(self, keep: Optional[uuid.UUID] = None) -> None:
+        """
+        Evict idle sessions, then least recently used sessions while over the bounds. The
+        session being updated is kept even if it alone is over the byte bound.
+        """
+        idle_before: float = time.monotonic() - self._idle_ttl_seconds
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session_id == keep:
+                break
+            if session.last_used > idle_before and \
+                    len(self._sessions) <= self._max_sessions and self._bytes <= self._max_bytes:
+                break
+            self._sessions.pop(session_id)
+            self._bytes -= session.bytes
+            self._evictions += 1
+            self._log.debug(
+                f"Evicted session {session_id} of {session.bytes} bytes")
+            self._spill(session_id, session)
+
+    def _spill_file(self, session_id: uuid.UUID) -> Path:
+        return self._spill_dir / f"{str(session_id)}{self.SPILL_FILE_SUFFIX}"  # type: ignore[operator]
+
+    def _spill(self,
+               session_id: uuid.UUID,
+               session: "SessionStore._Session") -> None:
+        if self._spill_dir is None:
+            return
+        try:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+            spill_file: Path = self._spill_file(session_id)
+            tmp_file: Path = spill_file.with_suffix(f".tmp{os.getpid()}")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(session.namespaces, f, default=str)
+            os.replace(tmp_file, spill_file)
+            self._spilled += 1
+        except Exception as e:  # pylint: disable=broad-except
+            self._log.warning(
+                f"Unable to spill session {session_id} to [{self._spill_dir}]: {str(e)}")
+        self._sweep_spill()
+
+    def _sweep_spill(self) -> None:
+        """
+        Delete spilled sessions not used within the spill TTL, at most once per idle TTL.
+        """
+        now: float = time.monotonic()
+        if now - self._last_spill_sweep < self._idle_ttl_seconds:
+            return
+        self._last_spill_sweep = now
+        expired_before: float = time.time() - self._spill_ttl_seconds
+        for spill_file in self._spill_dir.glob(f"*{self.SPILL_FILE_SUFFIX}"):  # type: ignore[union-attr]
+            try:
+                if spill_file.stat().st_mtime < expired_before:
+                    spill_file.unlink()
+            except OSError:
+                pass
+
+    def _restore(self, session_id: uuid.UUID) -> Optional["SessionStore._Session"]:
+        if self._spill_dir is None:
+            return None
+        spill_file: Path = self._spill_file(session_id)
+        if not spill_file.is_file():
+            return None
+        try:
+            with open(spill_file, "r", encoding="utf-8") as f:
+                namespaces: Dict[str, Dict[str, Any]] = json.load(f)
+            spill_file.unlink(missing_ok=True)
+        except Exception as e:  # pylint: disable=broad-except
+            self._log.warning(
+                f"Ignoring unreadable spilled session [{spill_file}]: {str(e)}")
+            return None
+        session: SessionStore._Session = SessionStore._Session()
+        for namespace, values in namespaces.items():
+            session.namespaces[namespace] = values
+            session.sizes[namespace] = {key: len(json.dumps(value, default=str).encode("utf-8"))
+                                        for key, value in values.items()}
+            session.bytes += sum(session.sizes[namespace].values())
+        self._restored += 1
+        self._log.debug(f"Restored spilled session {session_id}")
+        return session
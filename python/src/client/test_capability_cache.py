@@ -0,0 +1,52 @@
+import logging
+import time
+from pathlib import Path
+from capability_cache import CapabilityCache
+
+# Configure logging for tests
+logger = logging.getLogger("CapabilityCacheTest")
+logging.basicConfig(level=logging.DEBUG)
+
+URL = "http://localhost:6277"
+
+
+def test_ttl_and_invalidate():
+    """
+    Tests entries expire after their TTL, a per server TTL overrides the default and invalidate marks stale.
+    """
+    cache = CapabilityCache(ttl_seconds=60, ttl_by_url={"http://other": 0.05})
+    cache.put(URL, {"tools": []})
+    cache.put("http://other", {"tools": []})
+    assert cache.is_fresh(URL)
+    time.sleep(0.1)
+    assert cache.stale_urls([URL, "http://other"]) == ["http://other"]
+
+    cache.invalidate(URL)
+    assert not cache.is_fresh(URL)
+    assert cache.get(URL) == {"tools": []}
+
+
+def test_version_changes_only_with_content():
+    """
+    Tests re-putting the same capabilities refreshes the entry without bumping the version.
+    """
+    cache = CapabilityCache()
+    cache.put(URL, {"tools": ["a"]})
+    version = cache.version
+    cache.put(URL, {"tools": ["a"]})
+    assert cache.version == version
+    cache.put(URL, {"tools": ["a", "b"]})
+    assert cache.version == version + 1
+
+
+def test_persisted_for_warm_start(tmp_path: Path):
+    """
+    Tests a new cache loads the catalogue from disk, keeping the fetch time so expired entries are stale.
+    """
+    cache_file = tmp_path / "capabilities.json"
+    CapabilityCache(ttl_seconds=0.05, cache_file=cache_file).put(URL, {"tools": ["a"]})
+
+    warm = CapabilityCache(ttl_seconds=0.05, cache_file=cache_file)
+    assert warm.get(URL) == {"tools": ["a"]}
+    time.sleep(0.1)
+    assert not warm.is_fresh(URL)
@@ -0,0 +1,68 @@
+import asyncio
+import httpx
+from llm_http_client import LLMHttpClient
+from ollama_utils import Ollama
+
+
+def _client(handler, **kwargs) -> LLMHttpClient:
+    return LLMHttpClient(transport=httpx.MockTransport(handler), backoff_seconds=0.01, **kwargs)
+
+
+def test_throttled_and_failed_requests_are_retried():
+    """
+    Tests 429/5xx responses and connection errors are retried and other errors are not.
+    """
+    attempts = []
+
+    def handler(request):
+        attempts.append(request.url.path)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        if len(attempts) == 2:
+            return httpx.Response(429, headers={"retry-after": "0"})
+        if request.url.path == "/bad":
+            return httpx.Response(400, json={"error": "bad request"})
+        return httpx.Response(200, json={"ok": True})
+
+    async def calls():
+        client = _client(handler)
+        ok = await client.post("http://llm/ok", json={})
+        bad = await client.post("http://llm/bad", json={})
+        await client.aclose()
+        return ok, bad
+
+    ok, bad = asyncio.run(calls())
+    assert ok.json() == {"ok": True}
+    assert bad.status_code == 400 and bad.json() == {"error": "bad request"}
+    assert attempts == ["/ok", "/ok", "/ok", "/bad"]
+
+
+def test_retries_are_bounded():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        return httpx.Response(503, text="overloaded")
+
+    response = asyncio.run(_client(handler, max_retries=2).post("http://llm/", json={}))
+    assert response.status_code == 503 and response.text == "overloaded"
+    assert len(attempts) == 3
+
+
+def test_ollama_streams_tokens_over_the_pooled_client():
+    lines = ['{"message": {"content": "{\\"a\\""}, "done": false}',
+             '{"message": {"content": ": 1}"}, "done": true}']
+
+    def handler(request):
+        return httpx.Response(200, content="\n".join(lines).encode("utf-8"))
+
+    tokens = []
+    ollama = Ollama(http_client=_client(handler))
+    streamed = asyncio.run(ollama.get_llm_response(prompt="p", model="m", host="http://ollama",
+                                                   temperature=0.3, on_token=tokens.append))
+    assert streamed == (True, {"a": 1})
+    assert tokens == ['{"a"', ': 1}']
+
+    failing = Ollama(http_client=_client(lambda request: httpx.Response(404, text="no model"), max_retries=0))
+    success, error = asyncio.run(failing.get_llm_response(prompt="p", model="m", host="http://ollama", temperature=0.3))
+    assert not success and "404" in error["error"]
@@ -0,0 +1,32 @@
+from llm_json_extractor import LLMJSONExtractor
+
+
+def test_fenced_json_keeps_string_content():
+    """
+    Tests quotes and raw newlines inside strings survive extraction from a fenced block.
+    """
+    text = '```json\n{"answer": {"body": "It\'s done\nin two lines", "confidence": "0.9"}}\n```'
+    assert LLMJSONExtractor().extract(text) == {
+        "answer": {"body": "It's done\nin two lines", "confidence": "0.9"}}
+
+
+def test_response_is_found_in_noisy_text():
+    extractor = LLMJSONExtractor()
+    text = ('Sure, the empty set is {} and here is the response:\n'
+            '{"mcp_server_calls": [{"mcp_server_name": "S", "mcp_capability": "tools", '
+            '"mcp_capability_name": "t", "parameters": {"a": 1}}]} hope that helps')
+    response = extractor.extract(text)
+    assert response["mcp_server_calls"][0]["parameters"] == {"a": 1}
+    assert extractor.extract('prefix {"status": "ok"}') == {"status": "ok"}
+
+
+def test_failures_are_structured_errors():
+    extractor = LLMJSONExtractor()
+    invalid = extractor.extract('```json\n{"answer": {"body": "cut short"\n```')
+    assert invalid["error"] == str(LLMJSONExtractor.Errors.INVALID_JSON)
+    assert "line" in invalid["details"]
+    assert extractor.extract("")["error"] == str(LLMJSONExtractor.Errors.INVALID_JSON)
+
+    wrong_structure = extractor.extract('{"mcp_server_calls": {"mcp_server_name": "S"}}')
+    assert wrong_structure["error"] == str(LLMJSONExtractor.Errors.INVALID_STRUCTURE)
+    assert "mcp_server_calls" in wrong_structure["details"]
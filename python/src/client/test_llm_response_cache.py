@@ -0,0 +1,31 @@
+import os
+import time
+from llm_response_cache import LLMResponseCache
+
+
+def test_key_ignores_session_ids_and_whitespace():
+    prompt = "Goal >> x <<\nResponses linked to session 0b7a8c6e-1f2d-4e3a-9b8c-7d6e5f4a3b2c.\n"
+    replayed = "Goal >> x <<  \n\nResponses linked to session 9F3E2D1C-0B9A-4877-8665-544332211000."
+    assert LLMResponseCache.key("m", 0.3, prompt) == LLMResponseCache.key("m", 0.3, replayed)
+    assert LLMResponseCache.key("m", 0.3, prompt) != LLMResponseCache.key("m", 0.7, prompt)
+    assert LLMResponseCache.key("m", 0.3, prompt) != LLMResponseCache.key("other", 0.3, prompt)
+    assert LLMResponseCache.key("m", 0.3, prompt) != LLMResponseCache.key("m", 0.3, "Goal >> y <<")
+
+
+def test_responses_persist_and_least_recently_used_are_evicted(tmp_path):
+    cache = LLMResponseCache(cache_dir=tmp_path, max_bytes=60)
+    cache.put("a", {"answer": "a" * 10})
+    cache.put("b", {"answer": "b" * 10})
+    assert cache.get("a") == {"answer": "a" * 10}  # b is now least recently used.
+    cache.put("c", {"answer": "c" * 10})
+    assert cache.get("b") is None
+    assert cache.stats()["bytes"] <= 60
+    assert len(list(tmp_path.glob(f"*{LLMResponseCache.FILE_SUFFIX}"))) == 2
+
+    # A restarted cache keeps the responses and their order of use.
+    os.utime(tmp_path / f"c{LLMResponseCache.FILE_SUFFIX}", (time.time() - 60, time.time() - 60))
+    restarted = LLMResponseCache(cache_dir=tmp_path, max_bytes=60)
+    assert len(restarted) == 2
+    restarted.put("d", {"answer": "d" * 10})
+    assert restarted.get("c") is None
+    assert restarted.get("a") == {"answer": "a" * 10}
@@ -0,0 +1,99 @@
+import asyncio
+from llm_router import LLMRouter
+
+
+def _provider(latency, success=True, calls=None):
+    async def call(prompt, on_token):
+        if calls is not None:
+            calls.append(prompt)
+        await asyncio.sleep(latency)
+        if isinstance(success, Exception):
+            raise success
+        return success, {"answer": prompt} if success else {"error": "failed"}
+    return call
+
+
+def test_fastest_healthy_provider_is_preferred():
+    """
+    Tests calls go to the provider with the lowest rolling latency once both are measured.
+    """
+    router = LLMRouter(hedge_percentile=0)
+    slow_calls, fast_calls = [], []
+    router.add_provider("slow", _provider(0.05, calls=slow_calls), model="slow-model", temperature=0.3)
+    router.add_provider("fast", _provider(0.01, calls=fast_calls), model="fast-model", temperature=0.1)
+
+    async def calls():
+        return [await router.get_llm_response(f"p{i}") for i in range(4)]
+
+    results = asyncio.run(calls())
+    assert all(success for success, _, _ in results)
+    assert slow_calls == ["p0"] and fast_calls == ["p1", "p2", "p3"]
+    assert router.metrics()["preferred"] == "fast"
+    assert router.preferred() == {"provider": "fast", "model": "fast-model", "temperature": 0.1}
+    assert results[-1][2] == router.preferred()
+
+
+def test_errors_fail_over_and_take_the_provider_out_of_rotation():
+    router = LLMRouter(hedge_percentile=0, max_consecutive_failures=2, cool_down_seconds=60)
+    broken_calls = []
+    router.add_provider("broken", _provider(0, success=RuntimeError("down"), calls=broken_calls))
+    router.add_provider("working", _provider(0.01))
+
+    async def calls():
+        return [await router.get_llm_response(f"p{i}") for i in range(4)]
+
+    results = asyncio.run(calls())
+    assert [(success, response) for success, response, _ in results] == [(True, {"answer": f"p{i}"})
+                                                                          for i in range(4)]
+    assert all(answered["provider"] == "working" for _, _, answered in results)
+    # Unmeasured providers are tried first, the broken one fails twice and cools down.
+    assert len(broken_calls) == 2
+    metrics = router.metrics()["providers"]
+    assert metrics["broken"]["healthy"] is False and metrics["broken"]["failures"] == 2
+    assert metrics["working"]["failovers"] == 2
+
+
+def test_slow_calls_are_hedged():
+    router = LLMRouter(hedge_percentile=0.95, min_samples=2)
+    router.add_provider("primary", _provider(0.01))
+    router.add_provider("backup", _provider(0.02))
+
+    async def calls():
+        for i in range(3):
+            await router.get_llm_response(f"warm{i}")
+        # The primary becomes much slower than its p95, the backup answers first.
+        router._providers[0].call = _provider(1.0)
+        return await router.get_llm_response("hedged")
+
+    assert asyncio.run(calls())[:2] == (True, {"answer": "hedged"})
+    metrics = router.metrics()["providers"]
+    assert metrics["backup"]["hedges"] == 1 and metrics["backup"]["hedge_wins"] == 1
+
+    assert asyncio.run(LLMRouter().get_llm_response("p"))[0] is False
+
+
+def test_streamed_calls_do_not_fail_over_after_relaying_tokens():
+    """
+    Tests a stream failing part way is not continued by the next provider, a stream failing
+    before its first token is.
+    """
+    async def broken_stream(prompt, on_token):
+        on_token("partial ")
+        raise RuntimeError("stream dropped")
+
+    async def failed_to_start(prompt, on_token):
+        raise RuntimeError("refused")
+
+    async def working_stream(prompt, on_token):
+        on_token("whole answer")
+        return True, {"answer": prompt}
+
+    for first, expected_tokens, expected_success in ((broken_stream, ["partial "], False),
+                                                     (failed_to_start, ["whole answer"], True)):
+        router = LLMRouter(hedge_percentile=0)
+        router.add_provider("first", first)
+        router.add_provider("second", working_stream)
+        tokens = []
+        success, _, _ = asyncio.run(router.get_llm_response("p", on_token=tokens.append))
+        assert success is expected_success
+        assert tokens == expected_tokens
@@ -0,0 +1,58 @@
+import json
+import uuid
+from pathlib import Path
+from mcp_call_memo import MCPCallMemo
+
+
+def test_call_key_is_canonical():
+    """
+    Tests the key ignores key order and unrelated fields but not parameter values.
+    """
+    call = {"mcp_server_name": "S", "mcp_capability": "tools", "mcp_capability_name": "t",
+            "parameters": {"a": 1, "b": [1, 2]}}
+    reordered = {"parameters": {"b": [1, 2], "a": 1}, "mcp_capability_name": "t",
+                 "mcp_capability": "tools", "mcp_server_name": "S", "reason": "again"}
+    assert MCPCallMemo.call_key(call) == MCPCallMemo.call_key(reordered)
+    assert MCPCallMemo.call_key(call) != MCPCallMemo.call_key({**call, "parameters": {"a": 2, "b": [1, 2]}})
+
+
+def test_keyed_responses_are_not_duplicated():
+    memo = MCPCallMemo()
+    session = uuid.uuid4()
+    memo.add(session, {"r": 1}, key="k")
+    memo.add(session, {"r": 1}, key="k")
+    memo.add(session, {"r": 2})
+    memo.add(session, {"r": 2})
+    assert memo.get(session, "k") == {"r": 1}
+    assert memo.responses(session) == [{"r": 1}, {"r": 2}, {"r": 2}]
+    assert memo.responses(uuid.uuid4()) == []
+    assert MCPCallMemo.is_memoizable({"readOnlyHint": True, "idempotentHint": None})
+    assert not MCPCallMemo.is_memoizable({"readOnlyHint": False, "destructiveHint": True})
+    assert not MCPCallMemo.is_memoizable(None)
+    assert not MCPCallMemo.is_memoizable({"readOnlyHint": False, "idempotentHint": True})
+
+
+def test_failed_responses_are_errors():
+    assert MCPCallMemo.is_error({"error": "no such server"})
+    assert MCPCallMemo.is_error({"results": [{"source": "s"}, {"error": "failed", "details": "x"}]})
+    assert MCPCallMemo.is_error({"results": [{"source": "s"}, {"response": [{"error": "tool raised"}]}]})
+    assert not MCPCallMemo.is_error({"results": [{"source": "s"}, {"response": [{"key": "a"}]}]})
+
+
+def test_only_read_only_tools_are_prefetched():
+    assert MCPCallMemo.is_read_only({"readOnlyHint": True})
+    assert not MCPCallMemo.is_read_only({"readOnlyHint": False, "idempotentHint": True})
+    assert not MCPCallMemo.is_read_only(None)
+    assert not MCPCallMemo.is_read_only({"readOnlyHint": True, "destructiveHint": True})
+
+
+def test_tools_with_side_effects_are_not_prefetched():
+    """
+    Tests the tools that post messages or store documents, as configured, are never run ahead.
+    """
+    config_dir = Path(__file__).resolve().parents[3] / "config"
+    for config_file, write_tool, read_tool in (("message_server_config.json", "post_message", "get_message_channels"),
+                                               ("vector_db_server_config.json", "put_doc", "get_related_docs")):
+        tools = json.loads((config_dir / config_file).read_text())["tools"]
+        assert not MCPCallMemo.is_read_only(tools[write_tool]["annotations"])
+        assert MCPCallMemo.is_read_only(tools[read_tool]["annotations"])
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+import mcp.types as types
+from capability_cache import CapabilityCache
+from mcp_response_cache import MCPResponseCache
+from mcp_client import MCPClient
+
+# Configure logging for tests
+logger = logging.getLogger("MCPClientTest")
+logging.basicConfig(level=logging.DEBUG)
+
+
+def test_server_capabilities(mcp_server_url):
+    """
+    Tests discovery returns the server detail and the tools of a server.
+    """
+    async def discover():
+        async with MCPClient(server_base_urls=[mcp_server_url]) as client:
+            return await client.get_server_capabilities(mcp_server_url)
+
+    capabilities = asyncio.run(discover())
+    detail = capabilities[str(MCPClient.MCPServerCapabilities.SERVER_DETAIL)]
+    assert detail[str(MCPClient.MCPServerDetail.NAME)] == "TestServer"
+    assert detail[str(MCPClient.MCPServerDetail.SERVER_URL)] == mcp_server_url
+    tool_names = {tool["name"] for tool in capabilities[str(MCPClient.MCPServerCapabilities.TOOLS)]}
+    assert {"echo", "slow", "lookup", "count"} <= tool_names
+
+
+def test_slow_and_unreachable_servers_are_skipped(mcp_server_url, silent_server_url):
+    """
+    Tests a server that never responds and one that is down do not hold back or fail discovery of the others.
+    """
+    async def discover():
+        async with MCPClient(server_base_urls=[silent_server_url, "http://127.0.0.1:9", mcp_server_url],
+                             discovery_timeout_seconds=0.5) as client:
+            return await client.get_details_of_all_servers()
+
+    start = time.monotonic()
+    details = asyncio.run(discover())
+    elapsed = time.monotonic() - start
+    logger.info(f"Discovery took {elapsed:.3f}s")
+    assert list(details) == ["TestServer"]
+    assert elapsed < 3
+
+
+def test_execute_tool(mcp_server_url):
+    """
+    Tests a tool call through the session pool returns the parsed tool response.
+    """
+    async def call():
+        async with MCPClient(server_base_urls=[mcp_server_url]) as client:
+            return await client.execute_tool(server_name="TestServer", tool_name="lookup", arguments={"key": "hello"})
+
+    result = asyncio.run(call())
+    responses = [r for r in result["results"] if "response" in r]
+    assert responses == [{"response": [{"key": "hello"}]}]
+
+
+def test_stale_capabilities_are_served_and_refreshed(mcp_server_url):
+    """
+    Tests stale cached capabilities are returned at once and refreshed in the background.
+    """
+    cache = CapabilityCache(ttl_seconds=60)
+    stale = {"server_detail": {"name": "TestServer", "server_url": mcp_server_url}, "tools": []}
+    cache.put(mcp_server_url, stale)
+    cache.invalidate(mcp_server_url)
+
+    async def discover():
+        async with MCPClient(server_base_urls=[mcp_server_url], capability_cache=cache) as client:
+            first = await client.get_server_capabilities(mcp_server_url)
+            await asyncio.gather(*client._refresh_tasks.values())
+            return first, await client.get_server_capabilities(mcp_server_url)
+
+    first, second = asyncio.run(discover())
+    assert first is stale
+    assert second["tools"]
+    assert cache.is_fresh(mcp_server_url)
+
+
+def test_list_changed_notification_invalidates(mcp_server_url):
+    """
+    Tests a tools list_changed notification marks the server's capabilities stale.
+    """
+    cache = CapabilityCache(ttl_seconds=60)
+    cache.put(mcp_server_url, {"tools": []})
+    client = MCPClient(server_base_urls=[mcp_server_url], capability_cache=cache)
+    handler = client._capability_change_handler(client.get_full_server_url(mcp_server_url))
+
+    async def notify():
+        client._schedule_refresh = lambda url: None
+        await handler(types.ServerNotification(types.ToolListChangedNotification(method="notifications/tools/list_changed")))
+
+    asyncio.run(notify())
+    assert not cache.is_fresh(mcp_server_url)
+
+
+def test_read_only_idempotent_tool_responses_are_cached(mcp_server_url):
+    """
+    Tests only read only, idempotent tools the server opted in with a TTL are answered from the shared
+    response cache.
+    """
+    async def calls():
+        async with MCPClient(server_base_urls=[mcp_server_url], capability_cache=CapabilityCache(),
+                             response_cache=MCPResponseCache()) as client:
+            capabilities = await client.get_server_capabilities(mcp_server_url)
+            results = [await client.execute_tool(server_name="TestServer", tool_name=name, arguments={})
+                       for name in ("reference_count", "reference_count", "count", "count",
+                                    "uncached_count", "uncached_count")]
+            return capabilities, results, client.response_cache.stats()
+
+    capabilities, results, stats = asyncio.run(calls())
+    tools = {tool["name"]: tool for tool in capabilities["tools"]}
+    assert tools["reference_count"]["cache_ttl_seconds"] == 30
+    assert "cache_ttl_seconds" not in tools["count"]
+    assert results[0] == results[1]
+    assert results[2] != results[3]
+    assert results[4] != results[5]
+    assert stats["entries"] == 1 and stats["hits"] == 1
+
+
+def test_tool_errors_are_failed_results():
+    """
+    Tests errors reported by the tool, inside the response of a result, count as failures.
+    """
+    source = {"source": "Capability [t] called on server [S] with parameters: []"}
+    assert MCPClient.is_failed_result({"error": "no such server"})
+    assert MCPClient.is_failed_result({"results": [source, {"error": "failed", "details": "x"}]})
+    assert MCPClient.is_failed_result({"results": [source, {"response": [{"error": "raised"}]}]})
+    assert not MCPClient.is_failed_result({"results": [source, {"response": [{"key": "a"}]}]})
+
+    tool_error = types.CallToolResult(content=[types.TextContent(type="text", text="boom")], isError=True)
+    extracted = MCPClient(server_base_urls=["http://localhost:1"])._extract_tool_result(tool_error)
+    assert extracted == [{"error": "Tool reported an error and did not return a result", "details": "boom"}]
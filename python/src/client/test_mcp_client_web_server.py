@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from starlette.testclient import TestClient
+from mcp_client_web_server import MCPClientWebServer
+
+
+def test_coroutine_handlers_share_one_event_loop():
+    """
+    Tests coroutine handlers run on the same long lived loop across requests while plain handlers still work.
+    """
+    server = MCPClientWebServer(host="127.0.0.1", port=0)
+    loops = []
+    state = {"calls": 0}
+
+    async def async_handler(params):
+        loops.append(asyncio.get_running_loop())
+        state["calls"] += 1
+        await asyncio.sleep(0)
+        return {"calls": state["calls"], "args": params["args"]}
+
+    def sync_handler(params):
+        return {"thread": threading.current_thread().name, "args": params["args"]}
+
+    server.add_route(route="/async", methods=["GET"], handler=async_handler)
+    server.add_route(route="/sync", methods=["POST"], handler=sync_handler)
+    with TestClient(server.app) as client:
+        first = client.get("/async?x=1").json()
+        second = client.get("/async").json()
+        assert first == {"calls": 1, "args": {"x": "1"}}
+        assert second["calls"] == 2
+        assert loops[0] is loops[1]
+        assert client.post("/sync", json={"goal": "g"}).json()["args"] == {"goal": "g"}
+        assert "async_handler" in client.get("/").text
+
+
+def test_plain_handlers_run_concurrently_and_large_bodies_are_rejected():
+    """
+    Tests blocking handlers do not serialise requests and the body size limit answers 413.
+    """
+    server = MCPClientWebServer(host="127.0.0.1", port=0, worker_threads=4, max_body_bytes=100)
+
+    def blocking_handler(params):
+        time.sleep(0.3)
+        return {"ok": True}
+
+    server.add_route(route="/block", methods=["POST"], handler=blocking_handler)
+    with TestClient(server.app) as client:
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.post("/block", json={}).json()))
+                   for _ in range(4)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert results == [{"ok": True}] * 4
+        assert time.monotonic() - start < 1
+
+        response = client.post("/block", json={"document": "x" * 200})
+        assert response.status_code == 413
+        assert client.post("/block", content=b"{bad", headers={"content-type": "application/json"}).status_code == 400
+
+
+def test_stream_routes_relay_events_as_they_are_produced():
+    server = MCPClientWebServer(host="127.0.0.1", port=0)
+
+    async def stream_handler(params):
+        for token in ["{\"a\"", ": 1}"]:
+            yield "token", {"text": token}
+        yield "response", {"response": {"a": 1}, "args": params["args"]}
+
+    async def failing_handler(params):
+        yield "token", {"text": "x"}
+        raise RuntimeError("LLM went away")
+
+    server.add_stream_route(route="/stream", methods=["POST"], handler=stream_handler)
+    server.add_stream_route(route="/failing", methods=["POST"], handler=failing_handler)
+    with TestClient(server.app) as client:
+        with client.stream("POST", "/stream", json={"goal": "g"}) as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = "".join(response.iter_text())
+        assert body == ('event: token\ndata: {"text": "{\\"a\\""}\n\n'
+                        'event: token\ndata: {"text": ": 1}"}\n\n'
+                        'event: response\ndata: {"response": {"a": 1}, "args": {"goal": "g"}}\n\n')
+        failed = client.post("/failing", json={}).text
+        assert failed.endswith('event: error\ndata: {"error": "LLM went away"}\n\n')
+        assert client.post("/stream", content=b"{bad", headers={"content-type": "application/json"}).status_code == 400
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+from capability_cache import CapabilityCache
+from python.src.client.mcp_client import MCPClient
+from python.src.client.mcp_invoke import MCPInvoke
+
+# Configure logging for tests
+logger = logging.getLogger("MCPInvokeTest")
+logging.basicConfig(level=logging.DEBUG)
+
+
+def test_calls_are_routed_to_the_owning_client(mcp_server_url):
+    """
+    Tests a call goes to the client that owns the server, not the first client in the list.
+    """
+    other_url = "http://127.0.0.1:9"
+    other_cache = CapabilityCache(ttl_seconds=60)
+    other_cache.put(other_url, {"server_detail": {"name": "OtherServer", "server_url": other_url},
+                                "tools": [{"name": "other"}]})
+
+    async def call():
+        async with MCPClient(server_base_urls=[other_url], capability_cache=other_cache) as other, \
+                MCPClient(server_base_urls=[mcp_server_url], capability_cache=CapabilityCache()) as owner:
+            invoke = MCPInvoke([other, owner])
+            return await invoke.get_mcp_server_responses([
+                {"mcp_server_name": "TestServer", "mcp_capability": "tools",
+                 "mcp_capability_name": "lookup", "parameters": {"key": "a"}},
+                {"mcp_server_name": "NoSuchServer", "mcp_capability": "tools",
+                 "mcp_capability_name": "count", "parameters": {}},
+                {"mcp_server_name": "NoSuchServer", "mcp_capability": "tools",
+                 "mcp_capability_name": "missing", "parameters": {}}])
+
+    routed, by_tool, unknown = asyncio.run(call())
+    assert {"response": [{"key": "a"}]} in routed["results"]
+    # Never sent to a server the call did not name, even the only one offering the tool.
+    assert "NoSuchServer" in by_tool["error"] and "TestServer" in by_tool["error"]
+    assert "NoSuchServer" in unknown["error"]
+
+
+def test_calls_run_concurrently_in_request_order(mcp_server_url):
+    """
+    Tests independent calls overlap, results keep the call order and a bad or slow call fails alone.
+    """
+    def slow(seconds: float):
+        return {"mcp_server_name": "TestServer", "mcp_capability": "tools",
+                "mcp_capability_name": "slow", "parameters": {"seconds": seconds}}
+
+    def lookup(key: str):
+        return {"mcp_server_name": "TestServer", "mcp_capability": "tools",
+                "mcp_capability_name": "lookup", "parameters": {"key": key}}
+
+    async def call():
+        async with MCPClient(server_base_urls=[mcp_server_url], capability_cache=CapabilityCache()) as client:
+            invoke = MCPInvoke([client], max_concurrent_calls=4, call_timeout_seconds=1)
+            await client.get_details_of_all_servers()
+            start = time.monotonic()
+            results = await invoke.get_mcp_server_responses(
+                [slow(0.3), lookup("first"), slow(0.3), {"mcp_capability": "tools"}, slow(5), lookup("last"), slow(0.3)])
+            return results, time.monotonic() - start
+
+    results, elapsed = asyncio.run(call())
+    logger.info(f"Calls took {elapsed:.3f}s")
+    assert len(results) == 7
+    assert {"response": [{"key": "first"}]} in results[1]["results"]
+    assert {"response": [{"key": "last"}]} in results[5]["results"]
+    assert "server name is required" in results[3]["error"]
+    assert "timed out" in results[4]["error"]
+    assert all("error" not in results[i] for i in (0, 2, 6))
+    assert elapsed < 1.6
+
+
+def test_tool_annotations_come_from_the_owning_server(mcp_server_url):
+    async def annotations():
+        async with MCPClient(server_base_urls=[mcp_server_url], capability_cache=CapabilityCache()) as client:
+            invoke = MCPInvoke([client])
+            before = invoke.tool_annotations("TestServer", "lookup")
+            await client.get_details_of_all_servers()
+            return before, invoke.tool_annotations("TestServer", "lookup"), invoke.tool_annotations("TestServer", "count")
+
+    before, lookup, count = asyncio.run(annotations())
+    assert before is None
+    assert lookup["readOnlyHint"] is True
+    assert count is None
@@ -0,0 +1,34 @@
+import time
+from mcp_response_cache import MCPResponseCache
+
+
+def test_least_recently_used_responses_are_evicted():
+    """
+    Tests the byte bound evicts the least recently used response first.
+    """
+    cache = MCPResponseCache(max_bytes=45, default_ttl_seconds=60)
+    cache.put("a", {"v": "a" * 10})
+    cache.put("b", {"v": "b" * 10})
+    assert cache.get("a") == {"v": "a" * 10}  # b is now least recently used.
+    cache.put("c", {"v": "c" * 10})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= 45
+
+    cache.put("big", {"v": "x" * 100})
+    assert cache.get("big") is None
+    assert len(cache) == 2
+
+
+def test_responses_expire_and_are_copies():
+    cache = MCPResponseCache(default_ttl_seconds=60)
+    cache.put("short", {"v": [1]}, ttl_seconds=0.05)
+    cache.put("off", {"v": [1]}, ttl_seconds=0)
+    response = cache.get("short")
+    response["v"].append(2)
+    assert cache.get("short") == {"v": [1]}
+    time.sleep(0.1)
+    assert cache.get("short") is None
+    assert cache.get("off") is None
+    assert MCPResponseCache.key("S", "t", {"a": 1, "b": 2}) == MCPResponseCache.key("S", "t", {"b": 2, "a": 1})
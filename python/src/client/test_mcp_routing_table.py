@@ -0,0 +1,40 @@
+import pytest
+from mcp_routing_table import MCPRoutingTable
+
+
+def _capabilities(name: str, url: str, tools):
+    return {"server_detail": {"name": name, "server_url": url},
+            "tools": tools,
+            "resources": [{"name": "config"}],
+            "resource_templates": [],
+            "prompts": []}
+
+
+def test_routes_follow_capability_updates():
+    """
+    Tests server and tool routes are replaced when a server's capabilities change.
+    """
+    table = MCPRoutingTable()
+    table.update("http://a:8000", _capabilities("A", "http://a:8000", [
+        {"name": "add", "annotations": {"readOnlyHint": True}}, {"name": "echo"}]))
+    table.update("http://b:8000", _capabilities("B", "http://b:8000", [{"name": "echo"}]))
+
+    assert table.server_url("A") == "http://a:8000"
+    assert sorted(table.servers_for("echo")) == ["A", "B"]
+    assert table.servers_for("config", "resources") == ["A", "B"]
+    assert table.tool_annotations("A", "add") == {"readOnlyHint": True}
+    assert table.tool_annotations("B", "echo") is None
+
+    # The server at the URL was renamed and dropped a tool.
+    table.update("http://a:8000", _capabilities("A2", "http://a:8000", [{"name": "echo"}]))
+    assert table.server_url("A") is None
+    assert table.server_url("A2") == "http://a:8000"
+    assert table.servers_for("add") == []
+    assert sorted(table.server_names) == ["A2", "B"]
+
+
+def test_invalid_url_is_rejected():
+    table = MCPRoutingTable()
+    with pytest.raises(MCPRoutingTable.InvalidServerURL):
+        table.update("not a url", _capabilities("A", "not a url", []))
+    assert len(table) == 0
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import threading
+import time
+import pytest
+from mcp_session_pool import MCPSessionPool
+
+# Configure logging for tests
+logger = logging.getLogger("MCPSessionPoolTest")
+logging.basicConfig(level=logging.DEBUG)
+
+
+@pytest.fixture
+def sse_url(mcp_server_url):
+    return f"{mcp_server_url}/sse"
+
+
+def test_sequential_calls_reuse_one_session(sse_url):
+    """
+    Tests sequential calls share a single initialized session.
+    """
+    async def calls():
+        pool = MCPSessionPool(pool_size=2)
+        for i in range(3):
+            result = await pool.run(sse_url, lambda session: session.call_tool("echo", {"text": f"hi {i}"}))
+            assert result.content[0].text == f"hi {i}"
+        stats = pool.stats()
+        await pool.close()
+        return stats
+
+    stats = asyncio.run(calls())
+    logger.info(stats)
+    assert stats["sessions"][sse_url]["open"] == 1
+
+
+def test_concurrent_calls_are_bounded_by_pool_size(sse_url):
+    """
+    Tests concurrent calls open at most pool size sessions and all complete.
+    """
+    async def calls():
+        pool = MCPSessionPool(pool_size=2)
+        results = await asyncio.gather(*[pool.run(sse_url, lambda session: session.call_tool("slow", {"seconds": 0.2}))
+                                         for _ in range(5)])
+        stats = pool.stats()
+        await pool.close()
+        return results, stats
+
+    results, stats = asyncio.run(calls())
+    assert all(r.content[0].text == "done" for r in results)
+    assert stats["sessions"][sse_url]["open"] == 2
+    assert stats["sessions"][sse_url]["in_flight"] == 0
+
+
+def test_idle_and_broken_sessions_are_replaced(sse_url):
+    """
+    Tests an idle session is closed and reopened, and a call on a dead session is retried on a new one.
+    """
+    async def calls():
+        pool = MCPSessionPool(pool_size=1, idle_timeout_seconds=0.05)
+        first = await pool.acquire(sse_url)
+        pool.release(first)
+        await asyncio.sleep(0.1)
+        second = await pool.acquire(sse_url)
+        pool.release(second)
+        assert second is not first
+
+        await second.close()  # Simulate the connection dropping.
+        result = await pool.run(sse_url, lambda session: session.call_tool("echo", {"text": "again"}))
+        await pool.close()
+        return result
+
+    assert asyncio.run(calls()).content[0].text == "again"
+
+
+def test_calls_not_safe_to_repeat_are_not_retried(sse_url):
+    """
+    Tests a call failing on its connection is only retried if asked, as it may have reached the server.
+    """
+    calls = []
+
+    async def call(session):
+        calls.append(session)
+        if len(calls) == 1:
+            raise ConnectionError("connection dropped")
+        return await session.call_tool("echo", {"text": "retried"})
+
+    async def run(retry):
+        pool = MCPSessionPool(pool_size=1)
+        try:
+            return await pool.run(sse_url, call, retry=retry)
+        finally:
+            await pool.close()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run(retry=False))
+    assert len(calls) == 1
+
+    calls.clear()
+    assert asyncio.run(run(retry=True)).content[0].text == "retried"
+    assert len(calls) == 2 and calls[0] is not calls[1]
+
+
+def test_sessions_reconnect_after_the_server_restarts(restartable_server):
+    """
+    Tests a session whose SSE stream ended with the server is not reused, the next call
+    reconnects rather than waiting on the dead session.
+    """
+    sse_url = f"{restartable_server.url}/sse"
+
+    async def calls():
+        pool = MCPSessionPool(pool_size=1, health_check_interval_seconds=3600)
+        first = await pool.run(sse_url, lambda session: session.call_tool("echo", {"text": "before"}))
+        await asyncio.to_thread(restartable_server.stop)
+        await asyncio.to_thread(restartable_server.start)
+        start = time.monotonic()
+        second = await asyncio.wait_for(
+            pool.run(sse_url, lambda session: session.call_tool("echo", {"text": "after"})), 10)
+        elapsed = time.monotonic() - start
+        await pool.close()
+        return first, second, elapsed
+
+    first, second, elapsed = asyncio.run(calls())
+    assert first.content[0].text == "before"
+    assert second.content[0].text == "after"
+    assert elapsed < 5
+
+
+def test_cancelled_calls_do_not_leave_their_session_in_the_pool(sse_url):
+    async def calls():
+        pool = MCPSessionPool(pool_size=1)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.run(sse_url, lambda session: session.call_tool("slow", {"seconds": 5})), 0.2)
+        assert pool.stats()["sessions"][sse_url]["open"] == 0
+        result = await pool.run(sse_url, lambda session: session.call_tool("echo", {"text": "next"}))
+        await pool.close()
+        return result
+
+    assert asyncio.run(calls()).content[0].text == "next"
+
+
+def test_unreachable_server_raises():
+    """
+    Tests a server that is not listening fails fast with FailedToOpenSession.
+    """
+    async def call():
+        pool = MCPSessionPool(connect_timeout_seconds=2)
+        await pool.run("http://127.0.0.1:9/sse", lambda session: session.send_ping())
+
+    with pytest.raises(MCPSessionPool.FailedToOpenSession):
+        asyncio.run(call())
+
+
+def test_event_loops_in_threads_get_their_own_sessions(sse_url):
+    """
+    Tests request threads each running their own event loop can share one pool.
+    """
+    pool = MCPSessionPool(pool_size=1)
+    results = []
+
+    async def calls(name: str):
+        for _ in range(3):
+            result = await pool.run(sse_url, lambda session: session.call_tool("slow", {"seconds": 0.05}))
+            results.append((name, result.content[0].text))
+        await pool.close()
+
+    threads = [threading.Thread(target=lambda n=n: asyncio.run(calls(n))) for n in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert sorted(results) == [("a", "done")] * 3 + [("b", "done")] * 3
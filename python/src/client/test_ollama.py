@@ -0,0 +1,33 @@
+import asyncio
+import httpx
+from llm_http_client import LLMHttpClient
+from llm_json_extractor import LLMJSONExtractor
+from ollama_utils import Ollama
+
+
+def _mocked_ollama(content: str) -> Ollama:
+    """
+    Ollama whose chat requests are answered with the given content rather than by a model.
+    """
+    def handler(request):
+        return httpx.Response(200, json={"message": {"role": "assistant", "content": content}})
+    return Ollama(http_client=LLMHttpClient(transport=httpx.MockTransport(handler), max_retries=0))
+
+
+def test_get_llm_response_parses_content():
+    success, result = asyncio.run(_mocked_ollama('{"status": "success"}').get_llm_response(
+        "Test prompt", model="test", host="http://ollama.test", temperature=0.0))
+
+    assert success is True
+    assert result == {"status": "success"}
+
+
+def test_get_llm_response_invalid_content():
+    """
+    Tests content that is not a valid JSON response fails with the extractor's error.
+    """
+    success, result = asyncio.run(_mocked_ollama('{"status": "cut short').get_llm_response(
+        "Test prompt", model="test", host="http://ollama.test", temperature=0.0))
+
+    assert success is False
+    assert result["error"] == str(LLMJSONExtractor.Errors.INVALID_JSON)
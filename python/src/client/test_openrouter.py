@@ -1,9 +1,11 @@
+import asyncio
 import logging
 import os
 import json
+import httpx
 import pytest
-from unittest.mock import patch, MagicMock
-from openrouter_utils import DEFAULT_EMBEDDING_MODEL, OpenRouter
+from llm_http_client import LLMHttpClient
+from openrouter_utils import OpenRouter
 from openrouter_utils import DEFAULT_OPENROUTER_MODEL
 
 # Configure logging for tests
@@ -61,27 +63,31 @@ def test_openrouter_getters(openrouter_instance):
     logger.info(f"Max tokens: {max_tokens}")
 
 
-@patch('openrouter_utils.requests.post')
-def test_get_llm_response_success(mock_post, openrouter_instance):
+def _mocked_openrouter(handler) -> OpenRouter:
     """
-    Tests successful LLM response using mocked requests.
+    OpenRouter whose requests are answered by the handler rather than the network.
     """
-    # Mock successful response
-    mock_response = MagicMock()
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {
-        "choices": [
-            {
-                "message": {
-                    "content": '{"response": {"answer": {"body": "Test response", "confidence": "0.9"}}, "status": "success"}'
+    return OpenRouter(api_key="test-key",
+                      http_client=LLMHttpClient(transport=httpx.MockTransport(handler), max_retries=0))
+
+
+def test_get_llm_response_success():
+    """
+    Tests successful LLM response using a mocked transport.
+    """
+    def handler(request):
+        return httpx.Response(200, json={
+            "choices": [
+                {
+                    "message": {
+                        "content": '{"response": {"answer": {"body": "Test response", "confidence": "0.9"}}, "status": "success"}'
+                    }
                 }
-            }
-        ]
-    }
-    mock_post.return_value = mock_response
+            ]
+        })
 
     test_prompt = "How is a model context protocol server helpful to an LLM?"
-    success, result = openrouter_instance.get_llm_response(prompt=test_prompt)
+    success, result = asyncio.run(_mocked_openrouter(handler).get_llm_response(prompt=test_prompt))
 
     assert success is True
     assert isinstance(result, dict)
@@ -89,24 +95,70 @@ def test_get_llm_response_success(mock_post, openrouter_instance):
     logger.info(f"Successful response test passed with result: {result}")
 
 
-@patch('openrouter_utils.requests.post')
-def test_get_llm_response_http_error(mock_post, openrouter_instance):
+def test_get_llm_response_streamed():
     """
-    Tests LLM response with HTTP error using mocked requests.
+    Tests a streamed LLM response passes each token on and parses the whole content.
     """
-    # Mock HTTP error response
-    from requests.exceptions import HTTPError
-    mock_response = MagicMock()
-    mock_response.status_code = 401
-    mock_response.text = "Unauthorized"
-    mock_response.json.return_value = {"error": "Invalid API key"}
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, content=(': OPENROUTER PROCESSING\n\n'
+                                            'data: {"choices": [{"delta": {"content": "{\\"status\\""}}]}\n\n'
+                                            'data: {"choices": [{"delta": {"content": ": \\"success\\"}"}}]}\n\n'
+                                            'data: [DONE]\n\n').encode("utf-8"))
+
+    tokens = []
+    success, result = asyncio.run(_mocked_openrouter(handler).get_llm_response(prompt="Test prompt",
+                                                                               on_token=tokens.append))
+
+    assert success is True
+    assert result == {"status": "success"}
+    assert tokens == ['{"status"', ': "success"}']
 
-    http_error = HTTPError()
-    http_error.response = mock_response
-    mock_post.side_effect = http_error
+
+def test_get_llm_response_reports_usage():
+    """
+    Tests the usage of a streamed response, sent with its last chunk, is passed to on_usage.
+    """
+    def handler(request):
+        assert json.loads(request.content)["usage"] == {"include": True}
+        return httpx.Response(200, content=('data: {"choices": [{"delta": {"content": "{\\"status\\": \\"success\\"}"}}]}\n\n'
+                                            'data: {"choices": [], "usage": {"prompt_tokens": 12, '
+                                            '"completion_tokens": 1, "total_tokens": 13, "cost": 0.001}}\n\n'
+                                            'data: [DONE]\n\n').encode("utf-8"))
+
+    usages = []
+    openrouter = OpenRouter(api_key="test-key",
+                            http_client=LLMHttpClient(transport=httpx.MockTransport(handler), max_retries=0),
+                            on_usage=usages.append)
+    success, _ = asyncio.run(openrouter.get_llm_response(prompt="Test prompt", on_token=lambda token: None))
+
+    assert success is True
+    assert usages == [{"prompt_tokens": 12, "completion_tokens": 1, "total_tokens": 13, "cost": 0.001}]
+
+
+def test_get_llm_response_invalid_content():
+    """
+    Tests content that is not a valid JSON response fails rather than being returned as a response.
+    """
+    def handler(request):
+        return httpx.Response(200, json={"choices": [{"message": {"content": '{"response": {"answer": "cut short"'}}]})
+
+    success, result = asyncio.run(_mocked_openrouter(handler).get_llm_response(prompt="Test prompt"))
+
+    assert success is False
+    assert result["status"] == "error"
+    assert "Invalid JSON format" in result["response"]["answer"]["body"]
+
+
+def test_get_llm_response_http_error():
+    """
+    Tests LLM response with HTTP error using a mocked transport.
+    """
+    def handler(request):
+        return httpx.Response(401, json={"error": "Invalid API key"})
 
     test_prompt = "Test prompt"
-    success, result = openrouter_instance.get_llm_response(prompt=test_prompt)
+    success, result = asyncio.run(_mocked_openrouter(handler).get_llm_response(prompt=test_prompt))
 
     assert success is False
     assert isinstance(result, dict)
@@ -116,19 +168,15 @@ def test_get_llm_response_http_error(mock_post, openrouter_instance):
     logger.info(f"HTTP error test passed with result: {result}")
 
 
-@patch('openrouter_utils.requests.post')
-def test_get_llm_response_no_choices(mock_post, openrouter_instance):
+def test_get_llm_response_no_choices():
     """
     Tests LLM response when API returns no choices.
     """
-    # Mock response with no choices
-    mock_response = MagicMock()
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {"choices": []}
-    mock_post.return_value = mock_response
+    def handler(request):
+        return httpx.Response(200, json={"choices": []})
 
     test_prompt = "Test prompt"
-    success, result = openrouter_instance.get_llm_response(prompt=test_prompt)
+    success, result = asyncio.run(_mocked_openrouter(handler).get_llm_response(prompt=test_prompt))
 
     assert success is False
     assert isinstance(result, dict)
@@ -138,20 +186,15 @@ def test_get_llm_response_no_choices(mock_post, openrouter_instance):
     logger.info(f"No choices test passed with result: {result}")
 
 
-@patch('openrouter_utils.requests.post')
-def test_get_llm_response_json_decode_error(mock_post, openrouter_instance):
+def test_get_llm_response_json_decode_error():
     """
     Tests LLM response when JSON decoding fails.
     """
-    # Mock response that raises JSONDecodeError
-    from json import JSONDecodeError
-    mock_response = MagicMock()
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.side_effect = JSONDecodeError("Invalid JSON", "", 0)
-    mock_post.return_value = mock_response
+    def handler(request):
+        return httpx.Response(200, content=b"Invalid JSON")
 
     test_prompt = "Test prompt"
-    success, result = openrouter_instance.get_llm_response(prompt=test_prompt)
+    success, result = asyncio.run(_mocked_openrouter(handler).get_llm_response(prompt=test_prompt))
 
     assert success is False
     assert isinstance(result, dict)
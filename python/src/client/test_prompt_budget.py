@@ -0,0 +1,45 @@
+from prompt_budget import PromptBudget
+
+
+def _response(source: str, records: int):
+    return {"results": [{"source": source},
+                        {"response": [{"tradeId": i, "notional": i * 100, "client": {"name": f"c{i}", "id": i}}
+                                      for i in range(records)]}]}
+
+
+def test_responses_within_budget_are_kept_without_duplicates():
+    budget = PromptBudget(default_budget_tokens=10000)
+    first, second = _response("a", 2), _response("b", 2)
+    assert budget.compact([first, second, first], clarifications=[]) == [second, first]
+
+
+def test_older_responses_give_way_to_the_newest():
+    """
+    Tests older responses are trimmed then summarised, the newest is kept whole and the error is kept.
+    """
+    budget = PromptBudget(default_budget_tokens=2000, budget_by_model={"small": 900})
+    responses = [_response("old", 200), {"error": "failed"}, _response("older", 50), _response("new", 20)]
+    compacted = budget.compact(responses, clarifications=[{"question": "q", "response": "r"}], model="small")
+
+    assert compacted[-1] == responses[-1]
+    assert compacted[1] == {"error": "failed"}
+    assert compacted[0]["results"][0] == {"source": "old"}
+    assert "omitted" in compacted[0]["results"][-1]
+    assert PromptBudget.estimate_tokens(compacted) <= 900
+    assert budget.budget_for("other") == 2000
+
+
+def test_newest_response_is_trimmed_as_a_last_resort():
+    budget = PromptBudget(default_budget_tokens=300)
+    compacted = budget.compact([_response("huge", 500)], clarifications=[])
+    assert len(compacted[0]["results"][1]["response"]) < 500
+    assert "of 500 records omitted" in compacted[0]["results"][1]["omitted"]
+    assert PromptBudget.estimate_tokens(compacted) <= 300
+
+
+def test_projection_keeps_requested_fields():
+    projected = PromptBudget.project(_response("a", 2), ["tradeId", "client.name", "missing"])
+    assert projected["results"][1]["response"] == [{"tradeId": 0, "client": {"name": "c0"}},
+                                                   {"tradeId": 1, "client": {"name": "c1"}}]
+    assert projected["results"][0] == {"source": "a"}
+    assert PromptBudget.project({"error": "x"}, ["a"]) == {"error": "x"}
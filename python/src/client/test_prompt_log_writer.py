@@ -0,0 +1,47 @@
+import gzip
+import uuid
+from pathlib import Path
+from prompt_log_writer import PromptLogWriter
+
+
+def test_prompts_are_read_back_by_version(tmp_path: Path):
+    """
+    Tests prompts written in the background are read back in version order, per session.
+    """
+    writer = PromptLogWriter(tmp_path)
+    session, other = uuid.uuid4(), uuid.uuid4()
+    for i in range(5):
+        writer.write(session, f"prompt {i}")
+    writer.write(other, "other prompt")
+
+    prompts = writer.read(session)
+    assert list(prompts) == [f"prompt_{session}_{v}.txt" for v in range(1, 6)]
+    assert all(f"prompt {i}\n" in text for i, text in enumerate(prompts.values()))
+    assert len(writer.read(other)) == 1
+    assert writer.read(uuid.uuid4()) == {}
+    writer.close()
+
+    # The log is one gzip file, readable as a whole.
+    assert gzip.decompress((tmp_path / f"prompt_{session}.log.gz").read_bytes()).decode().count("prompt ") == 5
+
+
+def test_log_is_reindexed_after_restart(tmp_path: Path):
+    session = uuid.uuid4()
+    first = PromptLogWriter(tmp_path)
+    first.write(session, "before restart")
+    first.close()
+
+    second = PromptLogWriter(tmp_path)
+    second.write(session, "after restart")
+    prompts = list(second.read(session).values())
+    second.close()
+    assert len(prompts) == 2
+    assert "before restart" in prompts[0] and "after restart" in prompts[1]
+
+
+def test_full_queue_drops_without_blocking(tmp_path: Path):
+    writer = PromptLogWriter(tmp_path, queue_size=1)
+    results = [writer.write(uuid.uuid4(), "x" * 100000) for _ in range(200)]
+    assert not all(results)
+    assert writer.dropped == results.count(False)
+    writer.close()
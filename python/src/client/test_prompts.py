@@ -0,0 +1,47 @@
+import os
+import shutil
+import uuid
+from pathlib import Path
+from prompts import Prompts
+from static_data_service import Permissions
+
+TEMPLATE_FOLDER: Path = Path(__file__).resolve().parent / "prompt_templates"
+
+
+def test_template_files_are_cached_until_modified(tmp_path: Path):
+    """
+    Tests templates are read from disk once and re-read after the file changes.
+    """
+    folder = tmp_path / "templates"
+    shutil.copytree(TEMPLATE_FOLDER, folder)
+    prompts = Prompts(template_root_folder=folder)
+    role = Permissions.UserRole.SALES_TRADER.value
+
+    def prompt():
+        return prompts.get_prompt(goal="goal", user_role=role, staff_id="s", session_id=str(uuid.uuid4()),
+                                  variables={"mcp_server_descriptions": "{}",
+                                             "mcp_server_responses": "[]",
+                                             "clarification_responses": "[]"})
+
+    first = prompt()
+    cached = dict(prompts._file_cache)
+    prompt()
+    assert prompts._file_cache == cached
+    assert len(prompts._compiled_templates) == 1
+
+    org_statement = folder / Prompts.PromptSettings.ORG_STATEMENT.value
+    org_statement.write_text("Changed org statement", encoding="utf-8")
+    stat = org_statement.stat()
+    os.utime(org_statement, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = prompt()
+    assert "Changed org statement" in second
+    assert "Changed org statement" not in first
+
+
+def test_server_descriptions_are_serialised_once_per_version():
+    prompts = Prompts()
+    descriptions = {"A": {"tools": []}}
+    first = prompts._server_descriptions_as_json(descriptions, 1)
+    assert prompts._server_descriptions_as_json(descriptions, 1) is first
+    assert prompts._server_descriptions_as_json({"A": {"tools": [1]}}, 2) != first
+    assert prompts._server_descriptions_as_json({**descriptions, "B": {}}, 2) != first
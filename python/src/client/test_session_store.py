@@ -0,0 +1,51 @@
+import time
+import uuid
+from session_store import SessionStore
+
+
+def test_least_recently_used_sessions_are_evicted():
+    """
+    Tests sessions beyond the maximum are evicted least recently used first, with their bytes.
+    """
+    store = SessionStore(max_sessions=2)
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    store.put(a, "ns", "k", {"v": "a"})
+    store.put(b, "ns", "k", {"v": "b"})
+    assert store.get(a, "ns", "k") == {"v": "a"}  # b is now least recently used.
+    store.put(c, "ns", "k", {"v": "c"})
+    assert b not in store
+    assert store.values(b, "ns") == []
+    assert store.values(a, "ns") == [{"v": "a"}]
+    assert store.stats()["evictions"] == 1
+    assert store.stats()["bytes"] == store.session_bytes(a) + store.session_bytes(c)
+
+
+def test_memory_is_accounted_and_bounded():
+    store = SessionStore(max_bytes=100)
+    a, b = uuid.uuid4(), uuid.uuid4()
+    store.put(a, "ns", "k", "x" * 40)
+    store.put(a, "ns", "k", "x" * 20)  # Replacing a value releases its bytes.
+    assert store.session_bytes(a) == 22
+    store.put(b, "ns", "k", "y" * 90)
+    assert a not in store and b in store
+    store.put(b, "other", "k", "z" * 200)  # The session in use is kept even when over the bound.
+    assert b in store and store.session_bytes(b) == 92 + 202
+
+
+def test_idle_sessions_are_spilled_and_restored(tmp_path):
+    store = SessionStore(idle_ttl_seconds=0.05, spill_dir=tmp_path)
+    a, b = uuid.uuid4(), uuid.uuid4()
+    store.put(a, "ns", "k1", {"v": 1})
+    store.put(a, "ns", "k2", {"v": 2})
+    time.sleep(0.1)
+    store.put(b, "ns", "k", {"v": 3})
+    assert a not in store
+    assert list(tmp_path.glob(f"{a}*"))
+
+    assert store.values(a, "ns") == [{"v": 1}, {"v": 2}]
+    assert store.get(a, "ns", "k2") == {"v": 2}
+    assert store.session_bytes(a) > 0
+    assert store.stats()["restored"] == 1
+    assert not list(tmp_path.glob(f"{a}*"))
+
+    assert SessionStore(idle_ttl_seconds=0.05).values(uuid.uuid4(), "ns") == []
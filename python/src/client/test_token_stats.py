@@ -0,0 +1,71 @@
+import asyncio
+import uuid
+from prompt_budget import PromptBudget
+from token_stats import TokenStats
+
+
+def _mcp_response(server, tool, records):
+    return {"results": [{"source": f"Capability [{tool}] called on server [{server}] with parameters: [a=1]"},
+                        {"response": [{"key": i} for i in range(records)]}]}
+
+
+def test_prompt_sections_and_tools_are_measured():
+    stats = TokenStats()
+    responses = [_mcp_response("S", "big", 200), _mcp_response("S", "small", 1), {"error": "failed"}]
+    capabilities = {"S": {"tools": ["big", "small"]}}
+    prompt = "Instructions " * 100 + str(capabilities) + str(responses)
+    turn = stats.measure_prompt(session_id=uuid.uuid4(),
+                                prompt=prompt,
+                                capabilities=capabilities,
+                                mcp_responses=responses,
+                                clarifications=[])
+
+    assert set(turn.tools) == {"S/big", "S/small", TokenStats.UNKNOWN_TOOL}
+    assert turn.tools["S/big"] == PromptBudget.estimate_tokens(responses[0])
+    assert turn.sections["mcp_responses"] == sum(turn.tools.values())
+    assert turn.sections["fragments"] == turn.prompt_tokens - sum(
+        tokens for section, tokens in turn.sections.items() if section != "fragments")
+
+
+def test_usage_is_recorded_for_the_running_turn():
+    """
+    Tests usage reported from the tasks of concurrent LLM calls goes to the right turn.
+    """
+    stats = TokenStats()
+    first, second = uuid.uuid4(), uuid.uuid4()
+
+    async def provider(tokens):
+        await asyncio.sleep(0.01)
+        stats.record_usage({"prompt_tokens": tokens, "completion_tokens": 1, "cost": 0.5})
+
+    async def llm_call(session_id, tokens):
+        turn = stats.measure_prompt(session_id, "prompt", {}, [_mcp_response("S", "t", 1)], [])
+        with stats.llm_call(turn):
+            # The router calls providers as tasks, which see the turn of the call.
+            await asyncio.ensure_future(provider(tokens))
+        stats.add_turn(turn)
+
+    async def turns():
+        await asyncio.gather(llm_call(first, 100), llm_call(second, 7), llm_call(first, 100))
+
+    asyncio.run(turns())
+    stats.record_usage({"prompt_tokens": 1000})  # Outside a turn, not recorded.
+
+    assert stats.stats(first)["llm"]["usage"] == {"prompt_tokens": 200, "completion_tokens": 2, "cost": 1.0}
+    assert stats.stats(second)["llm"]["usage"]["prompt_tokens"] == 7
+    assert stats.stats(first)["turns"] == 2 and stats.stats(first)["llm"]["calls"] == 2
+    overall = stats.stats()
+    assert overall["llm"]["usage"]["prompt_tokens"] == 207
+    assert overall["tools"][0]["tool"] == "S/t" and overall["tools"][0]["prompts"] == 3
+    assert [session["session_id"] for session in overall["sessions"]] == [str(first), str(second)]
+
+
+def test_least_recently_active_sessions_are_dropped():
+    stats = TokenStats(max_sessions=2)
+    sessions = [uuid.uuid4() for _ in range(3)]
+    for session_id in sessions:
+        stats.add_turn(stats.measure_prompt(session_id, "prompt", {}, [], []))
+
+    assert stats.stats(sessions[0]) is None
+    assert stats.stats(sessions[2])["turns"] == 1
+    assert stats.stats()["turns"] == 3
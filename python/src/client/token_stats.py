@@ -0,0 +1,234 @@
+import contextvars
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional
+from prompt_budget import PromptBudget
+
+
+class TokenStats:
+    """
+    Token and cost accounting of the LLM turns, per session and per MCP tool, to show which
+    parts of the prompt (and which tool responses) it is spent on.
+
+    The tokens of each prompt section are estimated as the prompt budget does: the server
+    capabilities, the MCP responses (split by the tool that gave them), the clarifications
+    and the fragments (the template, role and policy text, what is left of the prompt). The
+    latency of the LLM call and the token usage and cost reported by the provider are added
+    to the turn. Usage is reported by a callback the provider calls while the turn's LLM call
+    is running, so concurrent turns are kept apart.
+    """
+
+    DEFAULT_MAX_SESSIONS: int = 1000
+    UNKNOWN_TOOL: str = "unknown"
+    USAGE_KEYS: List[str] = ["prompt_tokens", "completion_tokens", "total_tokens", "cost"]
+    # The source MCPClient gives each result, e.g. Capability [t] called on server [s] with ...
+    _SOURCE_PATTERN: re.Pattern = re.compile(
+        r"Capability \[(?P<capability>[^\]]*)\] called on server \[(?P<server>[^\]]*)\]")
+
+    class EnvVars(str, Enum):
+        MAX_SESSIONS = "MCP_STATS_MAX_SESSIONS"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class Sections(str, Enum):
+        CAPABILITIES = "capabilities"
+        MCP_RESPONSES = "mcp_responses"
+        CLARIFICATIONS = "clarifications"
+        FRAGMENTS = "fragments"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class Turn:
+        def __init__(self,
+                     session_id: uuid.UUID,
+                     sections: Dict[str, int],
+                     tools: Dict[str, int],
+                     prompt_tokens: int) -> None:
+            self.session_id: uuid.UUID = session_id
+            self.sections: Dict[str, int] = sections
+            self.tools: Dict[str, int] = tools
+            self.prompt_tokens: int = prompt_tokens
+            self.llm_calls: int = 0
+            self.cached: bool = False
+            self.latency_seconds: float = 0.0
+            self.usage: Dict[str, float] = {}
+
+        def as_dict(self) -> Dict[str, Any]:
+            return {"estimated_prompt_tokens": self.prompt_tokens,
+                    "sections": dict(self.sections),
+                    "tools": dict(self.tools),
+                    "llm_calls": self.llm_calls,
+                    "cached": self.cached,
+                    "latency_seconds": round(self.latency_seconds, 4),
+                    "usage": dict(self.usage)}
+
+    def __init__(self,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS) -> None:
+        self._log: logging.Logger = logging.getLogger(__name__)
+        self._max_sessions: int = max_sessions
+        self._lock: threading.Lock = threading.Lock()
+        # The turn whose LLM call is running in this context, for record_usage.
+        self._current_turn: contextvars.ContextVar[Optional[TokenStats.Turn]] = contextvars.ContextVar(
+            "token_stats_turn", default=None)
+        self._totals: Dict[str, Any] = self._new_aggregate()
+        # Least recently active first, the oldest are dropped past max_sessions.
+        self._sessions: OrderedDict[uuid.UUID, Dict[str, Any]] = OrderedDict()
+        self._tools: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_environment(cls) -> "TokenStats":
+        return cls(max_sessions=int(os.environ.get(str(cls.EnvVars.MAX_SESSIONS), cls.DEFAULT_MAX_SESSIONS)))
+
+    @classmethod
+    def tool_of(cls, mcp_response: Any) -> str:
+        """
+        The server/tool name an MCP response came from, from the source of its results.
+        """
+        if isinstance(mcp_response, dict):
+            for result in mcp_response.get(str(PromptBudget.ResponseKeys.RESULTS), []):
+                if not isinstance(result, dict):
+                    continue
+                match: Optional[re.Match] = cls._SOURCE_PATTERN.match(
+                    str(result.get(str(PromptBudget.ResponseKeys.SOURCE), "")))
+                if match:
+                    return f"{match.group('server')}/{match.group('capability')}"
+        return cls.UNKNOWN_TOOL
+
+    def measure_prompt(self,
+                       session_id: uuid.UUID,
+                       prompt: str,
+                       capabilities: Any,
+                       mcp_responses: List[Any],
+                       clarifications: List[Any]) -> "TokenStats.Turn":
+        """
+        The estimated tokens of each section of the prompt for a turn of the session.
+        """
+        tools: Dict[str, int] = {}
+        for mcp_response in mcp_responses:
+            tool: str = self.tool_of(mcp_response)
+            tools[tool] = tools.get(tool, 0) + PromptBudget.estimate_tokens(mcp_response)
+        prompt_tokens: int = PromptBudget.estimate_tokens(prompt)
+        sections: Dict[str, int] = {str(self.Sections.CAPABILITIES): PromptBudget.estimate_tokens(capabilities),
+                                    str(self.Sections.MCP_RESPONSES): sum(tools.values()),
+                                    str(self.Sections.CLARIFICATIONS): PromptBudget.estimate_tokens(clarifications)}
+        sections[str(self.Sections.FRAGMENTS)] = max(0, prompt_tokens - sum(sections.values()))
+        return TokenStats.Turn(session_id=session_id,
+                               sections=sections,
+                               tools=tools,
+                               prompt_tokens=prompt_tokens)
+
+    @contextmanager
+    def llm_call(self, turn: "TokenStats.Turn") -> Iterator["TokenStats.Turn"]:
+        """
+        Times the LLM call of the turn, usage reported by the provider meanwhile is the turn's.
+        """
+        token: contextvars.Token = self._current_turn.set(turn)
+        start: float = time.monotonic()
+        try:
+            yield turn
+        finally:
+            turn.llm_calls += 1
+            turn.latency_seconds += time.monotonic() - start
+            self._current_turn.reset(token)
+
+    def record_usage(self, usage: Dict[str, Any]) -> None:
+        """
+        Callback for the LLM providers, with the usage (prompt_tokens, completion_tokens,
+        total_tokens and cost) of a response.
+        """
+        turn: Optional[TokenStats.Turn] = self._current_turn.get()
+        if turn is None:
+            self._log.debug(f"LLM usage outside a turn not recorded: {usage}")
+            return
+        for key in self.USAGE_KEYS:
+            value: Any = usage.get(key)
+            if isinstance(value, (int, float)):
+                turn.usage[key] = turn.usage.get(key, 0) + value
+
+    def add_turn(self, turn: "TokenStats.Turn") -> None:
+        with self._lock:
+            session: Optional[Dict[str, Any]] = self._sessions.get(turn.session_id)
+            if session is None:
+                session = self._new_aggregate()
+                self._sessions[turn.session_id] = session
+                while len(self._sessions) > self._max_sessions:
+                    self._sessions.popitem(last=False)
+            self._sessions.move_to_end(turn.session_id)
+            for aggregate in (self._totals, session):
+                self._add(aggregate, turn)
+            session["last_turn"] = turn.as_dict()
+            for tool, tokens in turn.tools.items():
+                tool_stats: Dict[str, int] = self._tools.setdefault(
+                    tool, {"prompts": 0, "tokens": 0, "max_tokens": 0})
+                tool_stats["prompts"] += 1
+                tool_stats["tokens"] += tokens
+                tool_stats["max_tokens"] = max(tool_stats["max_tokens"], tokens)
+
+    def stats(self, session_id: Optional[uuid.UUID] = None) -> Optional[Dict[str, Any]]:
+        """
+        The aggregates of the session if given (None if it has none), else the totals, the
+        tools by tokens spent on their responses and the sessions by prompt tokens.
+        """
+        with self._lock:
+            if session_id is not None:
+                session: Optional[Dict[str, Any]] = self._sessions.get(session_id)
+                return self._summary(session) if session is not None else None
+            return {**self._summary(self._totals),
+                    "tools": [{"tool": tool,
+                               **tool_stats,
+                               "mean_tokens": round(tool_stats["tokens"] / tool_stats["prompts"], 1)}
+                              for tool, tool_stats in sorted(self._tools.items(),
+                                                             key=lambda item: item[1]["tokens"],
+                                                             reverse=True)],
+                    "sessions": [{"session_id": str(session_id), **self._summary(session, with_tools=False)}
+                                 for session_id, session in sorted(self._sessions.items(),
+                                                                   key=lambda item: item[1]["estimated_prompt_tokens"],
+                                                                   reverse=True)]}
+
+    @staticmethod
+    def _new_aggregate() -> Dict[str, Any]:
+        return {"turns": 0,
+                "estimated_prompt_tokens": 0,
+                "sections": {},
+                "tools": {},
+                "llm": {"calls": 0, "cached": 0, "latency_seconds": 0.0, "usage": {}}}
+
+    @staticmethod
+    def _add(aggregate: Dict[str, Any], turn: "TokenStats.Turn") -> None:
+        aggregate["turns"] += 1
+        aggregate["estimated_prompt_tokens"] += turn.prompt_tokens
+        for totals, counts in ((aggregate["sections"], turn.sections),
+                               (aggregate["tools"], turn.tools),
+                               (aggregate["llm"]["usage"], turn.usage)):
+            for name, count in counts.items():
+                totals[name] = totals.get(name, 0) + count
+        aggregate["llm"]["calls"] += turn.llm_calls
+        aggregate["llm"]["cached"] += int(turn.cached)
+        aggregate["llm"]["latency_seconds"] += turn.latency_seconds
+
+    @staticmethod
+    def _summary(aggregate: Dict[str, Any], with_tools: bool = True) -> Dict[str, Any]:
+        llm: Dict[str, Any] = aggregate["llm"]
+        summary: Dict[str, Any] = {**aggregate,
+                                   "sections": dict(aggregate["sections"]),
+                                   "llm": {**llm,
+                                           "usage": dict(llm["usage"]),
+                                           "latency_seconds": round(llm["latency_seconds"], 4),
+                                           "mean_latency_seconds": round(llm["latency_seconds"] / llm["calls"], 4)
+                                           if llm["calls"] else None}}
+        if with_tools:
+            summary["tools"] = dict(sorted(aggregate["tools"].items(),
+                                           key=lambda item: item[1], reverse=True))
+        else:
+            summary.pop("tools")
+            summary.pop("last_turn", None)
+        return summary
@@ -40,3 +40,11 @@ class IMCPServer(ABC):
     @abstractmethod
     def supported_prompts(self) -> List[Tuple[str, Callable]]:
         self._raise_not_implemented("supported_prompts")
+
+    @property
+    def readiness_checks(self) -> List[Tuple[str, Callable[[], bool]]]:
+        """
+        Optional named dependency checks, run in the background after the server is
+        created. The server reports ready on /ready once all of them have passed.
+        """
+        return []
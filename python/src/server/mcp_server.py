@@ -1,20 +1,27 @@
 import logging
 import os
-import json
 from enum import Enum
 from re import I
-from typing import Any, Literal, List, Callable, Tuple, Union
-from functools import partial
+from typing import Any, Dict, Literal, List, Callable, Optional, Tuple
 from pathlib import Path
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ToolAnnotations
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 from network_utils import NetworkUtils
+from readiness import Readiness
+from mcp_server_config import MCPServerConfig, PromptDescriptor, ResourceDescriptor, ToolDescriptor
 from i_mcp_server import IMCPServer
+from tool_metrics import ToolMetrics
+from tool_profiler import ToolProfiler
+from tracing import Tracer, get_tracer
 
 
 class MCPServer:
     logger: logging.Logger = logging.getLogger("mcp-server")
 
+    NETWORK_CHECK_TIMEOUT_SECONDS: float = 5.0
+
     class MCPServerDetail(str, Enum):
         NAME = "name"
         INSTRUNCTIONS = "instructions"
@@ -32,40 +39,14 @@ class MCPServer:
         def __str__(self) -> Literal['tools', 'resources', 'prompts', 'resource_templates']:
             return self.value
 
-    class MCPServerToolMetaData(str, Enum):
-        NAME = "name"
-        DESCRIPTION = "description"
-        TITLE = "annotations.title"
-        READ_ONLY_HINT = "annotations.readOnlyHint"
-        DESTRUCTIVE_HINT = "annotations.destructiveHint"
-        IDEMPOTENT_HINT = "annotations.idempotentHint"
-        OPEN_WORLD_HINT = "annotations.openWorldHint"
-
-        def __str__(self) -> Literal['name', 'description', 'annotations.title', 'annotations.readOnlyHint', 'annotations.destructiveHint', 'annotations.idempotentHint', 'annotations.openWorldHint']:
-            return self.value
-
-    class MCPServerResourceMetaData(str, Enum):
-        NAME = "name"
-        DESCRIPTION = "description"
-        TITLE = "annotations.title"
-        URI = "uri"
-
-        def __str__(self) -> Literal['name', 'description', 'annotations.title', 'uri']:
-            return self.value
-
-    class MCPServerPromptMetaData(str, Enum):
-        NAME = "name"
-        DESCRIPTION = "description"
-
-        def __str__(self) -> Literal['name', 'description']:
-            return self.value
-
     def __init__(self,
                  host: str,
                  port: int,
                  config_dir: Path,
                  config_file: Path,
-                 server_instance: IMCPServer) -> None:
+                 server_instance: IMCPServer,
+                 metrics_enabled: bool = False,
+                 config_cache_dir: Optional[Path] = None) -> None:
 
         self._host: str = host
         self._port: int = port
@@ -79,11 +60,18 @@ class MCPServer:
             raise ValueError(
                 f"Invalid port: [{self._port}]. Port must be an integer between 1 and 65535")
 
-        if not NetworkUtils.is_free_port(self._host, self._port):
+        # Port bind test and DNS resolution are independent, so run them concurrently.
+        network_checks = Readiness.run_concurrently(
+            [("port", lambda: NetworkUtils.is_free_port(self._host, self._port)),
+             ("host", lambda: NetworkUtils.is_resolvable_hostname(self._host))],
+            timeout_seconds=MCPServer.NETWORK_CHECK_TIMEOUT_SECONDS,
+            logger=self.logger)
+
+        if network_checks["port"] != Readiness.Status.READY:
             raise ValueError(
                 f"Given Port {self._port} is not available to use on host {self._host}.")
 
-        if not NetworkUtils.is_resolvable_hostname(self._host):
+        if network_checks["host"] != Readiness.Status.READY:
             raise ValueError(
                 f"Invalid host: [{self._host}]. Hostname could not be resolved.")
 
@@ -92,13 +80,11 @@ class MCPServer:
         try:
             self._config_file_path = Path(
                 config_dir) / Path(config_file)
-            if not self._config_file_path.is_file():
-                raise ValueError(
-                    f"Config file does not exist: [{self._config_file_path}]")
-            with open(self._config_file_path, "r", encoding="utf-8") as f:
-                self._meta = json.load(f)
-                self.logger.info(
-                    f"configuration loaded from: '[{self._config_file_path}]'")
+            self._config: MCPServerConfig = MCPServerConfig.load(self._config_file_path,
+                                                                 cache_dir=config_cache_dir,
+                                                                 logger=self.logger)
+            self.logger.info(
+                f"configuration loaded from: '[{self._config_file_path}]'")
         except Exception as e:
             # Log the path that was attempted
             msg: str = f"Error loading metadata from config file: [{self._config_file_path}]"
@@ -110,84 +96,122 @@ class MCPServer:
         self.logger.info(f"host: '[{self._host}]'")
         self.logger.info(f"port: [{self._port}]")
 
-        self._mcp = FastMCP(name=self._meta[MCPServer.MCPServerDetail.NAME],
-                            instructions=self._meta[MCPServer.MCPServerDetail.INSTRUNCTIONS],
+        self._mcp = FastMCP(name=self._config.name,
+                            instructions=self._config.instructions,
                             host=self._host,
                             port=self._port)
         self.logger.info("MCP Server instance created")
 
+        self._tracer: Tracer = get_tracer()
+        self._tracer.set_service_name(os.environ.get(str(Tracer.EnvVars.SERVICE_NAME),
+                                                     self._config.name))
+
+        self._metrics: Optional[ToolMetrics] = None
+        if metrics_enabled:
+            self._metrics = ToolMetrics(
+                server_name=self._config.name)
+            self._register_metrics_route()
+
+        self._profiler: Optional[ToolProfiler] = ToolProfiler.from_config(
+            server_name=self._config.name,
+            config=self._config.extras,
+            logger=self.logger)
+        if self._profiler is not None and ToolProfiler.admin_tool_enabled(self._config.extras):
+            self._register_profiling_tool()
+
         self._register_tools(self._server.supported_tools)
         self._register_resources(self._server.supported_resources)
         self._register_prompts(self._server.supported_prompts)
+
+        # Dependencies warm up in the background while the server starts accepting traffic.
+        self._readiness: Readiness = Readiness(logger=self.logger)
+        for check_name, check in self._server.readiness_checks:
+            self._readiness.add_check(check_name, check)
+        self._register_readiness_route()
+        self._readiness.start()
         self.logger.info("MCP Server instanc fully initialized")
 
-    def _get_meta(self,
-                  meta_type: Union['MCPServer.MCPServerCapabilityType', str],
-                  name: str,
-                  item_path: Union['MCPServer.MCPServerToolMetaData', 'MCPServer.MCPServerResourceMetaData', 'MCPServer.MCPServerPromptMetaData', str]) -> Any:
-        try:
-            # Ensure meta_type and item_path are strings if they are Enum members
-            meta_type_str = str(meta_type)
-            item_path_str = str(item_path)
-
-            keys = [meta_type_str, name]
-            if "." in item_path_str:
-                keys.extend(item_path_str.split("."))
-            else:
-                keys.append(item_path_str)
-
-            value = self._meta
-            current_path_for_error = ""
-            for k_idx, k_val in enumerate(keys):
-                # First two keys (meta_type_str, name) are direct lookups in the structure like self._meta['tools']['add']
-                # Subsequent keys from item_path_str navigate within that specific tool/resource/prompt's dict.
-                if k_idx == 0:  # meta_type_str
-                    current_path_for_error = f"['{k_val}']"
-                    if k_val not in value:
-                        raise KeyError(f"Meta type key '{k_val}' not found.")
-                    value = value[k_val]
-                elif k_idx == 1:  # name (e.g. 'add')
-                    current_path_for_error += f"['{k_val}']"
-                    if k_val not in value:
-                        raise KeyError(
-                            f"Item name key '{k_val}' not found under '{keys[0]}'.")
-                    value = value[k_val]
-                else:  # keys from item_path
-                    current_path_for_error += f"['{k_val}']"
-                    # Check if value is a dict before key access
-                    if not isinstance(value, dict) or k_val not in value:
-                        raise KeyError(
-                            f"Key '{k_val}' not found at path {current_path_for_error}.")
-                    value = value[k_val]
-            return value
-        except KeyError as ke_original:
-            full_path_str = f"{str(meta_type)} -> {name} -> {str(item_path)}"
-            raise ValueError(
-                f"Metadata not found for {full_path_str}. Details: {str(ke_original)}") from ke_original
+    def _register_metrics_route(self) -> None:
+        async def metrics(_request: Request) -> Response:
+            body: str = self._metrics.render_prometheus() if self._metrics else ""
+            return Response(content=body, media_type=ToolMetrics.CONTENT_TYPE)
+
+        self._mcp.custom_route("/metrics", methods=["GET"])(metrics)
+        self.logger.info(
+            f"Tool metrics enabled, exposed at http://{self._host}:{self._port}/metrics")
+
+    def _register_readiness_route(self) -> None:
+        async def ready(_request: Request) -> JSONResponse:
+            snapshot: Dict[str, Any] = self._readiness.snapshot()
+            return JSONResponse(content=snapshot,
+                                status_code=200 if snapshot["ready"] else 503)
+
+        self._mcp.custom_route("/ready", methods=["GET"])(ready)
+
+    def _register_profiling_tool(self) -> None:
+        profiler: ToolProfiler = self._profiler
+
+        def configure_tool_profiling(enabled: Optional[bool] = None,
+                                     tools: Optional[List[str]] = None,
+                                     every_nth: Optional[int] = None,
+                                     mode: Optional[str] = None) -> Dict[str, Any]:
+            try:
+                return profiler.configure(enabled=enabled,
+                                          tools=tools,
+                                          every_nth=every_nth,
+                                          mode=mode)
+            except ValueError as e:
+                msg: str = f"Invalid profiling settings: {str(e)}"
+                self.logger.error(msg)
+                return {"error": msg}
+
+        self._mcp.tool(
+            name=ToolProfiler.ADMIN_TOOL_NAME,
+            description="Admin: enable or disable tool profiling, select the tools to profile (empty for all), "
+                        "profile every Nth call and choose the mode (sample or cprofile). "
+                        "Returns the profiling settings now in effect.",
+            annotations=ToolAnnotations(
+                title="Configure tool profiling",
+                readOnlyHint=False,
+                destructiveHint=False,
+                idempotentHint=True,
+                openWorldHint=False,
+            ),
+        )(configure_tool_profiling)
+        self.logger.info(
+            f"Tool profiling admin tool [{ToolProfiler.ADMIN_TOOL_NAME}] registered")
+
+    def _request_traceparent(self) -> Optional[str]:
+        request_context = self._mcp.get_context().request_context
+        if request_context is None or request_context.meta is None:
+            return None
+        return self._tracer.extract(request_context.meta.model_extra)
+
+    def _instrument_tool(self,
+                         tool_name: str,
+                         tool_func: Callable) -> Callable:
+        # Tools are registered as-is when profiling, metrics and tracing are disabled, so there is no per call overhead.
+        if self._profiler is not None:
+            tool_func = self._profiler.instrument(tool_name, tool_func)
+        if self._metrics is not None:
+            tool_func = self._metrics.instrument(tool_name, tool_func)
+        return self._tracer.wrap(f"MCPServer.tool.{tool_name}",
+                                 tool_func,
+                                 traceparent_getter=self._request_traceparent,
+                                 tool=tool_name)
 
     def _register_tools(self,
                         tools_to_add: List[Tuple[str, Callable]]) -> None:
         self.logger.info("MCP Server Registering tools started")
         for tool_name, tool_func in tools_to_add:
             try:
-                get_meta = partial(
-                    self._get_meta, MCPServer.MCPServerCapabilityType.TOOLS, tool_name)
+                tool: ToolDescriptor = self._config.tool(tool_name)
                 self._mcp.tool(
-                    name=get_meta(MCPServer.MCPServerToolMetaData.NAME),
-                    description=get_meta(
-                        MCPServer.MCPServerToolMetaData.DESCRIPTION),
-                    annotations=ToolAnnotations(
-                        title=get_meta(MCPServer.MCPServerToolMetaData.TITLE),
-                        readOnlyHint=get_meta(
-                            MCPServer.MCPServerToolMetaData.READ_ONLY_HINT),
-                        destructiveHint=get_meta(
-                            MCPServer.MCPServerToolMetaData.DESTRUCTIVE_HINT),
-                        idempotentHint=get_meta(
-                            MCPServer.MCPServerToolMetaData.IDEMPOTENT_HINT),
-                        openWorldHint=get_meta(
-                            MCPServer.MCPServerToolMetaData.OPEN_WORLD_HINT),
-                    ),
-                )(tool_func)
+                    name=tool.name,
+                    description=tool.description,
+                    annotations=tool.annotations.to_tool_annotations(),
+                    meta=tool.to_meta(),
+                )(self._instrument_tool(tool_name, tool_func))
                 self.logger.info(f"Tool [{tool_name}] registered")
             except Exception as e:
                 raise RuntimeError(
@@ -199,13 +223,12 @@ class MCPServer:
         self.logger.info("MCP Server Registering resources started")
         for resource_name, resource_func in resources_to_add:
             try:
-                get_meta = partial(
-                    self._get_meta, MCPServer.MCPServerCapabilityType.RESOURCES, resource_name)
+                resource: ResourceDescriptor = self._config.resource(
+                    resource_name)
                 self._mcp.resource(
-                    uri=get_meta(MCPServer.MCPServerResourceMetaData.URI),
-                    name=get_meta(MCPServer.MCPServerResourceMetaData.NAME),
-                    description=get_meta(
-                        MCPServer.MCPServerResourceMetaData.DESCRIPTION)
+                    uri=resource.uri,
+                    name=resource.name,
+                    description=resource.description
                 )(resource_func)
                 self.logger.info(f"Resource [{resource_name}] registered")
             except Exception as e:
@@ -219,12 +242,10 @@ class MCPServer:
         self.logger.info("MCP Server Registering prompts started")
         for prompt_name, prompt_func in prompts_to_add:
             try:
-                get_meta = partial(
-                    self._get_meta, MCPServer.MCPServerCapabilityType.PROMPTS, prompt_name)
+                prompt: PromptDescriptor = self._config.prompt(prompt_name)
                 self._mcp.prompt(
-                    name=get_meta(MCPServer.MCPServerPromptMetaData.NAME),
-                    description=get_meta(
-                        MCPServer.MCPServerPromptMetaData.DESCRIPTION)
+                    name=prompt.name,
+                    description=prompt.description
                 )(prompt_func)
                 self.logger.info(f"Prompt [{prompt_name}] registered")
             except Exception as e:
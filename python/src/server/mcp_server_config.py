@@ -0,0 +1,185 @@
+import hashlib
+import logging
+import os
+import re
+from enum import Enum
+from pathlib import Path
+from typing import Any, ClassVar, Dict, Optional
+from pydantic import BaseModel, ConfigDict, ValidationError
+from mcp.types import ToolAnnotations
+
+
+class ToolAnnotationsDescriptor(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    title: str
+    readOnlyHint: bool
+    destructiveHint: bool
+    idempotentHint: bool
+    openWorldHint: bool
+
+    def to_tool_annotations(self) -> ToolAnnotations:
+        return ToolAnnotations(title=self.title,
+                               readOnlyHint=self.readOnlyHint,
+                               destructiveHint=self.destructiveHint,
+                               idempotentHint=self.idempotentHint,
+                               openWorldHint=self.openWorldHint)
+
+
+class ToolDescriptor(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    CACHE_TTL_META_KEY: ClassVar[str] = "cache_ttl_seconds"
+
+    name: str
+    description: str
+    annotations: ToolAnnotationsDescriptor
+    # Seconds a client may cache the tool's response, only for read only and idempotent tools.
+    cache_ttl_seconds: Optional[float] = None
+
+    def to_meta(self) -> Optional[Dict[str, Any]]:
+        if self.cache_ttl_seconds is None:
+            return None
+        return {self.CACHE_TTL_META_KEY: self.cache_ttl_seconds}
+
+
+class ResourceDescriptor(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    name: str
+    uri: str
+    description: str
+
+
+class PromptDescriptor(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    name: str
+    description: str
+
+
+class MCPServerConfig(BaseModel):
+    """
+    Server config JSON validated and compiled into typed tool, resource and prompt
+    descriptors. Sections other than the capabilities (serverInfo, transport, profiling
+    etc.) are kept as extra fields.
+
+    The compiled config can be cached across restarts in a cache directory as JSON,
+    keyed by the hash of the config file content, so an unchanged config is not parsed
+    and checked against the raw file again. Compiled configs of older content of the
+    same file are removed when a new one is written.
+    """
+    model_config = ConfigDict(extra="allow")
+
+    # Bump when the descriptor models change so stale compiled configs are ignored.
+    COMPILED_VERSION: ClassVar[str] = "3"
+    COMPILED_SUFFIX: ClassVar[str] = ".compiled"
+
+    class EnvVars(str, Enum):
+        CACHE_DIR = "MCP_CONFIG_CACHE_DIR"
+
+        def __str__(self) -> str:
+            return self.value
+
+    name: str
+    instructions: str
+    version: str
+    tools: Dict[str, ToolDescriptor] = {}
+    resources: Dict[str, ResourceDescriptor] = {}
+    prompts: Dict[str, PromptDescriptor] = {}
+
+    @property
+    def extras(self) -> Dict[str, Any]:
+        return dict(self.model_extra or {})
+
+    def tool(self, name: str) -> ToolDescriptor:
+        if name not in self.tools:
+            raise ValueError(f"Metadata not found for tools -> {name}")
+        return self.tools[name]
+
+    def resource(self, name: str) -> ResourceDescriptor:
+        if name not in self.resources:
+            raise ValueError(f"Metadata not found for resources -> {name}")
+        return self.resources[name]
+
+    def prompt(self, name: str) -> PromptDescriptor:
+        if name not in self.prompts:
+            raise ValueError(f"Metadata not found for prompts -> {name}")
+        return self.prompts[name]
+
+    @classmethod
+    def _compiled_path(cls,
+                       cache_dir: Path,
+                       config_file_path: Path,
+                       source: bytes) -> Path:
+        digest: str = hashlib.sha256(
+            cls.COMPILED_VERSION.encode("utf-8") + source).hexdigest()
+        return Path(cache_dir) / f"{config_file_path.stem}.{digest[:16]}{cls.COMPILED_SUFFIX}"
+
+    @classmethod
+    def _remove_stale_compiled(cls,
+                               compiled_path: Path,
+                               config_file_path: Path,
+                               log: logging.Logger) -> None:
+        pattern: re.Pattern = re.compile(
+            rf"{re.escape(config_file_path.stem)}\.[0-9a-f]{{16}}{re.escape(cls.COMPILED_SUFFIX)}")
+        for path in compiled_path.parent.glob(f"*{cls.COMPILED_SUFFIX}"):
+            if path != compiled_path and pattern.fullmatch(path.name):
+                try:
+                    path.unlink()
+                    log.debug(f"Removed stale compiled config [{path}]")
+                except OSError as e:
+                    log.warning(
+                        f"Unable to remove stale compiled config [{path}]: {str(e)}")
+
+    @classmethod
+    def load(cls,
+             config_file_path: Path,
+             cache_dir: Optional[Path] = None,
+             logger: Optional[logging.Logger] = None) -> "MCPServerConfig":
+        """
+        Load and validate the given config file. If a cache directory is given (or set
+        in the environment) a compiled config for the same file content is reused, and
+        a newly validated config is written back to the cache.
+        """
+        log: logging.Logger = logger if logger else logging.getLogger(
+            "mcp-server")
+        config_file_path = Path(config_file_path)
+        if not config_file_path.is_file():
+            raise ValueError(
+                f"Config file does not exist: [{config_file_path}]")
+        source: bytes = config_file_path.read_bytes()
+
+        if cache_dir is None and os.environ.get(str(cls.EnvVars.CACHE_DIR)):
+            cache_dir = Path(os.environ[str(cls.EnvVars.CACHE_DIR)])
+        compiled_path: Optional[Path] = cls._compiled_path(
+            cache_dir, config_file_path, source) if cache_dir else None
+
+        if compiled_path is not None and compiled_path.is_file():
+            try:
+                config = cls.model_validate_json(compiled_path.read_bytes())
+                log.info(
+                    f"Compiled configuration loaded from: [{compiled_path}]")
+                return config
+            except Exception as e:  # pylint: disable=broad-except
+                log.warning(
+                    f"Ignoring unreadable compiled config [{compiled_path}]: {str(e)}")
+
+        try:
+            config = cls.model_validate_json(source)
+        except ValidationError as e:
+            raise ValueError(
+                f"Invalid config file [{config_file_path}]: {str(e)}") from e
+
+        if compiled_path is not None:
+            try:
+                compiled_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = compiled_path.with_suffix(f".tmp{os.getpid()}")
+                tmp_path.write_text(config.model_dump_json(), encoding="utf-8")
+                os.replace(tmp_path, compiled_path)
+                log.info(f"Compiled configuration cached at: [{compiled_path}]")
+                cls._remove_stale_compiled(compiled_path, config_file_path, log)
+            except Exception as e:  # pylint: disable=broad-except
+                log.warning(
+                    f"Unable to cache compiled config at [{compiled_path}]: {str(e)}")
+        return config
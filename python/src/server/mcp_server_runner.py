@@ -61,6 +61,13 @@ class MCPServerRunner:
                             help="Optional path to auxiliary database, usually tunneled to sub-systems(default: None)")
         parser.add_argument("--aux-db-name", type=Path, default=None,
                             help="Optional name of auxiliary database, usually tunneled to sub-systems(default: None)")
+        parser.add_argument("--metrics", action="store_true",
+                            default=os.environ.get(
+                                "MCP_METRICS_ENABLED", "false").lower() == "true",
+                            help="Expose per tool call metrics in Prometheus format on /metrics (env: MCP_METRICS_ENABLED)")
+        parser.add_argument("--config-cache-dir", type=Path,
+                            default=os.environ.get("MCP_CONFIG_CACHE_DIR"),
+                            help="Optional directory to cache the compiled server config across restarts (env: MCP_CONFIG_CACHE_DIR)")
         return parser.parse_args()
 
     def run(self) -> None:
@@ -130,7 +137,9 @@ class MCPServerRunner:
                                           config_dir=args.config_dir,
                                           config_file=Path(
                                               server_config_file_name),
-                                          server_instance=server_instance)
+                                          server_instance=server_instance,
+                                          metrics_enabled=args.metrics,
+                                          config_cache_dir=args.config_cache_dir)
 
             # The MCPServer's run method is blocking.
             server.run()
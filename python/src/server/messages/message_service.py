@@ -14,6 +14,7 @@ from i_mcp_server import IMCPServer
 from pydantic import Field
 from langchain.prompts import PromptTemplate
 import requests
+from tracing import get_tracer
 
 
 class MessageService(IMCPServer):
@@ -151,9 +152,14 @@ class MessageService(IMCPServer):
     #
 
     def _invoke_message_url(self, url: str, channel_id: str, message: str) -> bool:
+        tracer = get_tracer()
+        with tracer.span("MessageService.invoke_message_url", channel_id=channel_id):
+            return self._post_to_message_url(url=url, headers=tracer.inject())
+
+    def _post_to_message_url(self, url: str, headers: Dict[str, str]) -> bool:
         try:
             # Send simple POST request with URL parameters
-            response = requests.post(url)
+            response = requests.post(url, headers=headers)
             if response.status_code == 200:
                 self._log.info(f"Message sent successfully: {url}")
                 return True
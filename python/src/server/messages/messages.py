@@ -11,6 +11,7 @@ import requests
 
 from json_message_keys import JsonMessageKeys
 from mcp_client_web_server import MCPClientWebServer
+from tracing import get_tracer
 
 
 # Only works for single subscriber, multiple subscribers will need a more complex solution
@@ -324,6 +325,12 @@ class MessageService:
     def _post_message_to_document_storage(self,
                                           message: str,
                                           channel_id: uuid.UUID) -> bool:
+        with get_tracer().span("MessageService.post_message_to_document_storage"):
+            return self._post_document(message=message, channel_id=channel_id)
+
+    def _post_document(self,
+                       message: str,
+                       channel_id: uuid.UUID) -> bool:
         try:
             # Create document combining message, channel_id and timestamp
             timestamp = int(time.time())
@@ -350,7 +357,9 @@ class MessageService:
             url = f"http://{self._document_storage_host}:{self._document_storage_port}/add_document?document={encoded_document}&document_type=message{desk_param}"
 
             # Make the request
-            response = requests.get(url, timeout=5)  # 5 second timeout
+            response = requests.get(url,
+                                    headers=get_tracer().inject(),
+                                    timeout=5)  # 5 second timeout
             if response.status_code == 200:
                 self._log.debug(
                     f"Message document posted successfully to storage: {url}")
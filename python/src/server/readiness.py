@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class Readiness:
+    """
+    Runs named dependency checks concurrently, each in its own daemon thread and each
+    with a timeout, so a server can accept traffic while slower dependencies warm up.
+    The server is ready once every required check has passed; a check that finishes
+    after its timeout still updates its status.
+    """
+
+    DEFAULT_TIMEOUT_SECONDS: float = 10.0
+
+    class Status(str, Enum):
+        PENDING = "pending"
+        READY = "ready"
+        FAILED = "failed"
+        TIMED_OUT = "timed_out"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class _Check:
+        def __init__(self,
+                     name: str,
+                     check: Callable[[], bool],
+                     timeout_seconds: float,
+                     required: bool) -> None:
+            self.name: str = name
+            self.check: Callable[[], bool] = check
+            self.timeout_seconds: float = timeout_seconds
+            self.required: bool = required
+            self.started: Optional[float] = None
+            self.elapsed: Optional[float] = None
+            self.passed: Optional[bool] = None
+            self.error: Optional[str] = None
+            self.done: threading.Event = threading.Event()
+
+        @property
+        def status(self) -> "Readiness.Status":
+            if self.passed is not None:
+                return Readiness.Status.READY if self.passed else Readiness.Status.FAILED
+            if self.started is not None and time.monotonic() - self.started > self.timeout_seconds:
+                return Readiness.Status.TIMED_OUT
+            return Readiness.Status.PENDING
+
+    def __init__(self,
+                 timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+                 logger: Optional[logging.Logger] = None) -> None:
+        self._log: logging.Logger = logger if logger else logging.getLogger(
+            "mcp-server")
+        self._timeout_seconds: float = timeout_seconds
+        self._checks: Dict[str, Readiness._Check] = {}
+
+    def add_check(self,
+                  name: str,
+                  check: Callable[[], bool],
+                  timeout_seconds: Optional[float] = None,
+                  required: bool = True) -> None:
+        if name in self._checks:
+            raise ValueError(f"Readiness check [{name}] already added")
+        self._checks[name] = Readiness._Check(name=name,
+                                              check=check,
+                                              timeout_seconds=timeout_seconds or self._timeout_seconds,
+                                              required=required)
+
+    def _run_check(self, check: "Readiness._Check") -> None:
+        try:
+            check.passed = bool(check.check())
+        except Exception as e:  # pylint: disable=broad-except
+            check.error = str(e)
+            check.passed = False
+        check.elapsed = time.monotonic() - check.started
+        if check.passed:
+            self._log.info(
+                f"Readiness check [{check.name}] passed in {check.elapsed:.3f}s")
+        else:
+            self._log.error(
+                f"Readiness check [{check.name}] failed in {check.elapsed:.3f}s {check.error or ''}")
+        check.done.set()
+
+    def start(self) -> None:
+        """
+        Start all checks not yet started in the background and return immediately.
+        """
+        for check in self._checks.values():
+            if check.started is None:
+                check.started = time.monotonic()
+                threading.Thread(target=self._run_check,
+                                 args=(check,),
+                                 name=f"readiness-{check.name}",
+                                 daemon=True).start()
+
+    def wait(self, timeout_seconds: Optional[float] = None) -> bool:
+        """
+        Wait for all checks to finish or time out, return True if ready.
+        """
+        self.start()
+        deadline: Optional[float] = time.monotonic() + \
+            timeout_seconds if timeout_seconds is not None else None
+        for check in self._checks.values():
+            remaining: float = check.started + check.timeout_seconds - time.monotonic()
+            if deadline is not None:
+                remaining = min(remaining, deadline - time.monotonic())
+            check.done.wait(max(0.0, remaining))
+        return self.ready
+
+    @property
+    def ready(self) -> bool:
+        return all(check.status == Readiness.Status.READY
+                   for check in self._checks.values() if check.required)
+
+    def status(self, name: str) -> "Readiness.Status":
+        return self._checks[name].status
+
+    def snapshot(self) -> Dict[str, Any]:
+        checks: Dict[str, Any] = {}
+        for check in self._checks.values():
+            detail: Dict[str, Any] = {"status": str(check.status),
+                                      "required": check.required}
+            if check.elapsed is not None:
+                detail["elapsed_seconds"] = round(check.elapsed, 3)
+            if check.error:
+                detail["error"] = check.error
+            checks[check.name] = detail
+        return {"ready": self.ready, "checks": checks}
+
+    @classmethod
+    def run_concurrently(cls,
+                         checks: List[Tuple[str, Callable[[], bool]]],
+                         timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+                         logger: Optional[logging.Logger] = None) -> Dict[str, "Readiness.Status"]:
+        """
+        Run the given checks concurrently and block until all finish or time out.
+        """
+        readiness = cls(timeout_seconds=timeout_seconds, logger=logger)
+        for name, check in checks:
+            readiness.add_check(name, check)
+        readiness.wait()
+        return {name: readiness.status(name) for name, _ in checks}
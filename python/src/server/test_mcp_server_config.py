@@ -0,0 +1,85 @@
+import json
+import logging
+from pathlib import Path
+import pytest
+from mcp_server_config import MCPServerConfig
+
+# Configure logging for tests
+logger = logging.getLogger("MCPServerConfigTest")
+logging.basicConfig(level=logging.DEBUG)
+
+CONFIG_DIR: Path = Path(__file__).resolve().parents[3] / "config"
+
+
+@pytest.mark.parametrize("config_file", sorted(CONFIG_DIR.glob("*_server_config.json")), ids=lambda p: p.name)
+def test_repo_configs_compile(config_file: Path):
+    """
+    Tests every server config in the repo validates into descriptors.
+    """
+    config = MCPServerConfig.load(config_file)
+    raw = json.loads(config_file.read_text(encoding="utf-8"))
+    assert config.name == raw["name"]
+    assert set(config.tools) == set(raw.get("tools", {}))
+    for tool in config.tools.values():
+        assert tool.annotations.to_tool_annotations().title == tool.annotations.title
+
+
+def test_compiled_config_is_cached(tmp_path: Path):
+    """
+    Tests the compiled config is reused for the same content and rebuilt when the file changes.
+    """
+    config_file = tmp_path / "test_server_config.json"
+    raw = json.loads((CONFIG_DIR / "hello_world_server_config.json").read_text(encoding="utf-8"))
+    config_file.write_text(json.dumps(raw), encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+
+    first = MCPServerConfig.load(config_file, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.compiled"))) == 1
+    second = MCPServerConfig.load(config_file, cache_dir=cache_dir)
+    assert second == first
+    assert second.extras["transport"] == raw["transport"]
+
+    raw["instructions"] = "changed"
+    config_file.write_text(json.dumps(raw), encoding="utf-8")
+    other_file = tmp_path / "other_server_config.json"
+    other_file.write_text(json.dumps(raw), encoding="utf-8")
+    MCPServerConfig.load(other_file, cache_dir=cache_dir)
+    stale = next(cache_dir.glob("test_server_config.*.compiled"))
+    assert MCPServerConfig.load(config_file, cache_dir=cache_dir).instructions == "changed"
+    # The compiled config of the old content is replaced, other configs are kept.
+    compiled = sorted(cache_dir.glob("*.compiled"))
+    assert len(compiled) == 2 and stale not in compiled
+    assert MCPServerConfig.model_validate_json(
+        next(cache_dir.glob("test_server_config.*.compiled")).read_bytes()).instructions == "changed"
+
+
+def test_unreadable_compiled_config_is_rebuilt(tmp_path: Path):
+    """
+    Tests a compiled config that is not valid JSON is ignored and written again.
+    """
+    config_file = tmp_path / "test_server_config.json"
+    config_file.write_bytes((CONFIG_DIR / "hello_world_server_config.json").read_bytes())
+    cache_dir = tmp_path / "cache"
+    expected = MCPServerConfig.load(config_file, cache_dir=cache_dir)
+    compiled = next(cache_dir.glob("*.compiled"))
+    compiled.write_bytes(b"\x80\x04not json")
+
+    assert MCPServerConfig.load(config_file, cache_dir=cache_dir) == expected
+    assert MCPServerConfig.model_validate_json(compiled.read_bytes()) == expected
+
+
+def test_invalid_config_is_rejected(tmp_path: Path):
+    """
+    Tests a tool without annotations fails validation and a missing tool is reported.
+    """
+    config_file = tmp_path / "bad_server_config.json"
+    config_file.write_text(json.dumps({"name": "Bad", "instructions": "", "version": "1",
+                                       "tools": {"add": {"name": "add", "description": "add"}}}),
+                           encoding="utf-8")
+    with pytest.raises(ValueError):
+        MCPServerConfig.load(config_file)
+
+    config_file.write_text(json.dumps({"name": "Empty", "instructions": "", "version": "1"}),
+                           encoding="utf-8")
+    with pytest.raises(ValueError):
+        MCPServerConfig.load(config_file).tool("add")
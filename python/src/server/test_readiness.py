@@ -0,0 +1,62 @@
+import logging
+import threading
+import time
+from readiness import Readiness
+
+# Configure logging for tests
+logger = logging.getLogger("ReadinessTest")
+logging.basicConfig(level=logging.DEBUG)
+
+
+def test_checks_run_concurrently():
+    """
+    Tests checks run in parallel, so total time is the slowest check not the sum.
+    """
+    def slow() -> bool:
+        time.sleep(0.2)
+        return True
+
+    start = time.monotonic()
+    statuses = Readiness.run_concurrently([("a", slow), ("b", slow), ("c", slow)])
+    elapsed = time.monotonic() - start
+    logger.info(f"Checks took {elapsed:.3f}s")
+    assert all(status == Readiness.Status.READY for status in statuses.values())
+    assert elapsed < 0.5
+
+
+def test_timeout_and_late_completion():
+    """
+    Tests a slow check is reported as timed out, then ready once it completes.
+    """
+    release = threading.Event()
+
+    def warming() -> bool:
+        return release.wait(5)
+
+    readiness = Readiness()
+    readiness.add_check("warming", warming, timeout_seconds=0.05)
+    readiness.add_check("optional", lambda: False, required=False)
+    assert readiness.wait() is False
+    assert readiness.status("warming") == Readiness.Status.TIMED_OUT
+    assert readiness.snapshot()["checks"]["optional"]["status"] == "failed"
+
+    release.set()
+    deadline = time.monotonic() + 2
+    while not readiness.ready and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert readiness.ready
+
+
+def test_failing_check_reports_error():
+    """
+    Tests an exception in a check marks it failed with the error message.
+    """
+    def broken() -> bool:
+        raise ConnectionError("refused")
+
+    readiness = Readiness()
+    readiness.add_check("broken", broken)
+    assert readiness.wait() is False
+    check = readiness.snapshot()["checks"]["broken"]
+    assert check["status"] == "failed"
+    assert check["error"] == "refused"
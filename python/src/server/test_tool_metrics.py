@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import pytest
+from tool_metrics import ToolMetrics
+
+# Configure logging for tests
+logger = logging.getLogger("ToolMetricsTest")
+logging.basicConfig(level=logging.DEBUG)
+
+
+@pytest.fixture
+def metrics() -> ToolMetrics:
+    return ToolMetrics(server_name="TestServer")
+
+
+def test_instrumented_tool_records_calls_and_sizes(metrics):
+    """
+    Tests a sync tool keeps its behaviour and the call is recorded.
+    """
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    instrumented = metrics.instrument("add", add)
+    assert instrumented(a=2, b=3) == 5
+    assert instrumented.__name__ == "add"
+
+    stats = metrics.snapshot()["add"]
+    assert stats["calls"] == 1
+    assert stats["errors"] == 0
+    assert stats["request_bytes"] == len('{"a": 2, "b": 3}')
+    assert stats["response_bytes"] == 1
+    assert sum(stats["latency_buckets"]) == 1
+
+
+def test_instrumented_async_tool_records_errors(metrics):
+    """
+    Tests an async tool that raises is counted as an error and the error is re-raised.
+    """
+    async def fail() -> None:
+        raise RuntimeError("tool failed")
+
+    instrumented = metrics.instrument("fail", fail)
+    with pytest.raises(RuntimeError):
+        asyncio.run(instrumented())
+
+    stats = metrics.snapshot()["fail"]
+    assert stats["calls"] == 1
+    assert stats["errors"] == 1
+
+
+def test_render_prometheus(metrics):
+    """
+    Tests the exposition format contains counters, histogram and quantiles per tool.
+    """
+    for latency in (0.001, 0.02, 0.3):
+        metrics.record(tool_name="get_trades",
+                       latency_seconds=latency,
+                       request_bytes=10,
+                       response_bytes=1000,
+                       failed=False)
+    text = metrics.render_prometheus()
+    logger.info(text)
+    labels = '{server="TestServer",tool="get_trades"}'
+    assert f"mcp_tool_calls_total{labels} 3" in text
+    assert f"mcp_tool_response_bytes_total{labels} 3000" in text
+    assert 'mcp_tool_latency_seconds_bucket{server="TestServer",tool="get_trades",le="+Inf"} 3' in text
+    assert 'mcp_tool_latency_quantile_seconds{server="TestServer",tool="get_trades",quantile="0.5"} 0.02' in text
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from pathlib import Path
+import pytest
+from tool_profiler import ToolProfiler
+
+# Configure logging for tests
+logger = logging.getLogger("ToolProfilerTest")
+logging.basicConfig(level=logging.DEBUG)
+
+
+def busy(seconds: float) -> int:
+    end = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < end:
+        n += 1
+    return n
+
+
+def test_every_nth_call_of_selected_tool_is_sampled(tmp_path: Path):
+    """
+    Tests only every Nth call of the selected tool is profiled, rooted at the tool name.
+    """
+    profiler = ToolProfiler(server_name="TestServer",
+                            output_dir=tmp_path,
+                            tools={"slow"},
+                            every_nth=2,
+                            interval_ms=1)
+
+    def slow() -> int:
+        return busy(0.05)
+
+    def other() -> int:
+        return 1
+
+    instrumented_slow = profiler.instrument("slow", slow)
+    instrumented_other = profiler.instrument("other", other)
+    assert instrumented_slow.__name__ == "slow"
+    for _ in range(4):
+        instrumented_slow()
+        instrumented_other()
+
+    files = sorted(tmp_path.glob("*.collapsed"))
+    assert len(files) == 2
+    assert all(f.name.startswith("TestServer_slow_") for f in files)
+    lines = files[0].read_text(encoding="utf-8").splitlines()
+    logger.info(lines)
+    assert all(line.startswith("slow;") for line in lines)
+    assert any("busy (test_tool_profiler.py" in line for line in lines)
+
+
+def test_cprofile_mode_writes_stats_and_collapsed_stacks(tmp_path: Path):
+    """
+    Tests cProfile mode writes the raw stats and collapsed stacks for an async tool.
+    """
+    profiler = ToolProfiler(server_name="TestServer",
+                            output_dir=tmp_path,
+                            mode=ToolProfiler.Mode.CPROFILE)
+
+    async def fetch() -> int:
+        await asyncio.sleep(0)
+        return busy(0.02)
+
+    assert asyncio.run(profiler.instrument("fetch", fetch)()) > 0
+    assert len(list(tmp_path.glob("*.prof"))) == 1
+    collapsed = next(tmp_path.glob("*.collapsed")).read_text(encoding="utf-8")
+    assert "busy (test_tool_profiler.py" in collapsed
+
+
+def test_concurrent_cprofile_calls_fall_back_to_sampling(tmp_path: Path):
+    """
+    Tests async calls overlapping a cProfile session are sampled instead of failing.
+    """
+    profiler = ToolProfiler(server_name="TestServer",
+                            output_dir=tmp_path,
+                            mode=ToolProfiler.Mode.CPROFILE,
+                            interval_ms=1)
+
+    async def fetch() -> int:
+        await asyncio.sleep(0.05)
+        return busy(0.02)
+
+    async def calls() -> list:
+        instrumented = profiler.instrument("fetch", fetch)
+        return await asyncio.gather(instrumented(), instrumented(), instrumented())
+
+    assert all(n > 0 for n in asyncio.run(calls()))
+    assert len(list(tmp_path.glob("*.prof"))) == 1
+    assert len(list(tmp_path.glob("*.collapsed"))) == 3
+
+    # The cProfile session is free again once the profiled call is done.
+    assert asyncio.run(profiler.instrument("fetch", fetch)()) > 0
+    assert len(list(tmp_path.glob("*.prof"))) == 2
+
+
+def test_configure_and_config_section(tmp_path: Path):
+    """
+    Tests the profiler is only created with a profiling section and settings can be changed at runtime.
+    """
+    assert ToolProfiler.from_config("TestServer", {}) is None
+
+    profiler = ToolProfiler.from_config("TestServer",
+                                        {"profiling": {"enabled": False,
+                                                       "output_dir": str(tmp_path),
+                                                       "admin_tool": True}})
+    assert profiler is not None
+    assert ToolProfiler.admin_tool_enabled({"profiling": {"admin_tool": True}})
+
+    def tool() -> int:
+        return 1
+    profiler.instrument("tool", tool)()
+    assert not list(tmp_path.iterdir())
+
+    settings = profiler.configure(enabled=True, every_nth=1, mode="sample")
+    assert settings["enabled"] is True
+    profiler.instrument("tool", tool)()
+    assert len(list(tmp_path.glob("*.collapsed"))) == 1
+
+    with pytest.raises(ValueError):
+        profiler.configure(every_nth=0)
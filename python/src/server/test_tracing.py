@@ -0,0 +1,64 @@
+import logging
+import time
+from pathlib import Path
+import pytest
+from tracing import JsonlSpanExporter, Tracer, critical_path, load_spans
+
+# Configure logging for tests
+logger = logging.getLogger("TracingTest")
+logging.basicConfig(level=logging.DEBUG)
+
+
+@pytest.fixture
+def span_file(tmp_path: Path) -> Path:
+    return tmp_path / "spans.jsonl"
+
+
+def test_disabled_tracer_is_a_no_op():
+    """
+    Tests a tracer without an exporter neither records spans nor injects trace ids.
+    """
+    tracer = Tracer(service_name="test")
+    with tracer.span("nothing") as span:
+        assert span is None
+    assert tracer.inject() == {}
+
+    def tool() -> int:
+        return 1
+    assert tracer.wrap("tool", tool) is tool
+
+
+def test_spans_nest_and_propagate(span_file):
+    """
+    Tests child spans share the trace id and a remote parent is picked up from a traceparent.
+    """
+    client = Tracer(service_name="client", exporter=JsonlSpanExporter(span_file))
+    server = Tracer(service_name="server", exporter=JsonlSpanExporter(span_file))
+
+    with client.span("request") as root:
+        headers = client.inject()
+        with server.continue_trace(server.extract(headers)), server.span("tool") as tool_span:
+            assert tool_span.trace_id == root.trace_id
+            assert tool_span.parent_id == root.span_id
+
+    spans = load_spans(span_file)
+    assert [s.name for s in spans] == ["tool", "request"]
+    assert {s.service for s in spans} == {"client", "server"}
+
+
+def test_critical_path_follows_latest_child(span_file):
+    """
+    Tests the critical path skips a child that overlapped with a slower sibling.
+    """
+    tracer = Tracer(service_name="test", exporter=JsonlSpanExporter(span_file))
+    with tracer.span("root") as root:
+        with tracer.span("fast"):
+            time.sleep(0.01)
+        with tracer.span("slow"):
+            time.sleep(0.03)
+
+    path = critical_path(load_spans(span_file), root.trace_id)
+    names = [entry["span"].name for entry in path]
+    logger.info(f"Critical path: {names}")
+    assert names == ["root", "slow", "fast"]
+    assert path[1]["self_ms"] >= 25
@@ -0,0 +1,235 @@
+import inspect
+import json
+import threading
+import time
+from collections import deque
+from enum import Enum
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+
+class ToolMetrics:
+    """
+    Collects per tool call counts, latency, payload sizes and error counts and
+    renders them in the Prometheus text exposition format.
+
+    Tools are only wrapped when metrics are enabled, so a server running without
+    metrics pays no per call cost at all.
+    """
+
+    LATENCY_BUCKETS: Tuple[float, ...] = (
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+    LATENCY_SAMPLE_SIZE: int = 1024
+    CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+    class MetricName(str, Enum):
+        CALLS = "mcp_tool_calls_total"
+        ERRORS = "mcp_tool_errors_total"
+        LATENCY = "mcp_tool_latency_seconds"
+        LATENCY_QUANTILE = "mcp_tool_latency_quantile_seconds"
+        REQUEST_BYTES = "mcp_tool_request_bytes_total"
+        RESPONSE_BYTES = "mcp_tool_response_bytes_total"
+        RESPONSE_BYTES_MAX = "mcp_tool_response_bytes_max"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class _ToolStats:
+        def __init__(self, bucket_count: int, sample_size: int) -> None:
+            self.calls: int = 0
+            self.errors: int = 0
+            self.latency_sum: float = 0.0
+            self.latency_buckets: List[int] = [0] * bucket_count
+            self.latency_samples: Deque[float] = deque(maxlen=sample_size)
+            self.request_bytes: int = 0
+            self.response_bytes: int = 0
+            self.response_bytes_max: int = 0
+
+    def __init__(self,
+                 server_name: str) -> None:
+        self._server_name: str = server_name
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: Dict[str, ToolMetrics._ToolStats] = {}
+
+    @staticmethod
+    def _payload_size(payload: Any) -> int:
+        if payload is None:
+            return 0
+        if isinstance(payload, (bytes, bytearray)):
+            return len(payload)
+        if isinstance(payload, str):
+            return len(payload.encode("utf-8"))
+        try:
+            return len(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+        except Exception:  # pylint: disable=broad-except
+            return len(str(payload).encode("utf-8"))
+
+    def record(self,
+               tool_name: str,
+               latency_seconds: float,
+               request_bytes: int,
+               response_bytes: int,
+               failed: bool) -> None:
+        with self._lock:
+            stats = self._stats.get(tool_name)
+            if stats is None:
+                stats = ToolMetrics._ToolStats(len(self.LATENCY_BUCKETS),
+                                               self.LATENCY_SAMPLE_SIZE)
+                self._stats[tool_name] = stats
+            stats.calls += 1
+            if failed:
+                stats.errors += 1
+            stats.latency_sum += latency_seconds
+            stats.latency_samples.append(latency_seconds)
+            for idx, bound in enumerate(self.LATENCY_BUCKETS):
+                if latency_seconds <= bound:
+                    stats.latency_buckets[idx] += 1
+                    break
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+            stats.response_bytes_max = max(
+                stats.response_bytes_max, response_bytes)
+
+    def instrument(self,
+                   tool_name: str,
+                   tool_func: Callable) -> Callable:
+        """
+        Wrap the given tool so every call is recorded. The wrapper keeps the
+        signature of the wrapped tool so FastMCP derives the same input schema.
+        """
+        if inspect.iscoroutinefunction(tool_func):
+            @wraps(tool_func)
+            async def async_instrumented(*args, **kwargs) -> Any:
+                start = time.perf_counter()
+                result: Any = None
+                failed: bool = True
+                try:
+                    result = await tool_func(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    self.record(tool_name=tool_name,
+                                latency_seconds=time.perf_counter() - start,
+                                request_bytes=self._payload_size(kwargs),
+                                response_bytes=self._payload_size(result),
+                                failed=failed)
+            return async_instrumented
+
+        @wraps(tool_func)
+        def instrumented(*args, **kwargs) -> Any:
+            start = time.perf_counter()
+            result: Any = None
+            failed: bool = True
+            try:
+                result = tool_func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                self.record(tool_name=tool_name,
+                            latency_seconds=time.perf_counter() - start,
+                            request_bytes=self._payload_size(kwargs),
+                            response_bytes=self._payload_size(result),
+                            failed=failed)
+        return instrumented
+
+    @staticmethod
+    def _quantile(sorted_samples: List[float],
+                  quantile: float) -> float:
+        if not sorted_samples:
+            return 0.0
+        idx = min(len(sorted_samples) - 1,
+                  max(0, int(round(quantile * (len(sorted_samples) - 1)))))
+        return sorted_samples[idx]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Point in time copy of the metrics by tool name, including latency quantiles.
+        """
+        snapshot: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for tool_name, stats in self._stats.items():
+                samples = sorted(stats.latency_samples)
+                snapshot[tool_name] = {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "latency_sum": stats.latency_sum,
+                    "latency_buckets": list(stats.latency_buckets),
+                    "latency_quantiles": {q: self._quantile(samples, q) for q in self.QUANTILES},
+                    "request_bytes": stats.request_bytes,
+                    "response_bytes": stats.response_bytes,
+                    "response_bytes_max": stats.response_bytes_max,
+                }
+        return snapshot
+
+    @staticmethod
+    def _escape_label_value(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def _labels(self, tool_name: str, **extra: str) -> str:
+        labels: Dict[str, str] = {"server": self._server_name,
+                                  "tool": tool_name}
+        labels.update(extra)
+        return "{" + ",".join(f'{k}="{self._escape_label_value(str(v))}"'
+                              for k, v in labels.items()) + "}"
+
+    def render_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines: List[str] = []
+
+        def header(name: ToolMetrics.MetricName, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        header(self.MetricName.CALLS, "counter", "Number of tool invocations.")
+        for tool_name, stats in snapshot.items():
+            lines.append(
+                f"{self.MetricName.CALLS}{self._labels(tool_name)} {stats['calls']}")
+
+        header(self.MetricName.ERRORS, "counter",
+               "Number of tool invocations that raised an error.")
+        for tool_name, stats in snapshot.items():
+            lines.append(
+                f"{self.MetricName.ERRORS}{self._labels(tool_name)} {stats['errors']}")
+
+        header(self.MetricName.LATENCY, "histogram",
+               "Tool invocation latency in seconds.")
+        for tool_name, stats in snapshot.items():
+            cumulative: int = 0
+            for bound, count in zip(self.LATENCY_BUCKETS, stats["latency_buckets"]):
+                cumulative += count
+                lines.append(
+                    f"{self.MetricName.LATENCY}_bucket{self._labels(tool_name, le=repr(bound))} {cumulative}")
+            lines.append(
+                f"{self.MetricName.LATENCY}_bucket{self._labels(tool_name, le='+Inf')} {stats['calls']}")
+            lines.append(
+                f"{self.MetricName.LATENCY}_sum{self._labels(tool_name)} {stats['latency_sum']}")
+            lines.append(
+                f"{self.MetricName.LATENCY}_count{self._labels(tool_name)} {stats['calls']}")
+
+        header(self.MetricName.LATENCY_QUANTILE, "gauge",
+               f"Tool latency quantiles over the last {self.LATENCY_SAMPLE_SIZE} calls.")
+        for tool_name, stats in snapshot.items():
+            for quantile, value in stats["latency_quantiles"].items():
+                lines.append(
+                    f"{self.MetricName.LATENCY_QUANTILE}{self._labels(tool_name, quantile=str(quantile))} {value}")
+
+        header(self.MetricName.REQUEST_BYTES, "counter",
+               "Total size of tool arguments in bytes (JSON encoded).")
+        for tool_name, stats in snapshot.items():
+            lines.append(
+                f"{self.MetricName.REQUEST_BYTES}{self._labels(tool_name)} {stats['request_bytes']}")
+
+        header(self.MetricName.RESPONSE_BYTES, "counter",
+               "Total size of tool results in bytes (JSON encoded).")
+        for tool_name, stats in snapshot.items():
+            lines.append(
+                f"{self.MetricName.RESPONSE_BYTES}{self._labels(tool_name)} {stats['response_bytes']}")
+
+        header(self.MetricName.RESPONSE_BYTES_MAX, "gauge",
+               "Largest single tool result in bytes (JSON encoded).")
+        for tool_name, stats in snapshot.items():
+            lines.append(
+                f"{self.MetricName.RESPONSE_BYTES_MAX}{self._labels(tool_name)} {stats['response_bytes_max']}")
+
+        return "\n".join(lines) + "\n"
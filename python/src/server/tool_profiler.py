@@ -0,0 +1,349 @@
+import cProfile
+import inspect
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from enum import Enum
+from functools import wraps
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+class ToolProfiler:
+    """
+    Opt-in profiling of selected tool invocations. Invocations are selected by tool
+    name and/or every Nth call of a tool. Each profiled invocation is written to the
+    output directory as flamegraph ready collapsed stacks (flamegraph.pl, speedscope,
+    inferno), plus the raw cProfile stats when running in cprofile mode. cProfile allows
+    one session per process, so invocations overlapping a profiled one are sampled.
+
+    Enabled from the "profiling" section of the server config, e.g.
+
+        "profiling": {"enabled": true, "tools": ["get_trades"], "every_nth": 10,
+                      "mode": "sample", "interval_ms": 5, "output_dir": "./profiles",
+                      "admin_tool": false}
+    """
+
+    ADMIN_TOOL_NAME: str = "configure_tool_profiling"
+    # Only one cProfile session can be active per process, calls that overlap one
+    # are sampled instead.
+    _cprofile_lock: threading.Lock = threading.Lock()
+
+    class Mode(str, Enum):
+        SAMPLE = "sample"
+        CPROFILE = "cprofile"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class ConfigKeys(str, Enum):
+        PROFILING = "profiling"
+        ENABLED = "enabled"
+        TOOLS = "tools"
+        EVERY_NTH = "every_nth"
+        MODE = "mode"
+        INTERVAL_MS = "interval_ms"
+        OUTPUT_DIR = "output_dir"
+        ADMIN_TOOL = "admin_tool"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class _StackSampler(threading.Thread):
+        """
+        Samples the stack of one thread at a fixed interval, keeping only the frames
+        below the tool wrapper so every stack is rooted at the profiled tool.
+        """
+
+        def __init__(self,
+                     thread_id: int,
+                     root_frame: FrameType,
+                     root_label: str,
+                     interval_seconds: float) -> None:
+            super().__init__(daemon=True)
+            self._thread_id: int = thread_id
+            self._root_frame: FrameType = root_frame
+            self._root_label: str = root_label
+            self._interval_seconds: float = interval_seconds
+            self._stop_event: threading.Event = threading.Event()
+            self.stacks: Counter = Counter()
+
+        def _sample(self) -> None:
+            frame: Optional[FrameType] = sys._current_frames().get(  # pylint: disable=protected-access
+                self._thread_id)
+            labels: List[str] = []
+            while frame is not None and frame is not self._root_frame:
+                labels.append(ToolProfiler.frame_label(frame))
+                frame = frame.f_back
+            if frame is None:
+                # The tool is suspended (awaiting) so its frames are not on this thread's stack.
+                labels = ["[awaiting]"]
+            labels.append(self._root_label)
+            self.stacks[";".join(reversed(labels))] += 1
+
+        def run(self) -> None:
+            while not self._stop_event.wait(self._interval_seconds):
+                self._sample()
+
+        def stop(self) -> None:
+            self._stop_event.set()
+            self.join()
+
+    def __init__(self,
+                 server_name: str,
+                 output_dir: Path,
+                 mode: "ToolProfiler.Mode" = Mode.SAMPLE,
+                 tools: Optional[Set[str]] = None,
+                 every_nth: int = 1,
+                 interval_ms: float = 5.0,
+                 enabled: bool = True,
+                 logger: Optional[logging.Logger] = None) -> None:
+        self._log: logging.Logger = logger if logger else logging.getLogger(
+            "mcp-server")
+        self._server_name: str = server_name
+        self._output_dir: Path = Path(output_dir)
+        self._lock: threading.Lock = threading.Lock()
+        self._call_counts: Counter = Counter()
+        self._enabled: bool = False
+        self._mode: ToolProfiler.Mode = ToolProfiler.Mode.SAMPLE
+        self._tools: Set[str] = set()
+        self._every_nth: int = 1
+        self._interval_seconds: float = 0.005
+        self.configure(enabled=enabled,
+                       tools=sorted(tools) if tools else [],
+                       every_nth=every_nth,
+                       mode=str(mode),
+                       interval_ms=interval_ms)
+
+    @classmethod
+    def from_config(cls,
+                    server_name: str,
+                    config: Dict[str, Any],
+                    logger: Optional[logging.Logger] = None) -> Optional["ToolProfiler"]:
+        """
+        Create a profiler from the profiling section of a server config, or None if
+        the section is missing, so tools are then registered without any wrapper.
+        """
+        settings: Optional[Dict[str, Any]] = config.get(
+            str(cls.ConfigKeys.PROFILING))
+        if not settings:
+            return None
+        if not isinstance(settings, dict):
+            raise ValueError(
+                f"Config section [{cls.ConfigKeys.PROFILING}] must be an object.")
+        return cls(server_name=server_name,
+                   output_dir=Path(settings.get(
+                       str(cls.ConfigKeys.OUTPUT_DIR), "./profiles")),
+                   mode=cls.Mode(settings.get(
+                       str(cls.ConfigKeys.MODE), cls.Mode.SAMPLE.value)),
+                   tools=set(settings.get(str(cls.ConfigKeys.TOOLS), [])),
+                   every_nth=int(settings.get(
+                       str(cls.ConfigKeys.EVERY_NTH), 1)),
+                   interval_ms=float(settings.get(
+                       str(cls.ConfigKeys.INTERVAL_MS), 5.0)),
+                   enabled=bool(settings.get(
+                       str(cls.ConfigKeys.ENABLED), True)),
+                   logger=logger)
+
+    @staticmethod
+    def admin_tool_enabled(config: Dict[str, Any]) -> bool:
+        settings = config.get(str(ToolProfiler.ConfigKeys.PROFILING)) or {}
+        return isinstance(settings, dict) and bool(settings.get(str(ToolProfiler.ConfigKeys.ADMIN_TOOL), False))
+
+    @staticmethod
+    def frame_label(frame: FrameType) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+    def settings(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                str(self.ConfigKeys.ENABLED): self._enabled,
+                str(self.ConfigKeys.TOOLS): sorted(self._tools),
+                str(self.ConfigKeys.EVERY_NTH): self._every_nth,
+                str(self.ConfigKeys.MODE): str(self._mode),
+                str(self.ConfigKeys.INTERVAL_MS): self._interval_seconds * 1000.0,
+                str(self.ConfigKeys.OUTPUT_DIR): str(self._output_dir),
+            }
+
+    def configure(self,
+                  enabled: Optional[bool] = None,
+                  tools: Optional[List[str]] = None,
+                  every_nth: Optional[int] = None,
+                  mode: Optional[str] = None,
+                  interval_ms: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Change which invocations are profiled; an empty tools list selects all tools.
+        Returns the settings now in effect.
+        """
+        if every_nth is not None and every_nth < 1:
+            raise ValueError(f"every_nth must be 1 or more, got {every_nth}")
+        if interval_ms is not None and interval_ms <= 0:
+            raise ValueError(
+                f"interval_ms must be greater than 0, got {interval_ms}")
+        new_mode: Optional[ToolProfiler.Mode] = ToolProfiler.Mode(
+            mode) if mode is not None else None
+        with self._lock:
+            if enabled is not None:
+                self._enabled = enabled
+            if tools is not None:
+                self._tools = set(tools)
+            if every_nth is not None:
+                self._every_nth = every_nth
+            if new_mode is not None:
+                self._mode = new_mode
+            if interval_ms is not None:
+                self._interval_seconds = interval_ms / 1000.0
+        settings = self.settings()
+        self._log.info(f"Tool profiling settings: {settings}")
+        return settings
+
+    def _should_profile(self, tool_name: str) -> bool:
+        with self._lock:
+            if not self._enabled or (self._tools and tool_name not in self._tools):
+                return False
+            self._call_counts[tool_name] += 1
+            return self._call_counts[tool_name] % self._every_nth == 0
+
+    def _output_path(self, tool_name: str, suffix: str) -> Path:
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        stamp: str = time.strftime("%Y%m%d-%H%M%S")
+        return self._output_dir / f"{self._server_name}_{tool_name}_{stamp}_{time.perf_counter_ns()}{suffix}"
+
+    def _write_collapsed(self, tool_name: str, stacks: Counter) -> Path:
+        path: Path = self._output_path(tool_name, ".collapsed")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                if count > 0:
+                    f.write(f"{stack} {count}\n")
+        self._log.info(f"Profile of tool [{tool_name}] written to [{path}]")
+        return path
+
+    @staticmethod
+    def collapse_pstats(stats: pstats.Stats, root_label: str) -> Counter:
+        """
+        Approximate collapsed stacks from cProfile's caller/callee graph, splitting a
+        function's time across its callers in proportion to the time of each call edge.
+        Counts are microseconds of self time.
+        """
+        raw: Dict[Tuple, Tuple] = stats.stats  # type: ignore[attr-defined]
+        callees: Dict[Tuple, Dict[Tuple, float]] = {}
+        for func, (_cc, _nc, _tt, _ct, callers) in raw.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, {})[func] = edge[3]
+
+        def label(func: Tuple) -> str:
+            file_name, line, name = func
+            return f"{name} ({Path(file_name).name}:{line})" if line else name
+
+        stacks: Counter = Counter()
+
+        def visit(func: Tuple, path: List[str], on_path: Set[Tuple], share: float) -> None:
+            tt = raw[func][2]
+            self_us = int(tt * share * 1e6)
+            if self_us > 0:
+                stacks[";".join(path)] += self_us
+            for callee, edge_ct in callees.get(func, {}).items():
+                callee_ct = raw[callee][3]
+                if callee in on_path or callee_ct <= 0 or len(path) > 128:
+                    continue
+                # Share of the callee's time that was spent under this path.
+                visit(callee,
+                      path + [label(callee)],
+                      on_path | {callee},
+                      share * min(1.0, edge_ct / callee_ct))
+
+        for func, (_cc, _nc, _tt, _ct, callers) in raw.items():
+            if not callers:
+                visit(func, [root_label, label(func)], {func}, 1.0)
+        return stacks
+
+    def _acquire_cprofile(self, tool_name: str) -> bool:
+        if self._mode != ToolProfiler.Mode.CPROFILE:
+            return False
+        if ToolProfiler._cprofile_lock.acquire(blocking=False):
+            return True
+        self._log.debug(
+            f"cProfile already active, sampling tool [{tool_name}] instead")
+        return False
+
+    def _run_profiled(self, tool_name: str, call: Callable[[], Any]) -> Any:
+        if self._acquire_cprofile(tool_name):
+            profile = cProfile.Profile()
+            try:
+                return profile.runcall(call)
+            finally:
+                ToolProfiler._cprofile_lock.release()
+                self._save_cprofile(tool_name, profile)
+        sampler = ToolProfiler._StackSampler(thread_id=threading.get_ident(),
+                                             root_frame=sys._getframe(),  # pylint: disable=protected-access
+                                             root_label=tool_name,
+                                             interval_seconds=self._interval_seconds)
+        sampler.start()
+        try:
+            return call()
+        finally:
+            sampler.stop()
+            self._save_samples(tool_name, sampler.stacks)
+
+    async def _run_profiled_async(self, tool_name: str, call: Callable[[], Any]) -> Any:
+        if self._acquire_cprofile(tool_name):
+            # cProfile sees everything that runs on the event loop while the tool is awaiting.
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                return await call()
+            finally:
+                profile.disable()
+                ToolProfiler._cprofile_lock.release()
+                self._save_cprofile(tool_name, profile)
+        sampler = ToolProfiler._StackSampler(thread_id=threading.get_ident(),
+                                             root_frame=sys._getframe(),  # pylint: disable=protected-access
+                                             root_label=tool_name,
+                                             interval_seconds=self._interval_seconds)
+        sampler.start()
+        try:
+            return await call()
+        finally:
+            sampler.stop()
+            self._save_samples(tool_name, sampler.stacks)
+
+    def _save_samples(self, tool_name: str, stacks: Counter) -> None:
+        try:
+            if not stacks:
+                stacks = Counter({tool_name: 1})
+            self._write_collapsed(tool_name, stacks)
+        except Exception as e:  # pylint: disable=broad-except
+            self._log.error(
+                f"Failed to write profile for tool [{tool_name}]: {str(e)}")
+
+    def _save_cprofile(self, tool_name: str, profile: cProfile.Profile) -> None:
+        try:
+            profile.dump_stats(str(self._output_path(tool_name, ".prof")))
+            self._write_collapsed(tool_name,
+                                  self.collapse_pstats(pstats.Stats(profile), tool_name))
+        except Exception as e:  # pylint: disable=broad-except
+            self._log.error(
+                f"Failed to write profile for tool [{tool_name}]: {str(e)}")
+
+    def instrument(self,
+                   tool_name: str,
+                   tool_func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(tool_func):
+            @wraps(tool_func)
+            async def async_profiled(*args, **kwargs) -> Any:
+                if not self._should_profile(tool_name):
+                    return await tool_func(*args, **kwargs)
+                return await self._run_profiled_async(tool_name, lambda: tool_func(*args, **kwargs))
+            return async_profiled
+
+        @wraps(tool_func)
+        def profiled(*args, **kwargs) -> Any:
+            if not self._should_profile(tool_name):
+                return tool_func(*args, **kwargs)
+            return self._run_profiled(tool_name, lambda: tool_func(*args, **kwargs))
+        return profiled
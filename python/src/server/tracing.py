@@ -0,0 +1,424 @@
+"""
+Lightweight span based request tracing shared by the MCP client runner, the MCP
+servers and the web services they call.
+
+Tracing is off unless MCP_TRACE_FILE is set, in which case every span is appended
+as a JSON line (MCP_TRACE_FORMAT=jsonl, the default) or as an OTLP/JSON export
+request (MCP_TRACE_FORMAT=otlp) to that file. Trace ids are propagated with a W3C
+style traceparent value, in HTTP headers and in the _meta of MCP requests.
+
+Print the critical path of a traced request with:
+
+    python tracing.py --file spans.jsonl [--trace-id <trace id>]
+"""
+import argparse
+import contextvars
+import inspect
+import json
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Mapping, Optional, Protocol
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    service: str
+    start: float
+    end: float = 0.0
+    status: str = "ok"
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) * 1000.0
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "service": self.service,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Span":
+        return cls(trace_id=data["trace_id"],
+                   span_id=data["span_id"],
+                   parent_id=data.get("parent_id"),
+                   name=data["name"],
+                   service=data.get("service", ""),
+                   start=float(data["start"]),
+                   end=float(data["end"]),
+                   status=data.get("status", "ok"),
+                   error=data.get("error"),
+                   attributes=data.get("attributes", {}))
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class JsonlSpanExporter:
+    """
+    Appends one JSON object per span to a local file.
+    """
+
+    def __init__(self, file_path: Path) -> None:
+        self._file_path: Path = Path(file_path)
+        self._file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock: threading.Lock = threading.Lock()
+
+    def _format(self, span: Span) -> Dict[str, Any]:
+        return span.as_dict()
+
+    def export(self, span: Span) -> None:
+        # One write call per line keeps lines whole when several processes append to the same file.
+        line: str = json.dumps(self._format(span),
+                               ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            with open(self._file_path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+class OtlpFileSpanExporter(JsonlSpanExporter):
+    """
+    Appends one OTLP/JSON ExportTraceServiceRequest per span, the format read by
+    the OpenTelemetry collector file receiver.
+    """
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def _format(self, span: Span) -> Dict[str, Any]:
+        otlp_span: Dict[str, Any] = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "startTimeUnixNano": str(int(span.start * 1e9)),
+            "endTimeUnixNano": str(int(span.end * 1e9)),
+            "attributes": [self._attribute(k, v) for k, v in span.attributes.items()],
+            "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1},
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [self._attribute("service.name", span.service)]},
+                "scopeSpans": [{"scope": {"name": "mcp"}, "spans": [otlp_span]}]
+            }]
+        }
+
+
+class Tracer:
+
+    TRACEPARENT: str = "traceparent"
+    _TRACEPARENT_PATTERN = re.compile(
+        r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+    class ExportFormat(str, Enum):
+        JSONL = "jsonl"
+        OTLP = "otlp"
+
+        def __str__(self) -> str:
+            return self.value
+
+    class EnvVars(str, Enum):
+        TRACE_FILE = "MCP_TRACE_FILE"
+        TRACE_FORMAT = "MCP_TRACE_FORMAT"
+        SERVICE_NAME = "MCP_TRACE_SERVICE_NAME"
+
+        def __str__(self) -> str:
+            return self.value
+
+    def __init__(self,
+                 service_name: str,
+                 exporter: Optional[SpanExporter] = None) -> None:
+        self._service_name: str = service_name
+        self._exporter: Optional[SpanExporter] = exporter
+        self._current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+            "mcp_trace_current_span", default=None)
+        # (trace id, parent span id) handed over from another process
+        self._remote_parent: contextvars.ContextVar[Optional[tuple]] = contextvars.ContextVar(
+            "mcp_trace_remote_parent", default=None)
+
+    @classmethod
+    def from_environment(cls) -> "Tracer":
+        service_name: str = os.environ.get(str(cls.EnvVars.SERVICE_NAME),
+                                           Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else "mcp")
+        trace_file: Optional[str] = os.environ.get(str(cls.EnvVars.TRACE_FILE))
+        if not trace_file:
+            return cls(service_name=service_name)
+        export_format: str = os.environ.get(
+            str(cls.EnvVars.TRACE_FORMAT), str(cls.ExportFormat.JSONL)).lower()
+        exporter: SpanExporter = OtlpFileSpanExporter(Path(trace_file)) \
+            if export_format == cls.ExportFormat.OTLP.value else JsonlSpanExporter(Path(trace_file))
+        return cls(service_name=service_name, exporter=exporter)
+
+    @property
+    def enabled(self) -> bool:
+        return self._exporter is not None
+
+    def set_service_name(self, service_name: str) -> None:
+        self._service_name = service_name
+
+    def current_span(self) -> Optional[Span]:
+        return self._current.get()
+
+    def current_traceparent(self) -> Optional[str]:
+        span = self._current.get()
+        return span.traceparent if span else None
+
+    @contextmanager
+    def _span(self, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        parent: Optional[Span] = self._current.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        elif self._remote_parent.get() is not None:
+            trace_id, parent_id = self._remote_parent.get()  # type: ignore[misc]
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+        span = Span(trace_id=trace_id,
+                    span_id=secrets.token_hex(8),
+                    parent_id=parent_id,
+                    name=name,
+                    service=self._service_name,
+                    start=time.time(),
+                    attributes=dict(attributes))
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = str(e)
+            raise
+        finally:
+            span.end = time.time()
+            self._current.reset(token)
+            try:
+                self._exporter.export(span)  # type: ignore[union-attr]
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+    def span(self, name: str, /, **attributes: Any) -> ContextManager[Optional[Span]]:
+        """
+        Time the enclosed block as a child of the current span. A no-op when tracing is off.
+        """
+        if self._exporter is None:
+            return nullcontext()
+        return self._span(name, attributes)
+
+    @contextmanager
+    def _continue_trace(self, trace_id: str, parent_id: str) -> Iterator[None]:
+        token = self._remote_parent.set((trace_id, parent_id))
+        try:
+            yield
+        finally:
+            self._remote_parent.reset(token)
+
+    def continue_trace(self, traceparent: Optional[str]) -> ContextManager[None]:
+        """
+        Make spans opened in the enclosed block children of a span from another process.
+        """
+        if self._exporter is None or not traceparent:
+            return nullcontext()
+        match = self._TRACEPARENT_PATTERN.match(traceparent.strip().lower())
+        if not match:
+            return nullcontext()
+        return self._continue_trace(match.group(1), match.group(2))
+
+    def inject(self, carrier: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Add the traceparent of the current span to the given headers or MCP _meta dict.
+        """
+        carrier = {} if carrier is None else carrier
+        traceparent: Optional[str] = self.current_traceparent() if self._exporter else None
+        if traceparent:
+            carrier[self.TRACEPARENT] = traceparent
+        return carrier
+
+    def extract(self, carrier: Optional[Mapping[str, Any]]) -> Optional[str]:
+        if not carrier:
+            return None
+        value = carrier.get(self.TRACEPARENT)
+        return str(value) if value else None
+
+    def wrap(self,
+             name: str,
+             func: Callable,
+             traceparent_getter: Optional[Callable[[], Optional[str]]] = None,
+             **attributes: Any) -> Callable:
+        """
+        Trace every call of func as a span with the given name, keeping its signature.
+        traceparent_getter, if given, supplies the remote parent of the call.
+        """
+        if self._exporter is None:
+            return func
+
+        def remote_parent() -> Optional[str]:
+            try:
+                return traceparent_getter() if traceparent_getter else None
+            except Exception:  # pylint: disable=broad-except
+                return None
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_traced(*args, **kwargs) -> Any:
+                with self.continue_trace(remote_parent()), self.span(name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_traced
+
+        @wraps(func)
+        def traced(*args, **kwargs) -> Any:
+            with self.continue_trace(remote_parent()), self.span(name, **attributes):
+                return func(*args, **kwargs)
+        return traced
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock: threading.Lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """
+    The process wide tracer, configured from the MCP_TRACE_* environment variables.
+    """
+    global _tracer  # pylint: disable=global-statement
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer.from_environment()
+    return _tracer
+
+
+#
+# Critical path report
+#
+
+def load_spans(file_path: Path) -> List[Span]:
+    spans: List[Span] = []
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record: Dict[str, Any] = json.loads(line)
+            if "resourceSpans" in record:
+                for resource_span in record["resourceSpans"]:
+                    service: str = ""
+                    for attr in resource_span.get("resource", {}).get("attributes", []):
+                        if attr.get("key") == "service.name":
+                            service = attr["value"].get("stringValue", "")
+                    for scope_span in resource_span.get("scopeSpans", []):
+                        for s in scope_span.get("spans", []):
+                            spans.append(Span(trace_id=s["traceId"],
+                                              span_id=s["spanId"],
+                                              parent_id=s.get("parentSpanId"),
+                                              name=s["name"],
+                                              service=service,
+                                              start=int(s["startTimeUnixNano"]) / 1e9,
+                                              end=int(s["endTimeUnixNano"]) / 1e9,
+                                              status="error" if s.get("status", {}).get("code") == 2 else "ok"))
+            else:
+                spans.append(Span.from_dict(record))
+    return spans
+
+
+def critical_path(spans: List[Span], trace_id: str) -> List[Dict[str, Any]]:
+    """
+    Walk back from the end of the root span, at each level following the child that
+    finished last before the cursor. Returns the spans on the critical path with the
+    time each one contributes itself (time not covered by a critical child).
+    """
+    trace_spans: List[Span] = [s for s in spans if s.trace_id == trace_id]
+    if not trace_spans:
+        return []
+    ids = {s.span_id for s in trace_spans}
+    children: Dict[Optional[str], List[Span]] = {}
+    for s in trace_spans:
+        parent = s.parent_id if s.parent_id in ids else None
+        children.setdefault(parent, []).append(s)
+    roots: List[Span] = sorted(children.get(None, []), key=lambda s: s.start)
+    path: List[Dict[str, Any]] = []
+
+    def walk(span: Span, window_end: float, depth: int) -> None:
+        entry: Dict[str, Any] = {"span": span, "depth": depth, "self_ms": 0.0}
+        path.append(entry)
+        cursor: float = min(span.end, window_end)
+        kids: List[Span] = sorted(children.get(span.span_id, []),
+                                  key=lambda s: s.end, reverse=True)
+        for kid in kids:
+            if kid.end > cursor or kid.end <= span.start:
+                continue
+            entry["self_ms"] += (cursor - kid.end) * 1000.0
+            walk(kid, cursor, depth + 1)
+            cursor = max(kid.start, span.start)
+        entry["self_ms"] += max(0.0, cursor - span.start) * 1000.0
+
+    for root in roots:
+        walk(root, root.end, 0)
+    return path
+
+
+def _print_critical_path(spans: List[Span], trace_id: Optional[str]) -> None:
+    if not spans:
+        print("No spans found.")
+        return
+    if trace_id is None:
+        trace_id = max(spans, key=lambda s: s.end).trace_id
+    path = critical_path(spans, trace_id)
+    if not path:
+        print(f"No spans found for trace [{trace_id}].")
+        return
+    total_ms: float = sum(entry["self_ms"] for entry in path)
+    print(f"Critical path of trace [{trace_id}], {total_ms:.1f} ms")
+    for entry in path:
+        span: Span = entry["span"]
+        status: str = "" if span.status == "ok" else f"  [{span.status}: {span.error}]"
+        print(f"{'  ' * entry['depth']}{span.name} ({span.service}) "
+              f"total {span.duration_ms:.1f} ms, self {entry['self_ms']:.1f} ms{status}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Print the critical path of a traced request")
+    parser.add_argument("--file", type=Path, default=os.environ.get(str(Tracer.EnvVars.TRACE_FILE)),
+                        help=f"Span file to read (default: env {Tracer.EnvVars.TRACE_FILE})")
+    parser.add_argument("--trace-id", type=str, default=None,
+                        help="Trace to report on (default: the most recently finished trace)")
+    args = parser.parse_args()
+    if not args.file or not Path(args.file).is_file():
+        print(f"Span file not found: [{args.file}]")
+        sys.exit(1)
+    _print_critical_path(load_spans(args.file), args.trace_id)
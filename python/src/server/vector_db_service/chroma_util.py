@@ -9,6 +9,7 @@ import time
 import chromadb
 from enum import Enum
 from chromadb.config import Settings
+from tracing import get_tracer
 from .ollama_embedding import OllamaEmbedding
 
 # Chroma settings
@@ -16,6 +17,7 @@ from .ollama_embedding import OllamaEmbedding
 
 chroma_host = "chromadb"  # This should be the hostname of your ChromaDB *container*
 chroma_port = 8000
+HEARTBEAT_TIMEOUT_SECONDS = 5.0
 
 
 class ChromaDBUtils:
@@ -53,6 +55,7 @@ class ChromaDBUtils:
         self._persistent_client = self._create_persistent_client()
         self._collection: chromadb.Collection = self._create_collection()
         self._embedding_generator = OllamaEmbedding()
+        self._tracer = get_tracer()
 
     def _create_persistent_client(self):
         client_settings = Settings(
@@ -84,19 +87,12 @@ class ChromaDBUtils:
                         f"Chroma - Collection {self._collection_name} already exists, reusing it.")
                     break
             if collection is None:
+                # create_collection raises if the collection cannot be created, so there is
+                # no need to list the collections again to check it is visible.
                 collection = self._persistent_client.create_collection(
                     self._collection_name, metadata={"created_at": time.time()})
                 self._log.debug(
                     f"Chroma - created new collection: {collection.name}")
-
-            collections = self._persistent_client.list_collections()
-            if collection.name in [col.name for col in collections]:
-                self._log.debug(
-                    f"Chroma - New collection created & visible in Chroma: {collection.name}")
-            else:
-                msg = f"Chroma - Collection {collection.name} not found after creation."
-                self._log.debug(msg)
-                raise self.ChromaManagementError(msg)
         except Exception as e:
             self._log.debug(
                 f"Chroma - Error creating or getting collections: {e}")
@@ -128,6 +124,12 @@ class ChromaDBUtils:
     def add_document(self,
                      document: str,
                      metadata: dict) -> bool:
+        with self._tracer.span("ChromaDBUtils.add_document", document_chars=len(document)):
+            return self._add_document(document=document, metadata=metadata)
+
+    def _add_document(self,
+                      document: str,
+                      metadata: dict) -> bool:
 
         try:
             docs = [document]
@@ -156,6 +158,15 @@ class ChromaDBUtils:
                          doc_to_match: str,
                          num_similar: int = 5,
                          source_type_hint: Optional[str] = None) -> List[List[str]] | Dict[str, Any]:
+        with self._tracer.span("ChromaDBUtils.get_similar_docs", num_similar=num_similar):
+            return self._get_similar_docs(doc_to_match=doc_to_match,
+                                          num_similar=num_similar,
+                                          source_type_hint=source_type_hint)
+
+    def _get_similar_docs(self,
+                          doc_to_match: str,
+                          num_similar: int = 5,
+                          source_type_hint: Optional[str] = None) -> List[List[str]] | Dict[str, Any]:
         search_embedding = self._embedding_generator.generate_embedding(
             doc_to_match)
         if search_embedding is None or len(search_embedding) == 0:
@@ -190,16 +201,25 @@ class ChromaDBUtils:
         self._create_collection()
 
     def test_chroma_connection(self) -> bool:
+        return self.chroma_heartbeat(host=self._host, port=self._port)
+
+    @classmethod
+    def chroma_heartbeat(cls,
+                         host: str = chroma_host,
+                         port: int = chroma_port,
+                         timeout_seconds: float = HEARTBEAT_TIMEOUT_SECONDS) -> bool:
+        log: logging.Logger = logging.getLogger(
+            cls.ChromaConfig.COLLECTION_NAME.value)
         try:
-            url = f"http://{self._host}:{self._port}/api/v2/heartbeat"
-            response = requests.get(url)
+            url = f"http://{host}:{port}/api/v2/heartbeat"
+            response = requests.get(url, timeout=timeout_seconds)
             response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
             heartbeat_data = response.json()
-            self._log.debug(
+            log.debug(
                 f"Chroma - connection successful. Heartbeat: {heartbeat_data}")
             return True
         except requests.exceptions.RequestException as e:
-            self._log.debug(f"Chroma - connection failed: {e}")
+            log.debug(f"Chroma - connection failed: {e}")
             return False
 
 
@@ -6,6 +6,7 @@ from typing import Optional, Tuple, List, Dict
 from enum import Enum
 from ollama import EmbeddingsResponse, embeddings
 from datetime import datetime
+from tracing import get_tracer
 
 from sympy import E
 
@@ -21,6 +22,7 @@ class OllamaEmbedding:
     # running inside container so ollama-gpu is host name of the ollama container
     # To access this outside of the dev container use localhost:11434
     ollama_host = "http://ollama-gpu:11434"
+    STATUS_TIMEOUT_SECONDS = 5.0
 
     class OllamaGenerationError(Exception):
         pass
@@ -31,6 +33,7 @@ class OllamaEmbedding:
         self._model = model
         self._host = host
         self._log: logging.Logger = self._configure_logging()
+        self._tracer = get_tracer()
         self._log.debug(
             f"OllamaUtils initialized with model: {self._model}, host: {self._host}")
         if self.ollama_running_and_model_loaded():
@@ -53,6 +56,11 @@ class OllamaEmbedding:
 
     def generate_embedding(self,
                            text: str) -> Optional[List[float]]:
+        with self._tracer.span("OllamaEmbedding.generate_embedding", model=self._model, text_chars=len(text)):
+            return self._generate_embedding(text)
+
+    def _generate_embedding(self,
+                            text: str) -> Optional[List[float]]:
         try:
             # Ollama expects the host to be set in the environment variable OLLAMA_HOST
             response: EmbeddingsResponse = embeddings(
@@ -70,7 +78,8 @@ class OllamaEmbedding:
 
     def ollama_running_and_model_loaded(self) -> bool:
         try:
-            response = requests.get(f"{self._host}/api/tags")
+            response = requests.get(
+                f"{self._host}/api/tags", timeout=self.STATUS_TIMEOUT_SECONDS)
             response.raise_for_status()
             models = [m["name"] for m in response.json()["models"]]
             loaded_ok = self._model in models
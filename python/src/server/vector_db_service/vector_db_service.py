@@ -2,19 +2,25 @@ import json
 import logging
 import os
 import threading
+import time
 import uuid
 from enum import Enum
-from typing import Any, Annotated, Callable, Dict, List, Tuple
+from typing import Any, Annotated, Callable, Dict, List, Optional, Tuple
 
 from pydantic import Field
 
 from i_mcp_server import IMCPServer
+from readiness import Readiness
 from .chroma_util import ChromaDBUtils
 from .vector_db_web import VectorDBWeb
 
 
 class VectorDBService(IMCPServer):
 
+    # Backoff between attempts to connect to ChromaDB during the readiness check.
+    CONNECT_RETRY_INITIAL_SECONDS: float = 0.5
+    CONNECT_RETRY_MAX_SECONDS: float = 4.0
+
     class ErrorLoadingVectorDBConfig(RuntimeError):
         pass
 
@@ -71,14 +77,10 @@ class VectorDBService(IMCPServer):
         self._log.info(
             f"VectorDB Service initialized name: {self._server_name} db: {self._full_db_path}")
 
-        self._chroma = chroma_util = ChromaDBUtils()  # Default host and port.
+        # ChromaDB (and the Ollama embedding model it depends on) are connected in the
+        # background by the readiness check, so the server can start accepting traffic.
+        self._chroma: Optional[ChromaDBUtils] = None
         self._chroma_running = False
-        if chroma_util.test_chroma_connection():
-            self._chroma_running = True
-            self._log.info("ChromaDB is running and accessible.")
-        else:
-            self._log.error("Vector DB connot function, ChromaDB is not running or not accessible. "
-                            "Ensure that the ChromaDB service is up and running.")
 
         self._vectordb_config: Dict[str, Any] = self._load_vectordb_config()
         if not self._vectordb_config:
@@ -115,6 +117,38 @@ class VectorDBService(IMCPServer):
     def supported_prompts(self) -> List[Tuple[str, Callable]]:
         return []
 
+    @property
+    def readiness_checks(self) -> List[Tuple[str, Callable[[], bool]]]:
+        return [("chromadb", self._connect_chroma)]
+
+    def _connect_chroma(self) -> bool:
+        """
+        Connect to ChromaDB, retrying with backoff until the readiness timeout, as it may
+        still be starting when the server starts.
+        """
+        deadline: float = time.monotonic() + Readiness.DEFAULT_TIMEOUT_SECONDS
+        delay: float = self.CONNECT_RETRY_INITIAL_SECONDS
+        while True:
+            try:
+                if ChromaDBUtils.chroma_heartbeat():  # Default host and port.
+                    self._chroma = ChromaDBUtils()
+                    self._chroma_running = True
+                    self._log.info("ChromaDB is running and accessible.")
+                    return True
+                error: str = "ChromaDB is not running or not accessible"
+            except Exception as e:  # pylint: disable=broad-except
+                if time.monotonic() + delay >= deadline:
+                    raise
+                error = str(e)
+            if time.monotonic() + delay >= deadline:
+                self._log.error("Vector DB connot function, ChromaDB is not running or not accessible. "
+                                "Ensure that the ChromaDB service is up and running.")
+                return False
+            self._log.info(
+                f"Unable to connect to ChromaDB ({error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            delay = min(delay * 2, self.CONNECT_RETRY_MAX_SECONDS)
+
     def handle_request(self, request):
         # Implement this method as required by IMCPServer
         raise NotImplementedError("handle_request must be implemented.")
@@ -264,6 +298,11 @@ class VectorDBService(IMCPServer):
                          document_fragment: Annotated[str, Field(description="A document fragment to do a semantic (embedding) search for related documents")],
                          num_results: Annotated[int, Field(description="Number of related documents to return", ge=1, le=100)] = 5) -> Dict[str, Any]:
 
+        if not self._chroma_running:
+            msg = "ChromaDB is not running. Cannot get related documents."
+            self._log.error(msg=msg)
+            return {self.VectorDBField.ERROR.value: msg}
+
         try:
             res: List[List[str]] | Dict[str, Any] = self._chroma.get_similar_docs(
                 doc_to_match=document_fragment,